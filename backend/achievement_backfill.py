@@ -0,0 +1,131 @@
+import argparse
+import asyncio
+import json
+import sys
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from database import progress_collection, client
+from catalog import PuzzleCatalog
+from models import UserProgress, Achievement, ACHIEVEMENTS
+from services import ProgressService, AchievementService
+
+ROOT_DIR = Path(__file__).parent
+DEFAULT_CHECKPOINT = ROOT_DIR / ".achievement_backfill.json"
+
+
+def load_checkpoint(path: Path) -> dict:
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"last_id": None, "processed": 0, "awarded": 0}
+
+
+def save_checkpoint(path: Path, checkpoint: dict):
+    # Write then rename so an interrupted run never leaves a truncated checkpoint
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(checkpoint))
+    tmp_path.replace(path)
+
+
+def award_operations(progress_data: dict, achievement_ids: List[str]) -> List[UpdateOne]:
+    """Guarded $push of each newly earned achievement for one user.
+
+    One operation per achievement, so one already earned in the meantime
+    (e.g. by a live request) does not block the others. Each award bumps
+    completion_version like the API's own awards do, so cached ETags change.
+    """
+    now = datetime.utcnow()
+    return [
+        UpdateOne(
+            {"_id": progress_data["_id"], "achievements.achievement_id": {"$ne": achievement_id}},
+            {"$push": {"achievements": Achievement(achievement_id=achievement_id, earned_at=now).dict()},
+             "$inc": {"completion_version": 1}, "$set": {"updated_at": now}}
+        )
+        for achievement_id in achievement_ids
+    ]
+
+
+async def backfill_achievements(rule_ids: List[str], batch_size: int = 1000,
+                                checkpoint_path: Optional[Path] = None, dry_run: bool = False):
+    """Evaluate rule_ids against every user and award what they already qualify for"""
+    catalog = PuzzleCatalog()
+    await catalog.load()
+
+    checkpoint = load_checkpoint(checkpoint_path) if checkpoint_path else {"last_id": None, "processed": 0, "awarded": 0}
+    query = {}
+    if checkpoint["last_id"]:
+        query["_id"] = {"$gt": ObjectId(checkpoint["last_id"])}
+        print(f"🔄 Resuming after {checkpoint['last_id']} ({checkpoint['processed']} users done)")
+
+    print(f"🏆 Backfilling {len(rule_ids)} achievement rules: {', '.join(rule_ids)}")
+    started = time.monotonic()
+    processed_this_run = 0
+    operations: List[UpdateOne] = []
+
+    async def flush(last_id):
+        nonlocal operations
+        if operations and not dry_run:
+            await progress_collection.bulk_write(operations, ordered=False)
+        operations = []
+        checkpoint["last_id"] = str(last_id)
+        if checkpoint_path and not dry_run:
+            save_checkpoint(checkpoint_path, checkpoint)
+
+        elapsed = time.monotonic() - started
+        rate = processed_this_run / elapsed if elapsed else 0
+        print(f"  ... {checkpoint['processed']} users, {checkpoint['awarded']} awards, {rate:.0f} users/s")
+
+    last_id = None
+    cursor = progress_collection.find(query).sort("_id", 1).batch_size(batch_size)
+    async for progress_data in cursor:
+        progress = UserProgress(**progress_data)
+        if progress.stats is None:
+            progress.stats = await ProgressService.history_stats(progress.user_id, progress, catalog.by_id)
+
+        awarded = AchievementService.evaluate_achievements(progress, rule_ids)
+        if awarded:
+            operations.extend(award_operations(progress_data, awarded))
+            checkpoint["awarded"] += len(awarded)
+
+        last_id = progress_data["_id"]
+        checkpoint["processed"] += 1
+        processed_this_run += 1
+        if processed_this_run % batch_size == 0:
+            await flush(last_id)
+
+    if last_id is not None:
+        await flush(last_id)
+
+    action = "Would award" if dry_run else "Awarded"
+    print(f"✅ {action} {checkpoint['awarded']} achievements across {checkpoint['processed']} users")
+    return checkpoint
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Award achievements to existing users after ACHIEVEMENTS changes")
+    parser.add_argument("--rules", help="Comma-separated achievement ids (default: all)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    rule_ids = args.rules.split(",") if args.rules else list(ACHIEVEMENTS)
+    unknown = [r for r in rule_ids if r not in ACHIEVEMENTS]
+    if unknown:
+        parser.error(f"Unknown achievements: {', '.join(unknown)}")
+    if args.restart and args.checkpoint.exists():
+        args.checkpoint.unlink()
+
+    await backfill_achievements(rule_ids, args.batch_size, args.checkpoint, args.dry_run)
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+import argparse
+import random
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models import PuzzleModel, UserProgress, CompletedPuzzle, ACHIEVEMENTS
+from services import ProgressService
+
+DIFFICULTIES = ["beginner", "intermediate", "advanced"]
+
+
+def legacy_progress_response(progress, all_puzzles):
+    """The quadratic get_progress_response body, kept as the benchmark baseline"""
+    beginners_solved = len([cp for cp in progress.completed_puzzles
+                           if any(p.id == cp.puzzle_id and p.difficulty == "beginner"
+                                 for p in all_puzzles) and cp.successful])
+    intermediate_solved = len([cp for cp in progress.completed_puzzles
+                              if any(p.id == cp.puzzle_id and p.difficulty == "intermediate"
+                                    for p in all_puzzles) and cp.successful])
+    advanced_solved = len([cp for cp in progress.completed_puzzles
+                          if any(p.id == cp.puzzle_id and p.difficulty == "advanced"
+                                for p in all_puzzles) and cp.successful])
+
+    successful_puzzles = [cp for cp in progress.completed_puzzles if cp.successful]
+    if successful_puzzles:
+        total_rating = sum(next((p.rating for p in all_puzzles if p.id == cp.puzzle_id), 0)
+                          for cp in successful_puzzles)
+        average_rating = total_rating / len(successful_puzzles)
+    else:
+        average_rating = 0
+
+    formatted_achievements = []
+    for achievement_id, achievement_info in ACHIEVEMENTS.items():
+        earned = any(a.achievement_id == achievement_id for a in progress.achievements)
+        formatted_achievements.append({"id": achievement_id, "earned": earned})
+
+    recent_activity = []
+    sorted_completions = sorted(progress.completed_puzzles,
+                               key=lambda x: x.completed_at, reverse=True)[:10]
+    for completion in sorted_completions:
+        puzzle = next((p for p in all_puzzles if p.id == completion.puzzle_id), None)
+        if puzzle:
+            recent_activity.append({"puzzle_id": completion.puzzle_id, "puzzle": puzzle.title})
+
+    return {
+        "beginners_solved": beginners_solved,
+        "intermediate_solved": intermediate_solved,
+        "advanced_solved": advanced_solved,
+        "average_rating": round(average_rating, 1),
+        "achievements": formatted_achievements,
+        "recent_activity": recent_activity
+    }
+
+
+def build_fixture(catalog_size: int, history_size: int):
+    """Synthetic catalog and a user who solved history_size random puzzles from it"""
+    puzzles = [
+        PuzzleModel(
+            id=f"p{i}",
+            title=f"Puzzle {i}",
+            description="Synthetic benchmark puzzle",
+            difficulty=DIFFICULTIES[i % 3],
+            time_limit=5,
+            rating=600 + (i * 7) % 1400,
+            moves=["e4"],
+            position="rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            solution="e4",
+            hints=[]
+        )
+        for i in range(catalog_size)
+    ]
+    start = datetime.utcnow() - timedelta(days=365)
+    solved_ids = random.sample(range(catalog_size), min(history_size, catalog_size))
+    progress = UserProgress(
+        total_puzzles_solved=len(solved_ids),
+        completed_puzzles=[
+            CompletedPuzzle(
+                puzzle_id=f"p{i}",
+                completed_at=start + timedelta(minutes=n),
+                time_spent=60,
+                moves_used=3,
+                hints_used=0,
+                successful=True
+            )
+            for n, i in enumerate(solved_ids)
+        ]
+    )
+    return puzzles, progress
+
+
+def time_call(func, repeat: int) -> float:
+    """Best wall time of repeat calls, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark progress response scaling against history and catalog size")
+    parser.add_argument("--catalog-sizes", default="1000,10000,100000")
+    parser.add_argument("--history-sizes", default="10,100,1000,5000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-legacy-ops", type=float, default=5e7,
+                        help="Skip the legacy baseline when catalog x history exceeds this")
+    args = parser.parse_args()
+
+    random.seed(42)
+    print(f"{'catalog':>8} {'history':>8} {'legacy ms':>12} {'one-pass ms':>12} {'stats ms':>10} {'speedup':>9}")
+    for catalog_size in [int(n) for n in args.catalog_sizes.split(",")]:
+        for history_size in [int(n) for n in args.history_sizes.split(",")]:
+            puzzles, progress = build_fixture(catalog_size, history_size)
+            puzzles_by_id = {p.id: p for p in puzzles}
+
+            # One pass over the history (what the stats repair does) vs the materialized read
+            indexed_ms = time_call(lambda: ProgressService.compute_stats(progress.completed_puzzles, puzzles_by_id), args.repeat)
+            progress.stats = ProgressService.compute_stats(progress.completed_puzzles, puzzles_by_id)
+            recent = progress.completed_puzzles[-10:][::-1]
+            stats_ms = time_call(lambda: ProgressService.build_progress_response(progress, puzzles_by_id, recent), args.repeat)
+            if catalog_size * history_size <= args.max_legacy_ops:
+                legacy_ms = time_call(lambda: legacy_progress_response(progress, puzzles), args.repeat)
+                legacy_text = f"{legacy_ms:12.2f}"
+                speedup_text = f"{legacy_ms / indexed_ms:8.0f}x"
+            else:
+                legacy_text = f"{'skipped':>12}"
+                speedup_text = f"{'-':>9}"
+            print(f"{catalog_size:>8} {history_size:>8} {legacy_text} {indexed_ms:12.3f} {stats_ms:10.3f} {speedup_text}")
+
+
+if __name__ == "__main__":
+    main()
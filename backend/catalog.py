@@ -0,0 +1,118 @@
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional
+from database import PuzzleDatabase, CatalogMetaDatabase, catalog_listeners
+from models import PuzzleModel
+from solutions import SolutionLine
+
+# Width of the rating buckets used by the catalog index
+RATING_BUCKET_SIZE = 100
+
+# Seconds between checks of the version stamp in Mongo (catches writes from other processes)
+VERSION_CHECK_INTERVAL = float(os.environ.get("CATALOG_VERSION_CHECK_INTERVAL", "5"))
+
+
+def rating_bucket(rating: int) -> int:
+    """Lower bound of the rating bucket a rating falls into"""
+    return rating // RATING_BUCKET_SIZE * RATING_BUCKET_SIZE
+
+
+class PuzzleCatalog:
+    """In-process index of the puzzle catalog.
+
+    The catalog is loaded once and kept in memory, keyed by id, difficulty,
+    category and rating bucket. It is reloaded when an in-process puzzle write
+    bumps the catalog version, or when the version stamp in Mongo moves on
+    (checked at most every VERSION_CHECK_INTERVAL seconds). Solution lines
+    are replayed on first use and dropped on reload.
+    """
+
+    def __init__(self):
+        self.by_id: Dict[str, PuzzleModel] = {}
+        self.by_difficulty: Dict[str, List[PuzzleModel]] = {}
+        self.by_category: Dict[str, List[PuzzleModel]] = {}
+        self.by_rating_bucket: Dict[int, List[PuzzleModel]] = {}
+        self.solution_lines: Dict[str, SolutionLine] = {}
+        self.version: Optional[int] = None
+        self._stale = True
+        self._last_version_check = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.version is not None
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    async def load(self):
+        """Load the whole catalog from Mongo and rebuild the indexes"""
+        # Read the stamp first so a write racing with the load triggers another reload
+        version = await CatalogMetaDatabase.get_version()
+
+        by_id: Dict[str, PuzzleModel] = {}
+        by_difficulty: Dict[str, List[PuzzleModel]] = {}
+        by_category: Dict[str, List[PuzzleModel]] = {}
+        by_rating_bucket: Dict[int, List[PuzzleModel]] = {}
+        async for puzzle in PuzzleDatabase.iter_puzzles():
+            by_id[puzzle.id] = puzzle
+            by_difficulty.setdefault(puzzle.difficulty, []).append(puzzle)
+            by_category.setdefault(puzzle.category, []).append(puzzle)
+            by_rating_bucket.setdefault(rating_bucket(puzzle.rating), []).append(puzzle)
+
+        self.by_id = by_id
+        self.by_difficulty = by_difficulty
+        self.by_category = by_category
+        self.by_rating_bucket = by_rating_bucket
+        self.solution_lines = {}
+        self.version = version
+        self._stale = False
+        self._last_version_check = time.monotonic()
+        print(f"Loaded puzzle catalog version {version} with {len(by_id)} puzzles")
+
+    async def ensure_fresh(self):
+        """Reload the catalog if it is stale, otherwise a no-op"""
+        if not self._stale:
+            now = time.monotonic()
+            if now - self._last_version_check < VERSION_CHECK_INTERVAL:
+                return
+            self._last_version_check = now
+            if await CatalogMetaDatabase.get_version() == self.version:
+                return
+            self._stale = True
+
+        async with self._lock:
+            # Another request may have reloaded while we waited for the lock
+            if self._stale:
+                await self.load()
+
+    def invalidate(self, version: Optional[int] = None):
+        """Mark the catalog stale so the next read reloads it"""
+        if version is None or version != self.version:
+            self._stale = True
+
+    def get(self, puzzle_id: str) -> Optional[PuzzleModel]:
+        """Get puzzle by ID"""
+        return self.by_id.get(puzzle_id)
+
+    def solution_line(self, puzzle_id: str) -> Optional[SolutionLine]:
+        """The puzzle's solution line, replayed on first use (None if the puzzle is unknown)"""
+        line = self.solution_lines.get(puzzle_id)
+        if line is None:
+            puzzle = self.by_id.get(puzzle_id)
+            if puzzle is None:
+                return None
+            line = self.solution_lines[puzzle_id] = SolutionLine(puzzle)
+        return line
+
+    def all(self, difficulty: Optional[str] = None) -> List[PuzzleModel]:
+        """Get all puzzles, optionally filtered by difficulty"""
+        if difficulty:
+            return self.by_difficulty.get(difficulty, [])
+        return list(self.by_id.values())
+
+
+# Shared catalog for the API process
+puzzle_catalog = PuzzleCatalog()
+catalog_listeners.append(puzzle_catalog.invalidate)
@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import db, CatalogMetaDatabase, PUZZLES_COLLECTION, CATALOG_COLLECTION_PREFIX, client
+
+
+async def show_status():
+    """Print the live catalog collection, the rollback history and the collections on disk"""
+    meta = await CatalogMetaDatabase.get_meta()
+    active = meta.get("active_collection", PUZZLES_COLLECTION)
+    history = meta.get("history", [])
+    print(f"📚 Catalog version {meta.get('version', 0)}, served from {active}")
+    print(f"↩️  Rollback history: {', '.join(history) if history else '(none)'}")
+    building = meta.get("building", [])
+    if building:
+        print(f"🏗️  Building (kept by gc): {', '.join(building)}")
+
+    names = sorted(
+        name for name in await db.list_collection_names()
+        if name == PUZZLES_COLLECTION or name.startswith(CATALOG_COLLECTION_PREFIX)
+    )
+    for name in names:
+        count = await db[name].estimated_document_count()
+        marker = "*" if name == active else " "
+        print(f"  {marker} {name}: {count} puzzles")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Inspect and switch versioned puzzle catalog collections")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="Show the live and previous catalog collections")
+    activate = commands.add_parser("activate", help="Switch the catalog to a loaded collection")
+    activate.add_argument("collection")
+    commands.add_parser("rollback", help="Switch back to the previously active collection")
+    gc = commands.add_parser("gc", help="Drop collections no longer reachable by rollback")
+    gc.add_argument("--keep", type=int, default=1, help="Previous versions to keep for rollback")
+    gc.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        await show_status()
+    elif args.command == "activate":
+        if args.collection not in await db.list_collection_names():
+            parser.error(f"No collection named {args.collection}")
+        await CatalogMetaDatabase.activate(args.collection)
+    elif args.command == "rollback":
+        await CatalogMetaDatabase.rollback()
+    elif args.command == "gc":
+        dropped = await CatalogMetaDatabase.collect_garbage(args.keep, args.dry_run)
+        action = "Would drop" if args.dry_run else "Dropped"
+        print(f"🧹 {action} {len(dropped)} collections{': ' + ', '.join(dropped) if dropped else ''}")
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
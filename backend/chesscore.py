@@ -0,0 +1,549 @@
+import re
+from typing import Iterable, List, Optional
+
+# Bitboard chess core: squares are numbered a1 = 0 ... h8 = 63 and a set of
+# squares is a Python int with bit n standing for square n.
+
+WHITE, BLACK = 0, 1
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+PIECE_SYMBOLS = "pnbrqk"
+PROMOTIONS = (QUEEN, ROOK, BISHOP, KNIGHT)
+EMPTY = -1
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+SQUARE_NAMES = [f + r for r in "12345678" for f in "abcdefgh"]
+ALL_SQUARES = (1 << 64) - 1
+
+# Castling rights bits, in FEN order
+WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE = 1, 2, 4, 8
+CASTLING_SYMBOLS = "KQkq"
+
+# Rights still held after a move from or to each square (king and rook home squares clear theirs)
+CASTLING_KEPT = [15] * 64
+CASTLING_KEPT[0], CASTLING_KEPT[4], CASTLING_KEPT[7] = 15 ^ WHITE_QUEENSIDE, 15 ^ 3, 15 ^ WHITE_KINGSIDE
+CASTLING_KEPT[56], CASTLING_KEPT[60], CASTLING_KEPT[63] = 15 ^ BLACK_QUEENSIDE, 15 ^ 12, 15 ^ BLACK_KINGSIDE
+
+KNIGHT_DELTAS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+KING_DELTAS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+# --- Precomputed tables ---
+
+def _on_board(file: int, rank: int) -> bool:
+    return 0 <= file < 8 and 0 <= rank < 8
+
+
+def _step_attacks(square: int, deltas) -> int:
+    file, rank = square & 7, square >> 3
+    attacks = 0
+    for df, dr in deltas:
+        if _on_board(file + df, rank + dr):
+            attacks |= 1 << ((rank + dr) * 8 + file + df)
+    return attacks
+
+
+def _ray_attacks(square: int, occupied: int, directions) -> int:
+    """Squares a slider reaches from square, stopping at (and including) the first blocker"""
+    attacks = 0
+    for df, dr in directions:
+        file, rank = (square & 7) + df, (square >> 3) + dr
+        while _on_board(file, rank):
+            bit = 1 << (rank * 8 + file)
+            attacks |= bit
+            if occupied & bit:
+                break
+            file, rank = file + df, rank + dr
+    return attacks
+
+
+def _relevant_mask(square: int, directions) -> int:
+    """Squares whose occupancy can change a slider's attacks (each ray minus its edge square)"""
+    mask = 0
+    for df, dr in directions:
+        file, rank = (square & 7) + df, (square >> 3) + dr
+        while _on_board(file + df, rank + dr):
+            mask |= 1 << (rank * 8 + file)
+            file, rank = file + df, rank + dr
+    return mask
+
+
+KNIGHT_ATTACKS = [_step_attacks(square, KNIGHT_DELTAS) for square in range(64)]
+KING_ATTACKS = [_step_attacks(square, KING_DELTAS) for square in range(64)]
+PAWN_ATTACKS = [
+    [_step_attacks(square, ((-1, 1), (1, 1))) for square in range(64)],
+    [_step_attacks(square, ((-1, -1), (1, -1))) for square in range(64)]
+]
+ROOK_RAYS = [_ray_attacks(square, 0, ROOK_DIRECTIONS) for square in range(64)]
+BISHOP_RAYS = [_ray_attacks(square, 0, BISHOP_DIRECTIONS) for square in range(64)]
+
+# Sliding attacks are looked up by (occupancy & relevant mask), the same key a
+# magic bitboard hashes; here a per-square dict is the perfect hash. Entries are
+# filled on first use (at most 102400 rook and 5248 bishop keys).
+ROOK_MASKS = [_relevant_mask(square, ROOK_DIRECTIONS) for square in range(64)]
+BISHOP_MASKS = [_relevant_mask(square, BISHOP_DIRECTIONS) for square in range(64)]
+_ROOK_TABLES = [{} for _ in range(64)]
+_BISHOP_TABLES = [{} for _ in range(64)]
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    key = occupied & ROOK_MASKS[square]
+    table = _ROOK_TABLES[square]
+    attacks = table.get(key)
+    if attacks is None:
+        attacks = table[key] = _ray_attacks(square, key, ROOK_DIRECTIONS)
+    return attacks
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    key = occupied & BISHOP_MASKS[square]
+    table = _BISHOP_TABLES[square]
+    attacks = table.get(key)
+    if attacks is None:
+        attacks = table[key] = _ray_attacks(square, key, BISHOP_DIRECTIONS)
+    return attacks
+
+
+def _line_tables():
+    """BETWEEN[a][b]: squares strictly between a and b; LINE[a][b]: the whole line through both (0 if not aligned)"""
+    between = [[0] * 64 for _ in range(64)]
+    line = [[0] * 64 for _ in range(64)]
+    for a in range(64):
+        for df, dr in ROOK_DIRECTIONS + BISHOP_DIRECTIONS:
+            full = _ray_attacks(a, 0, ((df, dr), (-df, -dr))) | 1 << a
+            path = 0
+            file, rank = (a & 7) + df, (a >> 3) + dr
+            while _on_board(file, rank):
+                b = rank * 8 + file
+                between[a][b] = path
+                line[a][b] = full
+                path |= 1 << b
+                file, rank = file + df, rank + dr
+    return between, line
+
+
+BETWEEN, LINE = _line_tables()
+
+
+# --- Moves ---
+# A move is an int: from square | to square << 6 | promotion piece type << 12.
+# Castling is the king's two-square move; en passant is a pawn capture onto the en passant square.
+
+UCI_MOVE = re.compile(r"^([a-h][1-8])([a-h][1-8])([nbrq])?$")
+SAN_MOVE = re.compile(r"^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?$")
+
+
+def encode_move(from_square: int, to_square: int, promotion: int = 0) -> int:
+    return from_square | to_square << 6 | promotion << 12
+
+
+def move_from(move: int) -> int:
+    return move & 63
+
+
+def move_to(move: int) -> int:
+    return move >> 6 & 63
+
+
+def move_promotion(move: int) -> int:
+    return move >> 12
+
+
+def move_uci(move: int) -> str:
+    promotion = move >> 12
+    return SQUARE_NAMES[move & 63] + SQUARE_NAMES[move >> 6 & 63] + (PIECE_SYMBOLS[promotion] if promotion else "")
+
+
+def parse_square(name: str) -> int:
+    if len(name) != 2 or name[0] not in "abcdefgh" or name[1] not in "12345678":
+        raise ValueError(f"Invalid square: {name!r}")
+    return (int(name[1]) - 1) * 8 + "abcdefgh".index(name[0])
+
+
+def _squares(bitboard: int):
+    while bitboard:
+        bit = bitboard & -bitboard
+        yield bit.bit_length() - 1
+        bitboard ^= bit
+
+
+class Board:
+    """A chess position held as bitboards, with legal move generation.
+
+    Boards are immutable in practice: play() returns a new board, which keeps
+    search and solution replay free of undo bookkeeping.
+    """
+
+    __slots__ = ("pieces", "occupied", "squares", "turn", "castling", "ep_square", "halfmove_clock", "fullmove_number")
+
+    def __init__(self, fen: str = START_FEN):
+        fields = fen.split()
+        if len(fields) not in (4, 6):
+            raise ValueError(f"FEN needs 4 or 6 fields, got {len(fields)}: {fen!r}")
+        placement, turn, castling, ep_square = fields[:4]
+        halfmove, fullmove = fields[4:] if len(fields) == 6 else ("0", "1")
+
+        # pieces[color * 6 + piece type] is that piece's bitboard; squares[sq] is the piece index or EMPTY
+        self.pieces = [0] * 12
+        self.occupied = [0, 0]
+        self.squares = [EMPTY] * 64
+        ranks = placement.split("/")
+        if len(ranks) != 8:
+            raise ValueError(f"FEN placement needs 8 ranks: {placement!r}")
+        for rank_index, rank in enumerate(ranks):
+            file = 0
+            for char in rank:
+                if char.isdigit():
+                    file += int(char)
+                    continue
+                if char.lower() not in PIECE_SYMBOLS or file > 7:
+                    raise ValueError(f"Invalid FEN rank: {rank!r}")
+                color = WHITE if char.isupper() else BLACK
+                square = (7 - rank_index) * 8 + file
+                piece = color * 6 + PIECE_SYMBOLS.index(char.lower())
+                self.pieces[piece] |= 1 << square
+                self.occupied[color] |= 1 << square
+                self.squares[square] = piece
+                file += 1
+            if file != 8:
+                raise ValueError(f"FEN rank does not cover 8 files: {rank!r}")
+
+        if turn not in ("w", "b"):
+            raise ValueError(f"Invalid side to move: {turn!r}")
+        self.turn = WHITE if turn == "w" else BLACK
+        if castling != "-" and (not castling or any(char not in CASTLING_SYMBOLS for char in castling)):
+            raise ValueError(f"Invalid castling rights: {castling!r}")
+        if (self.pieces[PAWN] | self.pieces[6 + PAWN]) & 0xFF000000000000FF:
+            raise ValueError("Pawns cannot stand on the first or last rank")
+        if self.pieces[KING].bit_count() != 1 or self.pieces[6 + KING].bit_count() != 1:
+            raise ValueError("Each side needs exactly one king")
+
+        # Keep only the castling rights whose king and rook are still on their home squares
+        self.castling = 0
+        for index, char in enumerate(CASTLING_SYMBOLS):
+            if char in castling:
+                color = WHITE if index < 2 else BLACK
+                king, rook = (4, 7 if index % 2 == 0 else 0) if color == WHITE else (60, 63 if index % 2 == 0 else 56)
+                if self.squares[king] == color * 6 + KING and self.squares[rook] == color * 6 + ROOK:
+                    self.castling |= 1 << index
+        self.ep_square = None if ep_square == "-" else parse_square(ep_square)
+        if self.ep_square is not None and self.ep_square >> 3 != (5 if self.turn == WHITE else 2):
+            raise ValueError(f"Invalid en passant square for the side to move: {ep_square!r}")
+        if not (halfmove.isdigit() and fullmove.isdigit()):
+            raise ValueError(f"Invalid move counters: {halfmove!r} {fullmove!r}")
+        self.halfmove_clock = int(halfmove)
+        self.fullmove_number = int(fullmove)
+        them = self.turn ^ 1
+        if self.attackers(self.king_square(them), self.turn, self.occupied[0] | self.occupied[1]):
+            raise ValueError("The side not to move is in check")
+
+    def fen(self) -> str:
+        ranks = []
+        for rank in range(7, -1, -1):
+            row, empty = "", 0
+            for file in range(8):
+                piece = self.squares[rank * 8 + file]
+                if piece == EMPTY:
+                    empty += 1
+                    continue
+                if empty:
+                    row += str(empty)
+                    empty = 0
+                symbol = PIECE_SYMBOLS[piece % 6]
+                row += symbol.upper() if piece < 6 else symbol
+            ranks.append(row + (str(empty) if empty else ""))
+        castling = "".join(symbol for index, symbol in enumerate(CASTLING_SYMBOLS) if self.castling >> index & 1) or "-"
+        ep_square = SQUARE_NAMES[self.ep_square] if self.ep_square is not None else "-"
+        return " ".join([
+            "/".join(ranks), "w" if self.turn == WHITE else "b", castling, ep_square,
+            str(self.halfmove_clock), str(self.fullmove_number)
+        ])
+
+    def __repr__(self) -> str:
+        return f"Board({self.fen()!r})"
+
+    # --- Attacks ---
+
+    def king_square(self, color: int) -> int:
+        return self.pieces[color * 6 + KING].bit_length() - 1
+
+    def attackers(self, square: int, color: int, occupied: int) -> int:
+        """Pieces of color attacking square, given the occupancy"""
+        pieces = self.pieces
+        base = color * 6
+        queens = pieces[base + QUEEN]
+        return (
+            KNIGHT_ATTACKS[square] & pieces[base + KNIGHT]
+            | KING_ATTACKS[square] & pieces[base + KING]
+            | PAWN_ATTACKS[color ^ 1][square] & pieces[base + PAWN]
+            | bishop_attacks(square, occupied) & (pieces[base + BISHOP] | queens)
+            | rook_attacks(square, occupied) & (pieces[base + ROOK] | queens)
+        )
+
+    def checkers(self) -> int:
+        return self.attackers(self.king_square(self.turn), self.turn ^ 1, self.occupied[0] | self.occupied[1])
+
+    def is_check(self) -> bool:
+        return bool(self.checkers())
+
+    def is_checkmate(self) -> bool:
+        return self.is_check() and not self.legal_moves()
+
+    def is_stalemate(self) -> bool:
+        return not self.is_check() and not self.legal_moves()
+
+    def _pinned(self, king: int, us: int, occupied: int) -> int:
+        """Our pieces that are the only blocker between our king and an enemy slider"""
+        pieces = self.pieces
+        base = (us ^ 1) * 6
+        queens = pieces[base + QUEEN]
+        snipers = (ROOK_RAYS[king] & (pieces[base + ROOK] | queens)) | (BISHOP_RAYS[king] & (pieces[base + BISHOP] | queens))
+        pinned = 0
+        own = self.occupied[us]
+        for sniper in _squares(snipers):
+            blockers = BETWEEN[king][sniper] & occupied
+            if blockers and not blockers & (blockers - 1) and blockers & own:
+                pinned |= blockers
+        return pinned
+
+    # --- Move generation ---
+
+    def legal_moves(self) -> List[int]:
+        us, them = self.turn, self.turn ^ 1
+        pieces = self.pieces
+        base = us * 6
+        own, enemy = self.occupied[us], self.occupied[them]
+        occupied = own | enemy
+        king = pieces[base + KING].bit_length() - 1
+        checkers = self.attackers(king, them, occupied)
+        moves = []
+
+        # King steps, tested with the king lifted off the board so it cannot hide behind itself
+        without_king = occupied ^ (1 << king)
+        for to in _squares(KING_ATTACKS[king] & ~own):
+            if not self.attackers(to, them, without_king):
+                moves.append(king | to << 6)
+        if checkers & (checkers - 1):
+            return moves  # double check: only the king can move
+
+        if checkers:
+            # Capture the checker or block its line
+            targets = (checkers | BETWEEN[king][checkers.bit_length() - 1]) & ~own
+        else:
+            targets = ~own & ALL_SQUARES
+            self._castling_moves(king, us, occupied, moves)
+
+        pinned = self._pinned(king, us, occupied)
+        line = LINE[king]
+
+        for from_square in _squares(pieces[base + KNIGHT] & ~pinned):
+            for to in _squares(KNIGHT_ATTACKS[from_square] & targets):
+                moves.append(from_square | to << 6)
+
+        queens = pieces[base + QUEEN]
+        for from_square in _squares(pieces[base + BISHOP] | queens):
+            allowed = targets & line[from_square] if pinned >> from_square & 1 else targets
+            for to in _squares(bishop_attacks(from_square, occupied) & allowed):
+                moves.append(from_square | to << 6)
+        for from_square in _squares(pieces[base + ROOK] | queens):
+            allowed = targets & line[from_square] if pinned >> from_square & 1 else targets
+            for to in _squares(rook_attacks(from_square, occupied) & allowed):
+                moves.append(from_square | to << 6)
+
+        self._pawn_moves(us, king, occupied, enemy, targets, pinned, moves)
+        return moves
+
+    def _castling_moves(self, king: int, us: int, occupied: int, moves: List[int]):
+        rights = self.castling >> (2 * us) & 3
+        if not rights:
+            return
+        them = us ^ 1
+        rooks = self.pieces[us * 6 + ROOK]
+        if rights & 1 and rooks >> (king + 3) & 1 and not occupied & (3 << (king + 1)):
+            if not self.attackers(king + 1, them, occupied) and not self.attackers(king + 2, them, occupied):
+                moves.append(king | (king + 2) << 6)
+        if rights & 2 and rooks >> (king - 4) & 1 and not occupied & (7 << (king - 3)):
+            if not self.attackers(king - 1, them, occupied) and not self.attackers(king - 2, them, occupied):
+                moves.append(king | (king - 2) << 6)
+
+    def _pawn_moves(self, us: int, king: int, occupied: int, enemy: int, targets: int, pinned: int, moves: List[int]):
+        forward = 8 if us == WHITE else -8
+        start_rank, last_rank = (1, 7) if us == WHITE else (6, 0)
+        attacks = PAWN_ATTACKS[us]
+        line = LINE[king]
+        ep_square = self.ep_square
+
+        for from_square in _squares(self.pieces[us * 6 + PAWN]):
+            allowed = targets & line[from_square] if pinned >> from_square & 1 else targets
+            destinations = attacks[from_square] & enemy & allowed
+            one = from_square + forward
+            if not occupied >> one & 1:
+                destinations |= 1 << one & allowed
+                two = one + forward
+                if from_square >> 3 == start_rank and not occupied >> two & 1:
+                    destinations |= 1 << two & allowed
+            for to in _squares(destinations):
+                if to >> 3 == last_rank:
+                    moves.extend(from_square | to << 6 | promotion << 12 for promotion in PROMOTIONS)
+                else:
+                    moves.append(from_square | to << 6)
+
+            if ep_square is not None and attacks[from_square] >> ep_square & 1:
+                # En passant empties two squares on one rank, so test the resulting position directly
+                captured = ep_square - forward
+                after = occupied ^ (1 << from_square) ^ (1 << captured) | 1 << ep_square
+                if not self.attackers(king, us ^ 1, after) & ~(1 << captured):
+                    moves.append(from_square | ep_square << 6)
+
+    # --- Making moves ---
+
+    def play(self, move: int) -> "Board":
+        """The position after a legal move (the move is not checked)"""
+        board = Board.__new__(Board)
+        pieces = self.pieces[:]
+        occupied = self.occupied[:]
+        squares = self.squares[:]
+        us, them = self.turn, self.turn ^ 1
+        from_square, to_square, promotion = move & 63, move >> 6 & 63, move >> 12
+        from_bit, to_bit = 1 << from_square, 1 << to_square
+        piece = squares[from_square]
+        captured = squares[to_square]
+
+        pieces[piece] ^= from_bit | to_bit
+        occupied[us] ^= from_bit | to_bit
+        squares[from_square] = EMPTY
+        squares[to_square] = piece
+        if captured != EMPTY:
+            pieces[captured] ^= to_bit
+            occupied[them] ^= to_bit
+
+        ep_square = None
+        piece_type = piece - us * 6
+        if piece_type == PAWN:
+            if to_square == self.ep_square:
+                victim = to_square - 8 if us == WHITE else to_square + 8
+                pieces[them * 6 + PAWN] ^= 1 << victim
+                occupied[them] ^= 1 << victim
+                squares[victim] = EMPTY
+                captured = them * 6 + PAWN
+            elif to_square - from_square in (16, -16):
+                ep_square = (from_square + to_square) // 2
+            if promotion:
+                pieces[piece] ^= to_bit
+                pieces[us * 6 + promotion] |= to_bit
+                squares[to_square] = us * 6 + promotion
+        elif piece_type == KING and to_square - from_square in (2, -2):
+            rook_from, rook_to = (from_square + 3, from_square + 1) if to_square > from_square else (from_square - 4, from_square - 1)
+            rook = us * 6 + ROOK
+            pieces[rook] ^= 1 << rook_from | 1 << rook_to
+            occupied[us] ^= 1 << rook_from | 1 << rook_to
+            squares[rook_from] = EMPTY
+            squares[rook_to] = rook
+
+        board.pieces = pieces
+        board.occupied = occupied
+        board.squares = squares
+        board.turn = them
+        board.castling = self.castling & CASTLING_KEPT[from_square] & CASTLING_KEPT[to_square]
+        board.ep_square = ep_square
+        board.halfmove_clock = 0 if piece_type == PAWN or captured != EMPTY else self.halfmove_clock + 1
+        board.fullmove_number = self.fullmove_number + (us == BLACK)
+        return board
+
+    # --- Notation ---
+
+    # The parsers and san() take the position's legal moves when the caller already has them
+
+    def parse_uci(self, text: str, legal: Optional[List[int]] = None) -> int:
+        match = UCI_MOVE.match(text)
+        if not match:
+            raise ValueError(f"Not a UCI move: {text!r}")
+        promotion = PIECE_SYMBOLS.index(match.group(3)) if match.group(3) else 0
+        move = encode_move(parse_square(match.group(1)), parse_square(match.group(2)), promotion)
+        if move not in (legal if legal is not None else self.legal_moves()):
+            raise ValueError(f"Illegal move {text} in {self.fen()}")
+        return move
+
+    def parse_san(self, text: str, legal: Optional[List[int]] = None) -> int:
+        san = text.rstrip("+#!?")
+        if legal is None:
+            legal = self.legal_moves()
+        if san in ("O-O", "0-0", "O-O-O", "0-0-0"):
+            king = self.king_square(self.turn)
+            to_square = king + (2 if len(san) == 3 else -2)
+            castle = king | to_square << 6
+            if castle in legal:
+                return castle
+            raise ValueError(f"Illegal move {text} in {self.fen()}")
+
+        match = SAN_MOVE.match(san)
+        if not match:
+            raise ValueError(f"Not a SAN move: {text!r}")
+        symbol, from_file, from_rank, to_name, promotion_symbol = match.groups()
+        piece_type = PIECE_SYMBOLS.index(symbol.lower()) if symbol else PAWN
+        to_square = parse_square(to_name)
+        promotion = PIECE_SYMBOLS.index(promotion_symbol.lower()) if promotion_symbol else 0
+        candidates = [
+            move for move in legal
+            if move >> 6 & 63 == to_square
+            and move >> 12 == promotion
+            and self.squares[move & 63] % 6 == piece_type
+            and (from_file is None or SQUARE_NAMES[move & 63][0] == from_file)
+            and (from_rank is None or SQUARE_NAMES[move & 63][1] == from_rank)
+        ]
+        if len(candidates) != 1:
+            problem = "Ambiguous" if candidates else "Illegal"
+            raise ValueError(f"{problem} move {text} in {self.fen()}")
+        return candidates[0]
+
+    def parse_move(self, text: str, legal: Optional[List[int]] = None) -> int:
+        """A legal move written in UCI (e2e4, e7e8q) or SAN (e4, Nxf7+, O-O, e8=Q)"""
+        return self.parse_uci(text, legal) if UCI_MOVE.match(text) else self.parse_san(text, legal)
+
+    def san(self, move: int, legal: Optional[List[int]] = None) -> str:
+        from_square, to_square, promotion = move & 63, move >> 6 & 63, move >> 12
+        piece_type = self.squares[from_square] % 6
+        is_capture = self.squares[to_square] != EMPTY or (piece_type == PAWN and to_square == self.ep_square)
+
+        if piece_type == KING and to_square - from_square in (2, -2):
+            san = "O-O" if to_square > from_square else "O-O-O"
+        elif piece_type == PAWN:
+            san = (SQUARE_NAMES[from_square][0] + "x" if is_capture else "") + SQUARE_NAMES[to_square]
+            if promotion:
+                san += "=" + PIECE_SYMBOLS[promotion].upper()
+        else:
+            san = PIECE_SYMBOLS[piece_type].upper()
+            rivals = [
+                other & 63 for other in (legal if legal is not None else self.legal_moves())
+                if other >> 6 & 63 == to_square and other & 63 != from_square and self.squares[other & 63] % 6 == piece_type
+            ]
+            if rivals:
+                if all(rival & 7 != from_square & 7 for rival in rivals):
+                    san += SQUARE_NAMES[from_square][0]
+                elif all(rival >> 3 != from_square >> 3 for rival in rivals):
+                    san += SQUARE_NAMES[from_square][1]
+                else:
+                    san += SQUARE_NAMES[from_square]
+            san += ("x" if is_capture else "") + SQUARE_NAMES[to_square]
+
+        after = self.play(move)
+        if after.is_check():
+            san += "#" if not after.legal_moves() else "+"
+        return san
+
+    def play_line(self, moves: Iterable[str]) -> List["Board"]:
+        """Positions after each move of a line (SAN or UCI), raising ValueError at the first illegal one"""
+        boards, board = [], self
+        for text in moves:
+            board = board.play(board.parse_move(text))
+            boards.append(board)
+        return boards
+
+
+def apply_moves(fen: str, moves: Iterable[str]) -> str:
+    """FEN after playing a line of SAN/UCI moves from fen; ValueError if any is illegal"""
+    board = Board(fen)
+    for text in moves:
+        board = board.play(board.parse_move(text))
+    return board.fen()
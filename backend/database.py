@@ -1,10 +1,13 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional, List, Dict, Any
+from pymongo import ReturnDocument, UpdateOne, ReplaceOne, DeleteMany, IndexModel, ASCENDING
+from typing import Optional, List, Dict, Any, AsyncIterator, Callable, Iterable, Set, Tuple
+import hashlib
+import json
 import os
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from pathlib import Path
-from models import PuzzleModel, UserProgress, GameState, CompletedPuzzle, Achievement
+from models import PuzzleModel, PuzzleFilter, UserProgress, GameState, CompletedPuzzle, Achievement, ProgressStats, AttemptBucket, PUZZLE_ANSWER_FIELDS
 
 # Load environment variables
 ROOT_DIR = Path(__file__).parent
@@ -14,10 +17,226 @@ load_dotenv(ROOT_DIR / '.env')
 client = AsyncIOMotorClient(os.environ['MONGO_URL'])
 db = client[os.environ['DB_NAME']]
 
-# Collections
-puzzles_collection = db.puzzles
+# Collections (the live puzzles collection is resolved through active_puzzles_collection)
 progress_collection = db.user_progress  
 game_state_collection = db.game_states
+catalog_meta_collection = db.catalog_meta
+attempts_collection = db.attempt_buckets
+quarantine_collection = db.puzzles_quarantine
+
+# Attempts are bucketed per user into fixed windows of ATTEMPT_BUCKET_DAYS, each
+# holding at most ATTEMPT_BUCKET_SIZE attempts (a busy window spills into another bucket)
+ATTEMPT_BUCKET_DAYS = 7
+ATTEMPT_BUCKET_SIZE = 200
+ATTEMPT_BUCKET_EPOCH = datetime(2024, 1, 1)  # a Monday, so buckets line up with weeks
+
+# Document in catalog_meta holding the puzzle catalog version stamp and the
+# pointer to the live catalog collection
+CATALOG_META_ID = "puzzles"
+
+# The live catalog until a versioned one is activated; full rebuilds go into
+# puzzles_v<N> collections and are switched to atomically
+PUZZLES_COLLECTION = "puzzles"
+CATALOG_COLLECTION_PREFIX = "puzzles_v"
+
+# Indexes every catalog collection gets (before it is activated, for versioned ones)
+PUZZLE_INDEXES: List[IndexModel] = [
+    IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    IndexModel([("difficulty", ASCENDING), ("category", ASCENDING), ("rating", ASCENDING), ("id", ASCENDING)],
+               name="difficulty_category_rating"),
+    IndexModel([("difficulty", ASCENDING), ("rating", ASCENDING), ("id", ASCENDING)], name="difficulty_rating"),
+    IndexModel([("category", ASCENDING), ("rating", ASCENDING), ("id", ASCENDING)], name="category_rating"),
+    IndexModel([("rating", ASCENDING), ("id", ASCENDING)], name="rating_id"),
+]
+
+# Live catalog collection as last read from the catalog_meta pointer
+_active_catalog = {"collection": PUZZLES_COLLECTION}
+
+
+def active_puzzles_collection():
+    """The collection currently holding the live catalog, as of the last catalog_meta read"""
+    return db[_active_catalog["collection"]]
+
+
+async def live_puzzles_collection():
+    """The live catalog collection, re-reading the catalog_meta pointer first.
+
+    Writers and CLI jobs use this: a process that has not read catalog_meta
+    yet would otherwise still point at the legacy puzzles collection.
+    """
+    await CatalogMetaDatabase.get_version()
+    return active_puzzles_collection()
+
+# Callbacks invoked with the new catalog version after every puzzle write
+catalog_listeners: List[Callable[[int], None]] = []
+
+# Callbacks invoked with the new catalog version and the puzzle before/after the write
+# (None for a create/delete), for state maintained incrementally
+puzzle_change_listeners: List[Callable[[int, Optional[PuzzleModel], Optional[PuzzleModel]], None]] = []
+
+
+def utc_now() -> datetime:
+    """Current UTC time truncated to the millisecond precision Mongo stores"""
+    now = datetime.utcnow()
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+def day_starts(now: datetime):
+    """Start of today and of yesterday (UTC) for streak bookkeeping"""
+    today_start = datetime(now.year, now.month, now.day)
+    return today_start, today_start - timedelta(days=1)
+
+
+# Puzzle fields that are bookkeeping rather than content, left out of the content hash
+PUZZLE_BOOKKEEPING_FIELDS = {"_id", "created_at", "updated_at", "content_hash"}
+
+
+def puzzle_content_hash(puzzle: Dict[str, Any]) -> str:
+    """Stable hash of a puzzle's content, used to skip rewriting unchanged puzzles"""
+    content = {key: value for key, value in puzzle.items() if key not in PUZZLE_BOOKKEEPING_FIELDS}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, separators=(",", ":"), default=str).encode()).hexdigest()
+
+
+def attempt_bucket_start(completed_at: datetime) -> datetime:
+    """Start of the attempt bucket window a completion falls into"""
+    window = timedelta(days=ATTEMPT_BUCKET_DAYS)
+    return ATTEMPT_BUCKET_EPOCH + (completed_at - ATTEMPT_BUCKET_EPOCH) // window * window
+
+
+class CatalogMetaDatabase:
+    @staticmethod
+    def _remember(meta: Optional[Dict[str, Any]]):
+        _active_catalog["collection"] = (meta or {}).get("active_collection", PUZZLES_COLLECTION)
+
+    @staticmethod
+    def _notify(version: int, before: Optional[PuzzleModel] = None, after: Optional[PuzzleModel] = None):
+        for listener in catalog_listeners:
+            listener(version)
+        for change_listener in puzzle_change_listeners:
+            change_listener(version, before, after)
+
+    @staticmethod
+    async def get_meta() -> Dict[str, Any]:
+        """The catalog_meta document (version, active collection, rollback history)"""
+        meta = await catalog_meta_collection.find_one({"_id": CATALOG_META_ID}) or {}
+        CatalogMetaDatabase._remember(meta)
+        return meta
+
+    @staticmethod
+    async def get_version() -> int:
+        """Get the current catalog version stamp (and refresh the live collection pointer)"""
+        meta = await catalog_meta_collection.find_one({"_id": CATALOG_META_ID}, {"version": 1, "active_collection": 1})
+        CatalogMetaDatabase._remember(meta)
+        return meta.get("version", 0) if meta else 0
+
+    @staticmethod
+    async def bump_version(before: Optional[PuzzleModel] = None, after: Optional[PuzzleModel] = None) -> int:
+        """Increment the catalog version stamp and notify in-process listeners of the change"""
+        meta = await catalog_meta_collection.find_one_and_update(
+            {"_id": CATALOG_META_ID},
+            {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        CatalogMetaDatabase._remember(meta)
+        version = meta["version"]
+        CatalogMetaDatabase._notify(version, before, after)
+        return version
+
+    @staticmethod
+    async def next_collection_name() -> str:
+        """Reserve the name of a new versioned catalog collection and record it as building.
+
+        The record keeps collect_garbage away from it until it is activated
+        or end_build is called.
+        """
+        meta = await catalog_meta_collection.find_one_and_update(
+            {"_id": CATALOG_META_ID},
+            {"$inc": {"collection_counter": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        name = f"{CATALOG_COLLECTION_PREFIX}{meta['collection_counter']}"
+        await catalog_meta_collection.update_one({"_id": CATALOG_META_ID}, {"$addToSet": {"building": name}})
+        return name
+
+    @staticmethod
+    async def end_build(collection_name: str):
+        """Drop the building record of a collection that will not be activated"""
+        await catalog_meta_collection.update_one({"_id": CATALOG_META_ID}, {"$pull": {"building": collection_name}})
+
+    @staticmethod
+    async def abandon_build(collection_name: str):
+        """Drop a collection whose build failed or will not be activated, then its building record"""
+        await db[collection_name].drop()
+        await CatalogMetaDatabase.end_build(collection_name)
+
+    @staticmethod
+    async def activate(collection_name: str) -> int:
+        """Atomically point the catalog at collection_name; the replaced one is kept for rollback.
+
+        The pointer only moves if nobody changed the catalog version since it
+        was read, so two concurrent swaps cannot lose each other's history.
+        """
+        meta = await CatalogMetaDatabase.get_meta()
+        previous = meta.get("active_collection", PUZZLES_COLLECTION)
+        if previous == collection_name:
+            return meta.get("version", 0)
+        history = [previous] + [name for name in meta.get("history", []) if name not in (previous, collection_name)]
+        
+        updated = await catalog_meta_collection.find_one_and_update(
+            {"_id": CATALOG_META_ID, "version": meta.get("version")},
+            {"$set": {"active_collection": collection_name, "history": history, "updated_at": datetime.utcnow()},
+             "$inc": {"version": 1}, "$pull": {"building": collection_name}},
+            upsert=not meta,
+            return_document=ReturnDocument.AFTER
+        )
+        if updated is None:
+            raise RuntimeError("Catalog changed while switching collections, retry")
+        CatalogMetaDatabase._remember(updated)
+        print(f"Catalog switched from {previous} to {collection_name} (version {updated['version']})")
+        CatalogMetaDatabase._notify(updated["version"])
+        return updated["version"]
+
+    @staticmethod
+    async def rollback() -> int:
+        """Switch back to the previously active catalog collection"""
+        meta = await CatalogMetaDatabase.get_meta()
+        history = meta.get("history", [])
+        if not history:
+            raise RuntimeError("No previous catalog to roll back to")
+        return await CatalogMetaDatabase.activate(history[0])
+
+    @staticmethod
+    async def collect_garbage(keep: int = 1, dry_run: bool = False) -> List[str]:
+        """Drop catalog collections no longer reachable by rollback.
+
+        The active collection and the last keep entries of the history are
+        kept, and so is every collection still recorded as building.
+        """
+        # List before reading meta: a build registers itself before creating its collection
+        existing = await db.list_collection_names()
+        meta = await CatalogMetaDatabase.get_meta()
+        active = meta.get("active_collection", PUZZLES_COLLECTION)
+        history = meta.get("history", [])
+        kept = {active, *history[:keep], *meta.get("building", [])}
+
+        droppable = [name for name in history[keep:] if name in existing and name not in kept]
+        droppable += [
+            name for name in existing
+            if name.startswith(CATALOG_COLLECTION_PREFIX) and name[len(CATALOG_COLLECTION_PREFIX):].isdigit()
+            and name not in kept and name not in history
+        ]
+        
+        if not dry_run:
+            for name in droppable:
+                await db.drop_collection(name)
+                print(f"Dropped old catalog collection {name}")
+            await catalog_meta_collection.update_one(
+                {"_id": CATALOG_META_ID, "active_collection": active},
+                {"$set": {"history": history[:keep]}}
+            )
+        return droppable
 
 
 class PuzzleDatabase:
@@ -25,44 +244,269 @@ class PuzzleDatabase:
     async def create_puzzle(puzzle: PuzzleModel) -> PuzzleModel:
         """Create a new puzzle"""
         puzzle_dict = puzzle.dict()
-        await puzzles_collection.insert_one(puzzle_dict)
+        puzzle_dict["content_hash"] = puzzle_content_hash(puzzle_dict)
+        await (await live_puzzles_collection()).insert_one(puzzle_dict)
+        await CatalogMetaDatabase.bump_version(after=puzzle)
         return puzzle
 
     @staticmethod
     async def get_puzzle(puzzle_id: str) -> Optional[PuzzleModel]:
         """Get puzzle by ID"""
-        puzzle_data = await puzzles_collection.find_one({"id": puzzle_id})
+        puzzle_data = await active_puzzles_collection().find_one({"id": puzzle_id})
         if puzzle_data:
             return PuzzleModel(**puzzle_data)
         return None
 
     @staticmethod
-    async def get_all_puzzles(difficulty: Optional[str] = None) -> List[PuzzleModel]:
-        """Get all puzzles, optionally filtered by difficulty"""
-        query = {}
-        if difficulty:
-            query["difficulty"] = difficulty
-            
-        puzzles_data = await puzzles_collection.find(query).to_list(1000)
-        return [PuzzleModel(**puzzle) for puzzle in puzzles_data]
+    def build_query(puzzle_filter: PuzzleFilter, solved_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Mongo filter for a PuzzleFilter; the completed filter needs the user's solved ids"""
+        query: Dict[str, Any] = {}
+        if puzzle_filter.difficulty:
+            query["difficulty"] = puzzle_filter.difficulty
+        if puzzle_filter.category:
+            query["category"] = puzzle_filter.category
+        
+        rating_range = {}
+        if puzzle_filter.rating_min is not None:
+            rating_range["$gte"] = puzzle_filter.rating_min
+        if puzzle_filter.rating_max is not None:
+            rating_range["$lte"] = puzzle_filter.rating_max
+        if rating_range:
+            query["rating"] = rating_range
+        
+        if puzzle_filter.time_limit is not None:
+            query["time_limit"] = {"$lte": puzzle_filter.time_limit}
+        if puzzle_filter.completed is not None:
+            query["id"] = {"$in" if puzzle_filter.completed else "$nin": list(solved_ids or [])}
+        return query
+
+    @staticmethod
+    async def get_puzzles_page(query: Dict[str, Any], limit: int, after: Optional[Tuple[int, str]] = None,
+                               fields: Optional[List[str]] = None, descending: bool = False) -> List[Dict[str, Any]]:
+        """Get up to limit puzzles ordered by (rating, id), starting after the keyset cursor.
+
+        fields projects the documents in Mongo; id and rating are always
+        returned since the next cursor is built from them.
+        """
+        direction = -1 if descending else 1
+        if after:
+            rating, puzzle_id = after
+            beyond = "$lt" if descending else "$gt"
+            keyset = {"$or": [{"rating": {beyond: rating}}, {"rating": rating, "id": {beyond: puzzle_id}}]}
+            query = {"$and": [query, keyset]} if query else keyset
+        
+        if fields:
+            projection: Dict[str, int] = {field: 1 for field in fields}
+            projection.update({"_id": 0, "id": 1, "rating": 1})
+        else:
+            # Everything but the answer and storage-only fields
+            projection = {"_id": 0, "content_hash": 0, **{field: 0 for field in PUZZLE_ANSWER_FIELDS}}
+        
+        cursor = active_puzzles_collection().find(query, projection).sort([("rating", direction), ("id", direction)]).limit(limit)
+        return await cursor.to_list(limit)
+
+    @staticmethod
+    async def iter_puzzles() -> AsyncIterator[PuzzleModel]:
+        """Stream every puzzle in the collection without materializing the result"""
+        async for puzzle_data in active_puzzles_collection().find({}):
+            yield PuzzleModel(**puzzle_data)
 
     @staticmethod
     async def update_puzzle(puzzle_id: str, update_data: Dict[str, Any]) -> Optional[PuzzleModel]:
-        """Update puzzle"""
+        """Update puzzle.
+
+        The content hash is cleared, since the stored content no longer matches
+        any source: the next sync_puzzles rewrites the puzzle from its source.
+        """
+        update_data = {key: value for key, value in update_data.items() if key != "content_hash"}
         update_data["updated_at"] = datetime.utcnow()
-        result = await puzzles_collection.update_one(
+        collection = await live_puzzles_collection()
+        before_data = await collection.find_one_and_update(
             {"id": puzzle_id}, 
-            {"$set": update_data}
+            {"$set": update_data, "$unset": {"content_hash": ""}},
+            return_document=ReturnDocument.BEFORE
         )
-        if result.modified_count:
-            return await PuzzleDatabase.get_puzzle(puzzle_id)
+        if before_data:
+            before = PuzzleModel(**before_data)
+            after = PuzzleModel(**{**before_data, **update_data})
+            await CatalogMetaDatabase.bump_version(before, after)
+            return after
         return None
 
     @staticmethod
     async def delete_puzzle(puzzle_id: str) -> bool:
         """Delete puzzle"""
-        result = await puzzles_collection.delete_one({"id": puzzle_id})
-        return result.deleted_count > 0
+        collection = await live_puzzles_collection()
+        puzzle_data = await collection.find_one_and_delete({"id": puzzle_id})
+        if puzzle_data:
+            await CatalogMetaDatabase.bump_version(before=PuzzleModel(**puzzle_data))
+        return puzzle_data is not None
+
+    @staticmethod
+    async def sync_puzzles(puzzles: Iterable[Dict[str, Any]], batch_size: int = 1000,
+                           dry_run: bool = False) -> Dict[str, int]:
+        """Make the collection match puzzles, writing only what differs.
+
+        Incoming puzzles and the stored (id, content_hash) pairs are both
+        walked in id order: new or changed puzzles are upserted, puzzles no
+        longer present are deleted and unchanged ones are not touched, so the
+        catalog never goes empty and an unchanged resync issues no writes.
+        """
+        incoming = sorted(puzzles, key=lambda p: p["id"])
+        collection = await live_puzzles_collection()
+        counts = {"unchanged": 0, "upserted": 0, "deleted": 0}
+        operations: List[Any] = []
+        now = datetime.utcnow()
+
+        async def flush():
+            nonlocal operations
+            if operations and not dry_run:
+                await collection.bulk_write(operations, ordered=False)
+            operations = []
+
+        def upsert(puzzle: Dict[str, Any], content_hash: str):
+            content = {key: value for key, value in puzzle.items() if key not in PUZZLE_BOOKKEEPING_FIELDS}
+            operations.append(UpdateOne(
+                {"id": puzzle["id"]},
+                {"$set": {**content, "content_hash": content_hash, "updated_at": now},
+                 "$setOnInsert": {"created_at": puzzle.get("created_at", now)}},
+                upsert=True
+            ))
+            counts["upserted"] += 1
+
+        position = 0
+        stale_ids: List[str] = []
+        stored = collection.find({}, {"_id": 0, "id": 1, "content_hash": 1}).sort("id", 1)
+        async for stored_puzzle in stored:
+            stored_id = stored_puzzle["id"]
+            while position < len(incoming) and incoming[position]["id"] < stored_id:
+                upsert(incoming[position], puzzle_content_hash(incoming[position]))
+                position += 1
+            if position < len(incoming) and incoming[position]["id"] == stored_id:
+                content_hash = puzzle_content_hash(incoming[position])
+                if stored_puzzle.get("content_hash") == content_hash:
+                    counts["unchanged"] += 1
+                else:
+                    upsert(incoming[position], content_hash)
+                position += 1
+            else:
+                stale_ids.append(stored_id)
+                if len(stale_ids) >= batch_size:
+                    operations.append(DeleteMany({"id": {"$in": stale_ids}}))
+                    counts["deleted"] += len(stale_ids)
+                    stale_ids = []
+            if len(operations) >= batch_size:
+                await flush()
+
+        for puzzle in incoming[position:]:
+            upsert(puzzle, puzzle_content_hash(puzzle))
+            if len(operations) >= batch_size:
+                await flush()
+        if stale_ids:
+            operations.append(DeleteMany({"id": {"$in": stale_ids}}))
+            counts["deleted"] += len(stale_ids)
+        await flush()
+
+        if (counts["upserted"] or counts["deleted"]) and not dry_run:
+            await CatalogMetaDatabase.bump_version()
+        return counts
+
+    @staticmethod
+    async def create_puzzles(puzzles: Iterable[PuzzleModel], batch_size: int = 1000, collection=None) -> int:
+        """Create puzzles with chunked insert_many calls; returns how many were inserted.
+
+        collection defaults to the live catalog, whose version is then bumped
+        once for the whole batch.
+        """
+        target = collection if collection is not None else await live_puzzles_collection()
+        inserted = 0
+        batch: List[Dict[str, Any]] = []
+        for puzzle in puzzles:
+            puzzle_dict = puzzle.dict()
+            puzzle_dict["content_hash"] = puzzle_content_hash(puzzle_dict)
+            batch.append(puzzle_dict)
+            if len(batch) >= batch_size:
+                await target.insert_many(batch, ordered=False)
+                inserted += len(batch)
+                batch = []
+        if batch:
+            await target.insert_many(batch, ordered=False)
+            inserted += len(batch)
+        
+        if collection is None and inserted:
+            await CatalogMetaDatabase.bump_version()
+        return inserted
+
+    @staticmethod
+    async def quarantine_puzzles(issues_by_id: Dict[str, List[Dict[str, Any]]], batch_size: int = 1000) -> int:
+        """Move puzzles out of the live catalog into puzzles_quarantine, keeping why; returns how many moved"""
+        collection = await live_puzzles_collection()
+        ids = list(issues_by_id)
+        moved = 0
+        for start in range(0, len(ids), batch_size):
+            documents = await collection.find({"id": {"$in": ids[start:start + batch_size]}}, {"_id": 0}).to_list(None)
+            if not documents:
+                continue
+            quarantined_at = datetime.utcnow()
+            await quarantine_collection.bulk_write([
+                ReplaceOne({"id": document["id"]}, {
+                    **document,
+                    "issues": issues_by_id[document["id"]],
+                    "quarantined_from": collection.name,
+                    "quarantined_at": quarantined_at
+                }, upsert=True)
+                for document in documents
+            ], ordered=False)
+            result = await collection.delete_many({"id": {"$in": [document["id"] for document in documents]}})
+            moved += result.deleted_count
+
+        if moved:
+            await CatalogMetaDatabase.bump_version()
+        return moved
+
+    @staticmethod
+    async def build_catalog_version(puzzles: Iterable[PuzzleModel], batch_size: int = 1000,
+                                    activate: bool = True) -> str:
+        """Load puzzles into a fresh puzzles_v<N> collection, index it, then switch the catalog to it.
+
+        Readers keep using the previous collection until the pointer moves, so
+        they never see a partially loaded catalog; rollback switches back. A
+        collection built without activate stays recorded as building.
+        """
+        name = await CatalogMetaDatabase.next_collection_name()
+        collection = db[name]
+        built = False
+        try:
+            await collection.create_indexes(PUZZLE_INDEXES)
+            loaded = await PuzzleDatabase.create_puzzles(puzzles, batch_size, collection)
+            print(f"Loaded {loaded} puzzles into {name}")
+            
+            if activate:
+                await CatalogMetaDatabase.activate(name)
+            built = True
+        finally:
+            # A failed build leaves neither the half-loaded collection nor its building record
+            if not built:
+                await CatalogMetaDatabase.abandon_build(name)
+        return name
+
+    @staticmethod
+    async def facet_counts(rating_bucket_size: int) -> List[Dict[str, Any]]:
+        """Puzzle counts per (difficulty, category, rating bucket), grouped in Mongo"""
+        pipeline = [
+            {"$group": {
+                "_id": {
+                    "difficulty": "$difficulty",
+                    "category": {"$ifNull": ["$category", "tactics"]},
+                    "rating_bucket": {"$multiply": [
+                        {"$floor": {"$divide": ["$rating", rating_bucket_size]}}, rating_bucket_size
+                    ]}
+                },
+                "count": {"$sum": 1}
+            }}
+        ]
+        cursor = active_puzzles_collection().aggregate(pipeline)
+        return [{**group["_id"], "count": group["count"]} async for group in cursor]
 
 
 class ProgressDatabase:
@@ -74,12 +518,28 @@ class ProgressDatabase:
             return UserProgress(**progress_data)
         return None
 
+    @staticmethod
+    async def get_completion_version(user_id: str = "default_user") -> Optional[int]:
+        """Get only the user's completion_version (None if the user has no progress)"""
+        progress_data = await progress_collection.find_one(
+            {"user_id": user_id}, {"_id": 0, "completion_version": 1}
+        )
+        if progress_data is None:
+            return None
+        return progress_data.get("completion_version", 0)
+
     @staticmethod
     async def create_user_progress(user_id: str = "default_user") -> UserProgress:
-        """Create initial user progress"""
-        progress = UserProgress(user_id=user_id)
-        await progress_collection.insert_one(progress.dict())
-        return progress
+        """Create initial user progress (returns the existing one if a concurrent request won)"""
+        progress = UserProgress(user_id=user_id, stats=ProgressStats())
+        progress_data = await progress_collection.find_one_and_update(
+            {"user_id": user_id},
+            # The legacy embedded history is left out; attempts live in attempt_buckets
+            {"$setOnInsert": progress.dict(exclude={"user_id", "completed_puzzles"})},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return UserProgress(**progress_data)
 
     @staticmethod
     async def get_or_create_progress(user_id: str = "default_user") -> UserProgress:
@@ -90,60 +550,250 @@ class ProgressDatabase:
         return progress
 
     @staticmethod
-    async def update_progress(user_id: str, completed_puzzle: CompletedPuzzle) -> UserProgress:
-        """Update progress when puzzle is completed"""
-        progress = await ProgressDatabase.get_or_create_progress(user_id)
-        
-        # Add completed puzzle if not already completed
-        existing_completion = next((p for p in progress.completed_puzzles if p.puzzle_id == completed_puzzle.puzzle_id), None)
-        if not existing_completion and completed_puzzle.successful:
-            progress.completed_puzzles.append(completed_puzzle)
+    async def update_progress(user_id: str, completed_puzzle: CompletedPuzzle,
+                              puzzle: Optional[PuzzleModel] = None) -> Tuple[UserProgress, Set[str]]:
+        """Update progress when puzzle is completed.
+
+        The change is a single atomic find_one_and_update on the summary
+        document: the puzzle id is added only if it is not solved yet, counters
+        are incremented in place and the streak is derived from the stored
+        last_active_date. The attempt itself goes to AttemptDatabase.
+        The pre-update document is returned and the same rules are replayed on
+        it with apply_completion to produce the updated progress, returned
+        together with the names of the counters the completion changed.
+        """
+        now = utc_now()
+        fresh = UserProgress(user_id=user_id, stats=ProgressStats(), created_at=now, updated_at=now)
+        progress_data = await progress_collection.find_one_and_update(
+            {"user_id": user_id},
+            ProgressDatabase._completion_pipeline(fresh, completed_puzzle, puzzle, now),
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+        progress = UserProgress(**progress_data) if progress_data else fresh
+        changed_counters = ProgressDatabase.apply_completion(progress, completed_puzzle, puzzle, now)
+        return progress, changed_counters
+
+    @staticmethod
+    def apply_completion(progress: UserProgress, completed_puzzle: CompletedPuzzle,
+                         puzzle: Optional[PuzzleModel], now: datetime) -> Set[str]:
+        """Apply a completion to in-memory progress, mirroring _completion_pipeline.
+
+        Returns the UserProgress.counters() keys whose value changed.
+        """
+        counters_before = progress.counters()
+        solved_ids = progress.solved_puzzle_ids or [p.puzzle_id for p in progress.completed_puzzles]
+        is_new = completed_puzzle.successful and completed_puzzle.puzzle_id not in solved_ids
+        if is_new:
+            progress.solved_puzzle_ids = solved_ids + [completed_puzzle.puzzle_id]
             progress.total_puzzles_solved += 1
+            progress.completion_version += 1
+            if progress.stats is not None:
+                progress.stats.count_solve(puzzle)
+        if completed_puzzle.successful:
+            progress.fastest_solve_seconds = min(
+                progress.fastest_solve_seconds if progress.fastest_solve_seconds is not None else completed_puzzle.time_spent,
+                completed_puzzle.time_spent
+            )
         
         # Update streak logic
-        today = datetime.utcnow().date()
-        last_active = progress.last_active_date.date() if progress.last_active_date else None
-        
-        if last_active:
-            days_diff = (today - last_active).days
-            if days_diff == 1:  # Consecutive day
-                progress.streak += 1
-            elif days_diff > 1:  # Streak broken
-                progress.streak = 1
-            # Same day doesn't change streak
-        else:
+        today_start, yesterday_start = day_starts(now)
+        last_active = progress.last_active_date
+        if last_active is None or last_active < yesterday_start:  # First visit or streak broken
             progress.streak = 1
-            
-        progress.last_active_date = datetime.utcnow()
-        progress.updated_at = datetime.utcnow()
+        elif last_active < today_start:  # Consecutive day
+            progress.streak += 1
+        # Same day doesn't change streak
+        
+        progress.last_active_date = max(last_active, now) if last_active else now
+        progress.updated_at = now
+        
+        counters_after = progress.counters()
+        return {name for name, value in counters_after.items() if counters_before.get(name) != value}
+
+    @staticmethod
+    def _completion_pipeline(fresh: UserProgress, completed_puzzle: CompletedPuzzle,
+                             puzzle: Optional[PuzzleModel], now: datetime) -> List[Dict[str, Any]]:
+        """Update pipeline applying one completion; fresh supplies defaults on upsert"""
+        today_start, yesterday_start = day_starts(now)
+        puzzle_id = {"$literal": completed_puzzle.puzzle_id}
         
-        # Save to database
+        # Counters bumped by a new solve, on top of the stored stats
+        def bumped(path: str, amount: int) -> Dict[str, Any]:
+            return {"$add": [{"$ifNull": [f"$$stats.{path}", 0]}, amount]}
+        stats_changes: Dict[str, Any] = {"solved_count": bumped("solved_count", 1)}
+        if puzzle:
+            stats_changes["rating_sum"] = bumped("rating_sum", puzzle.rating)
+            for field, key in (("solved_by_difficulty", puzzle.difficulty), ("solved_by_category", puzzle.category)):
+                stats_changes[field] = {"$mergeObjects": [
+                    {"$ifNull": [f"$$stats.{field}", {}]},
+                    {key: bumped(f"{field}.{key}", 1)}
+                ]}
+        
+        return [
+            # Legacy documents have no solved_puzzle_ids, derive them from the history
+            {"$set": {"_solved_ids": {"$ifNull": ["$solved_puzzle_ids", {"$ifNull": ["$completed_puzzles.puzzle_id", []]}]}}},
+            {"$set": {"_is_new": {"$and": [
+                {"$literal": completed_puzzle.successful},
+                {"$not": [{"$in": [puzzle_id, "$_solved_ids"]}]}
+            ]}}},
+            {"$set": {
+                "id": {"$ifNull": ["$id", {"$literal": fresh.id}]},
+                "created_at": {"$ifNull": ["$created_at", now]},
+                "achievements": {"$ifNull": ["$achievements", []]},
+                "solved_puzzle_ids": {"$concatArrays": [
+                    "$_solved_ids",
+                    {"$cond": ["$_is_new", [puzzle_id], []]}
+                ]},
+                "total_puzzles_solved": {"$add": [
+                    {"$ifNull": ["$total_puzzles_solved", 0]},
+                    {"$cond": ["$_is_new", 1, 0]}
+                ]},
+                "completion_version": {"$add": [
+                    {"$ifNull": ["$completion_version", 0]},
+                    {"$cond": ["$_is_new", 1, 0]}
+                ]},
+                # Missing stats stay missing and are rebuilt from history on read
+                "stats": {"$let": {
+                    "vars": {"stats": {"$cond": [
+                        {"$eq": [{"$type": "$created_at"}, "missing"]},
+                        {"$literal": fresh.stats.dict()},
+                        "$stats"
+                    ]}},
+                    "in": {"$cond": [
+                        {"$ne": [{"$type": "$$stats"}, "object"]},
+                        "$$REMOVE",
+                        {"$cond": ["$_is_new", {"$mergeObjects": ["$$stats", stats_changes]}, "$$stats"]}
+                    ]}
+                }},
+                "streak": {"$switch": {
+                    "branches": [
+                        {"case": {"$gte": ["$last_active_date", today_start]}, "then": "$streak"},
+                        {"case": {"$gte": ["$last_active_date", yesterday_start]}, "then": {"$add": ["$streak", 1]}}
+                    ],
+                    "default": 1
+                }},
+                "fastest_solve_seconds": (
+                    {"$min": ["$fastest_solve_seconds", completed_puzzle.time_spent]}
+                    if completed_puzzle.successful else "$fastest_solve_seconds"
+                ),
+                "last_active_date": {"$max": ["$last_active_date", now]},
+                "updated_at": now
+            }},
+            {"$unset": ["_solved_ids", "_is_new"]}
+        ]
+
+    @staticmethod
+    async def save_stats(user_id: str, stats: ProgressStats):
+        """Overwrite the materialized stats (used when rebuilding them from history)"""
         await progress_collection.update_one(
             {"user_id": user_id},
-            {"$set": progress.dict()},
-            upsert=True
+            {"$set": {"stats": stats.dict()}}
         )
-        
-        return progress
 
     @staticmethod
     async def add_achievement(user_id: str, achievement_id: str) -> UserProgress:
-        """Add achievement to user"""
+        """Add achievement to user (bumping completion_version, as the progress response changes)"""
+        achievement = Achievement(achievement_id=achievement_id)
+        
+        # Push guarded on the achievement not being earned yet
+        progress_data = await progress_collection.find_one_and_update(
+            {"user_id": user_id, "achievements.achievement_id": {"$ne": achievement_id}},
+            {"$push": {"achievements": achievement.dict()}, "$inc": {"completion_version": 1},
+             "$set": {"updated_at": achievement.earned_at}},
+            return_document=ReturnDocument.AFTER
+        )
+        if progress_data:
+            return UserProgress(**progress_data)
+        
+        # Either already earned or the user has no progress yet
         progress = await ProgressDatabase.get_or_create_progress(user_id)
+        if any(a.achievement_id == achievement_id for a in progress.achievements):
+            return progress
+        return await ProgressDatabase.add_achievement(user_id, achievement_id)
+
+    @staticmethod
+    async def add_achievements(user_id: str, achievement_ids: Iterable[str]) -> Tuple[List[Achievement], Optional[int]]:
+        """Add several achievements in one write, skipping any already earned.
+
+        Returns the achievements actually added and the completion_version
+        after the last write (None when nothing was written).
+        """
+        achievements = [Achievement(achievement_id=achievement_id) for achievement_id in achievement_ids]
+        if not achievements:
+            return [], None
         
-        # Check if achievement already earned
-        if not any(a.achievement_id == achievement_id for a in progress.achievements):
-            achievement = Achievement(achievement_id=achievement_id)
-            progress.achievements.append(achievement)
-            progress.updated_at = datetime.utcnow()
-            
-            await progress_collection.update_one(
-                {"user_id": user_id},
-                {"$set": progress.dict()},
-                upsert=True
+        progress_data = await progress_collection.find_one_and_update(
+            {"user_id": user_id, "achievements.achievement_id": {"$nin": [a.achievement_id for a in achievements]}},
+            {
+                "$push": {"achievements": {"$each": [a.dict() for a in achievements]}},
+                "$inc": {"completion_version": 1},
+                "$set": {"updated_at": achievements[0].earned_at}
+            },
+            projection={"completion_version": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if progress_data:
+            return achievements, progress_data["completion_version"]
+        
+        # A concurrent request earned one of them first, fall back to guarded single pushes
+        added: List[Achievement] = []
+        version = None
+        for achievement in achievements:
+            progress_data = await progress_collection.find_one_and_update(
+                {"user_id": user_id, "achievements.achievement_id": {"$ne": achievement.achievement_id}},
+                {"$push": {"achievements": achievement.dict()}, "$inc": {"completion_version": 1},
+                 "$set": {"updated_at": achievement.earned_at}},
+                projection={"completion_version": 1},
+                return_document=ReturnDocument.AFTER
             )
+            if progress_data:
+                added.append(achievement)
+                version = progress_data["completion_version"]
+        return added, version
+
+
+class AttemptDatabase:
+    @staticmethod
+    async def record_attempt(user_id: str, completed_puzzle: CompletedPuzzle):
+        """Append an attempt to the user's current bucket, opening a new bucket when full"""
+        await attempts_collection.update_one(
+            {
+                "user_id": user_id,
+                "bucket_start": attempt_bucket_start(completed_puzzle.completed_at),
+                "count": {"$lt": ATTEMPT_BUCKET_SIZE}
+            },
+            {
+                "$push": {"attempts": completed_puzzle.dict()},
+                "$inc": {"count": 1},
+                "$max": {"last_completed_at": completed_puzzle.completed_at}
+            },
+            upsert=True
+        )
+
+    @staticmethod
+    async def get_recent_attempts(user_id: str, limit: int = 10) -> List[CompletedPuzzle]:
+        """Most recent attempts, newest first, read from the latest buckets only"""
+        # The second bucket only matters when the latest one holds fewer than limit attempts
+        buckets = await attempts_collection.find(
+            {"user_id": user_id},
+            {"attempts": {"$slice": -limit}}
+        ).sort([("bucket_start", -1), ("last_completed_at", -1)]).limit(2).to_list(2)
         
-        return progress
+        recent: List[CompletedPuzzle] = []
+        for bucket in buckets:
+            recent.extend(CompletedPuzzle(**a) for a in reversed(bucket["attempts"]))
+            if len(recent) >= limit:
+                break
+        return recent[:limit]
+
+    @staticmethod
+    async def iter_attempts(user_id: str) -> AsyncIterator[CompletedPuzzle]:
+        """Stream a user's whole attempt history, oldest first"""
+        cursor = attempts_collection.find({"user_id": user_id}).sort([("bucket_start", 1), ("last_completed_at", 1)])
+        async for bucket_data in cursor:
+            for attempt in AttemptBucket(**bucket_data).attempts:
+                yield attempt
 
 
 class GameStateDatabase:
@@ -181,8 +831,8 @@ class GameStateDatabase:
 # Initialize database with sample data
 async def init_database():
     """Initialize database with sample puzzles"""
-    # Check if puzzles already exist
-    existing_count = await puzzles_collection.count_documents({})
+    # Check if puzzles already exist (in whichever collection the catalog points at)
+    existing_count = await (await live_puzzles_collection()).count_documents({})
     if existing_count > 0:
         return
     
@@ -197,7 +847,7 @@ async def init_database():
             "time_limit": 5,
             "rating": 800,
             "moves": ["Qh7#"],
-            "position": "rnbqk1nr/pppp1ppp/4p3/2b5/2B1P3/8/PPPP1PbP/RNBQK1NR",
+            "position": "5rk1/5pp1/8/7Q/8/3B4/5PPP/6K1 w - - 0 1",
             "solution": "Qh7#",
             "hints": ["Look for a move with your queen", "The king is vulnerable on h7"],
             "category": "tactics"
@@ -210,7 +860,7 @@ async def init_database():
             "time_limit": 3,
             "rating": 750,
             "moves": ["Rxd8+"],
-            "position": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
+            "position": "3q2k1/5pp1/7p/8/8/8/5PPP/3R2K1 w - - 0 1",
             "solution": "Rxd8+",
             "hints": ["Look for undefended pieces", "Your rook can capture safely"],
             "category": "tactics"
@@ -223,7 +873,7 @@ async def init_database():
             "time_limit": 4,
             "rating": 850,
             "moves": ["Ne7+"],
-            "position": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
+            "position": "2q3k1/5ppp/8/3N4/8/8/5PPP/6K1 w - - 0 1",
             "solution": "Ne7+",
             "hints": ["Knights can jump over pieces", "Look for a move that attacks both king and queen"],
             "category": "tactics"
@@ -235,9 +885,9 @@ async def init_database():
             "difficulty": "beginner",
             "time_limit": 3,
             "rating": 800,
-            "moves": ["Bb5+"],
-            "position": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
-            "solution": "Bb5+",
+            "moves": ["Bb5"],
+            "position": "4k3/pp3ppp/2n5/8/8/8/PP3PPP/4KB2 w - - 0 1",
+            "solution": "Bb5",
             "hints": ["Look for pieces on the same line", "Your bishop can create problems"],
             "category": "tactics"
         },
@@ -250,9 +900,9 @@ async def init_database():
             "difficulty": "intermediate",
             "time_limit": 8,
             "rating": 1200,
-            "moves": ["Qd8+", "Qh8#"],
-            "position": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
-            "solution": "Qd8+ Kg7 Qh8#",
+            "moves": ["Qd8+", "Kh7", "Qh8#"],
+            "position": "6k1/5p2/6p1/8/8/8/1B3PPP/3Q2K1 w - - 0 1",
+            "solution": "Qd8+ Kh7 Qh8#",
             "hints": ["Force the king to a worse square", "Look for a way to trap the king"],
             "category": "tactics"
         },
@@ -263,10 +913,10 @@ async def init_database():
             "difficulty": "intermediate",
             "time_limit": 10,
             "rating": 1350,
-            "moves": ["Rxe6+", "Qxf7+"],
-            "position": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
-            "solution": "Rxe6+ Kh8 Qxf7",
-            "hints": ["Sacrifice for position", "Look for multiple threats"],
+            "moves": ["Ra5+", "Kd4", "Rxh5"],
+            "position": "8/8/8/3k3q/8/8/8/R3K3 w - - 0 1",
+            "solution": "Ra5+ Kd4 Rxh5",
+            "hints": ["Check the king and look at what stands behind it", "Look for multiple threats"],
             "category": "tactics"
         },
         {
@@ -276,8 +926,8 @@ async def init_database():
             "difficulty": "intermediate",
             "time_limit": 6,
             "rating": 1100,
-            "moves": ["Rd8+"],
-            "position": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
+            "moves": ["Rd8#"],
+            "position": "6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1",
             "solution": "Rd8#",
             "hints": ["The king has no escape squares", "Your rook can deliver mate"],
             "category": "tactics"
@@ -290,7 +940,7 @@ async def init_database():
             "time_limit": 7,
             "rating": 1250,
             "moves": ["Nd5"],
-            "position": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
+            "position": "6k1/2q1rppp/8/8/8/2N5/5PPP/6K1 w - - 0 1",
             "solution": "Nd5",
             "hints": ["One move, two threats", "Your knight is very active"],
             "category": "tactics"
@@ -304,9 +954,9 @@ async def init_database():
             "difficulty": "advanced",
             "time_limit": 15,
             "rating": 1600,
-            "moves": ["Qd8+", "Kh7", "Qh8+", "Kg6", "Qh6#"],
-            "position": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
-            "solution": "Qd8+ Kh7 Qh8+ Kg6 Qh6#",
+            "moves": ["Re8+", "Kh7", "Qf5+", "g6", "Qxf7#"],
+            "position": "6k1/5pp1/7p/7Q/8/8/5PPP/4R1K1 w - - 0 1",
+            "solution": "Re8+ Kh7 Qf5+ g6 Qxf7#",
             "hints": ["Force the king to a specific square", "Look for a mating net", "Calculate all opponent responses"],
             "category": "tactics"
         },
@@ -317,9 +967,9 @@ async def init_database():
             "difficulty": "advanced",
             "time_limit": 12,
             "rating": 1750,
-            "moves": ["Rxh7+", "Kxh7", "Qh5+"],
-            "position": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
-            "solution": "Rxh7+ Kxh7 Qh5+ Kg8 Bxg7",
+            "moves": ["Qd8+", "Rxd8", "Rxd8#"],
+            "position": "r5k1/5ppp/8/8/8/8/3Q1PPP/3R2K1 w - - 0 1",
+            "solution": "Qd8+ Rxd8 Rxd8#",
             "hints": ["Material is less important than king safety", "Open lines to the king", "Calculate the entire sequence"],
             "category": "tactics"
         },
@@ -330,8 +980,8 @@ async def init_database():
             "difficulty": "advanced",
             "time_limit": 20,
             "rating": 1500,
-            "moves": ["Kf6", "Kf8", "g6"],
-            "position": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
+            "moves": ["Kf6", "Kf8", "g6", "Ke8", "g7"],
+            "position": "6k1/8/8/4K1P1/8/8/8/8 w - - 0 1",
             "solution": "Kf6 Kf8 g6 Ke8 g7",
             "hints": ["King and pawn vs king requires precise technique", "Opposition is key", "Support your pawn advance"],
             "category": "endgame"
@@ -343,10 +993,10 @@ async def init_database():
             "difficulty": "advanced",
             "time_limit": 18,
             "rating": 1650,
-            "moves": ["Re8+"],
-            "position": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
-            "solution": "Re8+",
-            "hints": ["Not all winning moves are captures or checks", "Improve piece coordination", "Look for long-term advantages"],
+            "moves": ["Kc7", "Ka7", "Ra1#"],
+            "position": "k7/8/2K5/8/8/8/8/1R6 w - - 0 1",
+            "solution": "Kc7 Ka7 Ra1#",
+            "hints": ["Not all winning moves are captures or checks", "Take away the king's squares first", "Look for long-term advantages"],
             "category": "strategy"
         },
         {
@@ -356,9 +1006,9 @@ async def init_database():
             "difficulty": "advanced",
             "time_limit": 25,
             "rating": 1800,
-            "moves": ["Nf7", "Qxf7", "Bxf7+"],
-            "position": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
-            "solution": "Nf7 Qxf7 Bxf7+ Kh8 Ng6#",
+            "moves": ["Nh6+", "Kh8", "Qg8+", "Rxg8", "Nf7#"],
+            "position": "r4rk1/5Npp/8/8/2Q5/8/5PPP/6K1 w - - 0 1",
+            "solution": "Nh6+ Kh8 Qg8+ Rxg8 Nf7#",
             "hints": ["All pieces must work together", "Create multiple threats", "Force opponent into bad moves"],
             "category": "tactics"
         },
@@ -369,17 +1019,15 @@ async def init_database():
             "difficulty": "advanced",
             "time_limit": 22,
             "rating": 1700,
-            "moves": ["f4", "exf4", "e5"],
-            "position": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
-            "solution": "f4 exf4 e5 dxe5 d6",
+            "moves": ["b6", "axb6", "c6", "bxc6", "a6"],
+            "position": "7k/ppp5/8/PPP5/8/8/8/7K w - - 0 1",
+            "solution": "b6 axb6 c6 bxc6 a6",
             "hints": ["Pawn breaks can shatter defenses", "Create weaknesses in opponent structure", "Think strategically, not just tactically"],
             "category": "strategy"
         }
     ]
     
-    # Insert sample puzzles
-    for puzzle_data in sample_puzzles:
-        puzzle = PuzzleModel(**puzzle_data)
-        await PuzzleDatabase.create_puzzle(puzzle)
+    # Load the sample catalog as a new catalog version
+    await PuzzleDatabase.build_catalog_version(PuzzleModel(**puzzle_data) for puzzle_data in sample_puzzles)
     
     print(f"Initialized database with {len(sample_puzzles)} sample puzzles")
\ No newline at end of file
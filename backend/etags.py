@@ -0,0 +1,54 @@
+import hashlib
+from typing import Dict, Optional
+
+# Cache-Control for responses carrying per-user completion flags: cacheable by
+# the browser, always revalidated with If-None-Match
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+# Cache-Control for user-independent catalog data (e.g. facets)
+PUBLIC_CACHE_CONTROL = "public, max-age=60, must-revalidate"
+
+
+class CompletionVersionCache:
+    """Last seen completion_version per user, so ETags can be checked without Mongo.
+
+    Entries are kept until a progress write in this process replaces them or
+    invalidate() drops them; reads only ever move a version forward.
+    """
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+
+    def get(self, user_id: str) -> Optional[int]:
+        return self._versions.get(user_id)
+
+    def set(self, user_id: str, version: int):
+        # Versions only grow, so a read that raced with a completion cannot move it back
+        self._versions[user_id] = max(version, self._versions.get(user_id, version))
+
+    def invalidate(self, user_id: str):
+        self._versions.pop(user_id, None)
+
+
+def make_etag(catalog_version: Optional[int], completion_version: Optional[int] = None, variant: str = "") -> Optional[str]:
+    """Strong ETag for a catalog version, optional completion version and request variant; None if unknown"""
+    if catalog_version is None:
+        return None
+    tag = f"c{catalog_version}"
+    if completion_version is not None:
+        tag += f"-u{completion_version}"
+    if variant:
+        tag += "-" + hashlib.sha1(variant.encode()).hexdigest()[:16]
+    return f'"{tag}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """True if an If-None-Match header lists the ETag (or is *), compared weakly as RFC 7232 requires"""
+    if not if_none_match or not etag:
+        return False
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+# Shared cache for the API process
+completion_versions = CompletionVersionCache()
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from typing import Dict, Any, Optional, Tuple
+from database import PuzzleDatabase, CatalogMetaDatabase, puzzle_change_listeners
+from catalog import RATING_BUCKET_SIZE, VERSION_CHECK_INTERVAL, rating_bucket
+from models import PuzzleModel
+from response_cache import StaticPayload
+
+# A facet cell: (difficulty, category, rating bucket)
+FacetKey = Tuple[str, str, int]
+
+
+class FacetTable:
+    """Puzzle counts by difficulty x category x rating bucket, held in memory.
+
+    The table is built by one aggregation in Mongo, then kept current from the
+    before/after of every in-process puzzle write. Writes from other processes
+    (a version stamp we did not see move) make it rebuild on the next read.
+    """
+
+    def __init__(self):
+        self.counts: Dict[FacetKey, int] = {}
+        self.version: Optional[int] = None
+        self._stale = True
+        self._last_version_check = 0.0
+        self._lock = asyncio.Lock()
+        self._summary: Optional[Dict[str, Any]] = None
+        self._payload: Optional[StaticPayload] = None
+
+    async def rebuild(self):
+        """Recompute every cell with an aggregation over the puzzles collection"""
+        version = await CatalogMetaDatabase.get_version()
+        groups = await PuzzleDatabase.facet_counts(RATING_BUCKET_SIZE)
+
+        self.counts = {
+            (group["difficulty"], group["category"], int(group["rating_bucket"])): group["count"]
+            for group in groups
+        }
+        self.version = version
+        self._stale = False
+        self._last_version_check = time.monotonic()
+        self._summary = None
+        self._payload = None
+
+    async def ensure_fresh(self):
+        """Rebuild the table if it is stale, otherwise a no-op"""
+        if not self._stale:
+            now = time.monotonic()
+            if now - self._last_version_check < VERSION_CHECK_INTERVAL:
+                return
+            self._last_version_check = now
+            if await CatalogMetaDatabase.get_version() == self.version:
+                return
+            self._stale = True
+
+        async with self._lock:
+            if self._stale:
+                await self.rebuild()
+
+    def apply_change(self, version: int, before: Optional[PuzzleModel], after: Optional[PuzzleModel]):
+        """Move one puzzle between cells; any version gap means a write we missed, so rebuild instead"""
+        # No before/after means a bulk change (load, swap): only a rebuild can tell
+        if self._stale or self.version is None or version != self.version + 1 or (before is None and after is None):
+            self._stale = True
+            return
+        if before:
+            self._add(before, -1)
+        if after:
+            self._add(after, 1)
+        self.version = version
+        self._summary = None
+        self._payload = None
+
+    def _add(self, puzzle: PuzzleModel, delta: int):
+        key = (puzzle.difficulty, puzzle.category, rating_bucket(puzzle.rating))
+        count = self.counts.get(key, 0) + delta
+        if count > 0:
+            self.counts[key] = count
+        else:
+            self.counts.pop(key, None)
+
+    def total(self, difficulty: Optional[str] = None) -> int:
+        """Number of puzzles, optionally for one difficulty"""
+        return sum(count for key, count in self.counts.items() if difficulty is None or key[0] == difficulty)
+
+    def summary(self) -> Dict[str, Any]:
+        """Cells plus per-dimension totals; memoized until the next change"""
+        if self._summary is None:
+            by_difficulty: Dict[str, int] = {}
+            by_category: Dict[str, int] = {}
+            by_rating_bucket: Dict[int, int] = {}
+            cells = []
+            for (difficulty, category, bucket), count in sorted(self.counts.items()):
+                by_difficulty[difficulty] = by_difficulty.get(difficulty, 0) + count
+                by_category[category] = by_category.get(category, 0) + count
+                by_rating_bucket[bucket] = by_rating_bucket.get(bucket, 0) + count
+                cells.append({"difficulty": difficulty, "category": category, "rating_bucket": bucket, "count": count})
+
+            self._summary = {
+                "version": self.version,
+                "total": sum(by_difficulty.values()),
+                "rating_bucket_size": RATING_BUCKET_SIZE,
+                "by_difficulty": by_difficulty,
+                "by_category": by_category,
+                "by_rating_bucket": {str(bucket): count for bucket, count in sorted(by_rating_bucket.items())},
+                "cells": cells
+            }
+        return self._summary
+
+    def payload(self) -> StaticPayload:
+        """The summary as pre-encoded (and pre-compressed) JSON; memoized until the next change"""
+        if self._payload is None:
+            self._payload = StaticPayload(self.summary())
+        return self._payload
+
+
+# Shared facet table for the API process
+puzzle_facets = FacetTable()
+puzzle_change_listeners.append(puzzle_facets.apply_change)
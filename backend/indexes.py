@@ -0,0 +1,91 @@
+import logging
+from typing import Dict, List, NamedTuple, Tuple
+from pymongo import IndexModel, ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+from database import db, active_puzzles_collection, CatalogMetaDatabase, PUZZLES_COLLECTION, PUZZLE_INDEXES
+
+logger = logging.getLogger(__name__)
+
+
+# Indexes created (idempotently) at startup, per collection; the puzzles entry
+# applies to whichever collection currently holds the live catalog
+INDEXES: Dict[str, List[IndexModel]] = {
+    PUZZLES_COLLECTION: PUZZLE_INDEXES,
+    "user_progress": [
+        IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+    ],
+    "game_states": [
+        IndexModel([("user_id", ASCENDING), ("puzzle_id", ASCENDING)], name="user_puzzle_unique", unique=True),
+    ],
+    "puzzles_quarantine": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "attempt_buckets": [
+        IndexModel([("user_id", ASCENDING), ("bucket_start", DESCENDING), ("last_completed_at", DESCENDING)],
+                   name="user_recent_buckets"),
+    ],
+}
+
+
+class QueryShape(NamedTuple):
+    collection: str
+    equality: Tuple[str, ...]
+    sort: Tuple[str, ...] = ()
+
+
+# Filter/sort shapes issued by the database layer, checked against the live indexes at startup
+QUERY_SHAPES: List[QueryShape] = [
+    QueryShape(PUZZLES_COLLECTION, ("id",)),
+    QueryShape(PUZZLES_COLLECTION, (), ("rating", "id")),
+    QueryShape(PUZZLES_COLLECTION, ("difficulty",), ("rating", "id")),
+    QueryShape(PUZZLES_COLLECTION, ("category",), ("rating", "id")),
+    QueryShape(PUZZLES_COLLECTION, ("difficulty", "category"), ("rating", "id")),
+    QueryShape("user_progress", ("user_id",)),
+    QueryShape("game_states", ("user_id", "puzzle_id")),
+    QueryShape("attempt_buckets", ("user_id",), ("bucket_start", "last_completed_at")),
+]
+
+
+def resolve_collection(collection_name: str):
+    """The live collection behind a registry name"""
+    if collection_name == PUZZLES_COLLECTION:
+        return active_puzzles_collection()
+    return db[collection_name]
+
+
+def covers(index_keys: List[str], shape: QueryShape) -> bool:
+    """True if an index with these keys serves the shape: equality fields first, then the sort fields"""
+    equality_count = len(shape.equality)
+    if set(index_keys[:equality_count]) != set(shape.equality):
+        return False
+    return tuple(index_keys[equality_count:equality_count + len(shape.sort)]) == shape.sort
+
+
+async def ensure_indexes():
+    """Create every registered index; existing ones are left untouched"""
+    await CatalogMetaDatabase.get_version()  # resolve the live catalog collection
+    for collection_name, index_models in INDEXES.items():
+        try:
+            await resolve_collection(collection_name).create_indexes(index_models)
+        except PyMongoError as e:
+            # e.g. duplicates blocking a unique index; check_query_coverage reports the gap
+            logger.error(f"Failed to create indexes on {collection_name}: {e}")
+
+
+async def check_query_coverage() -> List[QueryShape]:
+    """Log and return the query shapes no existing index covers"""
+    index_keys: Dict[str, List[List[str]]] = {}
+    for collection_name in {shape.collection for shape in QUERY_SHAPES}:
+        info = await resolve_collection(collection_name).index_information()
+        index_keys[collection_name] = [[field for field, _ in spec["key"]] for spec in info.values()]
+
+    uncovered = [
+        shape for shape in QUERY_SHAPES
+        if not any(covers(keys, shape) for keys in index_keys[shape.collection])
+    ]
+    for shape in uncovered:
+        logger.warning(
+            f"Query on {shape.collection} by {', '.join(shape.equality)}"
+            f"{' sorted by ' + ', '.join(shape.sort) if shape.sort else ''} is not covered by an index"
+        )
+    return uncovered
@@ -0,0 +1,373 @@
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import os
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from chesscore import Board, BLACK, EMPTY
+from database import live_puzzles_collection, PuzzleDatabase, client
+from puzzle_ingest import file_puzzles
+from puzzle_validator import process_in_pool, sample_data_puzzles
+from solutions import complete_fen
+
+# Fields the batch job needs from the catalog
+PROJECTION = {"_id": 0, "id": 1, "title": 1, "category": 1, "position": 1, "moves": 1, "solution": 1}
+
+MATE_CLAIM = re.compile(r"\b(?:check)?mate in (\d+)\b", re.IGNORECASE)
+
+# --- Zobrist keys ---
+# Fixed seed so keys (and therefore search order and node counts) are reproducible between runs
+
+_random = random.Random(20240101)
+ZOBRIST_PIECES = [[_random.getrandbits(64) for _ in range(64)] for _ in range(12)]
+ZOBRIST_CASTLING = [_random.getrandbits(64) for _ in range(16)]
+ZOBRIST_EP_FILE = [_random.getrandbits(64) for _ in range(8)]
+ZOBRIST_BLACK_TO_MOVE = _random.getrandbits(64)
+
+
+def zobrist_key(board: Board) -> int:
+    key = ZOBRIST_CASTLING[board.castling]
+    if board.turn == BLACK:
+        key ^= ZOBRIST_BLACK_TO_MOVE
+    if board.ep_square is not None:
+        key ^= ZOBRIST_EP_FILE[board.ep_square & 7]
+    for piece, bitboard in enumerate(board.pieces):
+        table = ZOBRIST_PIECES[piece]
+        while bitboard:
+            bit = bitboard & -bitboard
+            key ^= table[bit.bit_length() - 1]
+            bitboard ^= bit
+    return key
+
+
+class SearchTimeout(Exception):
+    """The search ran past its deadline"""
+
+
+class MateSearch:
+    """Forced-mate prover for the side to move.
+
+    A null-window alpha-beta on "mate within depth attacker moves": attack
+    nodes need one move whose every reply still loses, defend nodes need one
+    reply that escapes. The attacker only tries checks unless checks_only is
+    off; the defender tries every legal reply. Results are kept per position
+    in a Zobrist-keyed table as (shortest depth proven to mate, longest depth
+    proven not to), and the moves that last caused a cutoff at each ply are
+    tried first.
+    """
+
+    def __init__(self, checks_only: bool = True, deadline: Optional[float] = None):
+        self.checks_only = checks_only
+        self.deadline = deadline
+        self.table: Dict[int, Tuple[Optional[int], int]] = {}
+        self.killers: Dict[int, List[int]] = {}
+        self.nodes = 0
+
+    def _tick(self):
+        self.nodes += 1
+        if self.deadline is not None and not self.nodes & 1023 and time.monotonic() > self.deadline:
+            raise SearchTimeout()
+
+    def _remember_killer(self, ply: int, move: int):
+        killers = self.killers.setdefault(ply, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+
+    def _ordered(self, board: Board, moves: List[int], ply: int) -> List[int]:
+        """Killers first, then captures and promotions, then the rest"""
+        killers = self.killers.get(ply, ())
+        squares = board.squares
+        return sorted(moves, key=lambda move: (
+            move not in killers,
+            squares[move >> 6 & 63] == EMPTY and not move >> 12
+        ))
+
+    def attacking_moves(self, board: Board, ply: int):
+        """(move, position after it) for the attacker's candidate moves, in search order"""
+        for move in self._ordered(board, board.legal_moves(), ply):
+            after = board.play(move)
+            if not self.checks_only or after.is_check():
+                yield move, after
+
+    def attack(self, board: Board, depth: int, ply: int) -> bool:
+        """True if the side to move mates within depth of its own moves"""
+        self._tick()
+        key = zobrist_key(board)
+        proven, refuted = self.table.get(key, (None, 0))
+        if proven is not None and proven <= depth:
+            return True
+        if refuted >= depth:
+            return False
+
+        for move, after in self.attacking_moves(board, ply):
+            if self.defend(after, depth, ply + 1):
+                self._remember_killer(ply, move)
+                self.table[key] = (depth, refuted)
+                return True
+        self.table[key] = (proven, depth)
+        return False
+
+    def defend(self, board: Board, depth: int, ply: int) -> bool:
+        """True if every reply of the side to move still loses within depth - 1 attacker moves"""
+        self._tick()
+        legal = board.legal_moves()
+        if not legal:
+            return board.is_check()
+        if depth <= 1:
+            return False
+        for reply in self._ordered(board, legal, ply):
+            if not self.attack(board.play(reply), depth - 1, ply + 1):
+                self._remember_killer(ply, reply)
+                return False
+        return True
+
+    def shortest_mate(self, board: Board, max_depth: int) -> Optional[int]:
+        for depth in range(1, max_depth + 1):
+            if self.attack(board, depth, 0):
+                return depth
+        return None
+
+    def main_line(self, board: Board, move: int, depth: int) -> List[str]:
+        """SAN line from a proven first move, with the defence that holds out longest"""
+        line = [board.san(move)]
+        board = board.play(move)
+        while depth > 1:
+            legal = board.legal_moves()
+            if not legal:
+                break
+            # Longest resistance: the reply after which the mate takes most moves
+            reply, depth = max(
+                ((reply, self.shortest_mate(board.play(reply), depth - 1)) for reply in legal),
+                key=lambda candidate: candidate[1] or 0
+            )
+            line.append(board.san(reply, legal))
+            board = board.play(reply)
+            move, after = next(
+                (move, after) for move, after in self.attacking_moves(board, 0)
+                if self.defend(after, depth, 1)
+            )
+            line.append(board.san(move))
+            board = after
+        return line
+
+
+def solve(fen: str, max_depth: int = 5, budget: Optional[float] = None, checks_only: bool = True) -> Dict[str, Any]:
+    """Shortest forced mate for the side to move, every first move achieving it, and a main line.
+
+    Deepens one attacker move at a time, so the first depth with a winning
+    move is the shortest mate. timed_out means the budget ran out first and
+    mate_in (if set) is still the shortest found. With checks_only the mate
+    is only the shortest among attacker lines of checks: a quiet move may
+    mate sooner, and a mate that needs one is not found at all.
+    """
+    board = Board(complete_fen(fen))
+    started = time.monotonic()
+    search = MateSearch(checks_only, started + budget if budget else None)
+    result: Dict[str, Any] = {"mate_in": None, "winning_moves": [], "line": [], "timed_out": False}
+    try:
+        for depth in range(1, max_depth + 1):
+            winners = [move for move, after in search.attacking_moves(board, 0) if search.defend(after, depth, 1)]
+            if winners:
+                # The mate is proven, so the line is built past the deadline: a result
+                # with mate_in set always carries its main line
+                search.deadline = None
+                result["line"] = search.main_line(board, winners[0], depth)
+                result["winning_moves"] = [board.san(move) for move in winners]
+                result["mate_in"] = depth
+                break
+    except SearchTimeout:
+        result["timed_out"] = True
+    result["nodes"] = search.nodes
+    result["seconds"] = round(time.monotonic() - started, 3)
+    return result
+
+
+# --- Catalog batch job ---
+
+def claimed_mate(puzzle: Dict[str, Any]) -> Optional[int]:
+    """Mate length a puzzle claims: from its title, else from a '#' in its moves"""
+    match = MATE_CLAIM.search(puzzle.get("title") or "")
+    if match:
+        return int(match.group(1))
+    for ply, text in enumerate(puzzle.get("moves") or []):
+        if text.endswith("#"):
+            return ply // 2 + 1
+    return None
+
+
+def stored_line_mates(puzzle: Dict[str, Any], mate_in: int) -> bool:
+    """True if the stored moves play out as a mate in mate_in from the puzzle position"""
+    moves = puzzle.get("moves") or []
+    if len(moves) != 2 * mate_in - 1:
+        return False
+    try:
+        boards = Board(complete_fen(puzzle["position"])).play_line(moves)
+    except ValueError:
+        return False
+    return boards[-1].is_checkmate()
+
+
+def check_puzzle(puzzle: Dict[str, Any], max_depth: int, budget: float, checks_only: bool) -> Dict[str, Any]:
+    """Solve one puzzle and compare the result with what it claims.
+
+    status: verified, shorter_mate (a faster mate exists), longer_mate,
+    wrong_first_move, no_mate (none within max_depth), timeout, illegal_fen.
+    A checks-only search can prove the claimed mate but not refute it, so
+    anything short of verified is reported as inconclusive instead.
+    """
+    claim = claimed_mate(puzzle)
+    report: Dict[str, Any] = {"id": puzzle.get("id"), "claimed_mate_in": claim, "checks_only": checks_only}
+    try:
+        result = solve(puzzle.get("position") or "", max_depth, budget, checks_only)
+    except ValueError as e:
+        report.update(status="illegal_fen", error=str(e))
+        return report
+    report.update(result)
+
+    mate_in = result["mate_in"]
+    if mate_in is None:
+        report["status"] = "timeout" if result["timed_out"] else "inconclusive" if checks_only else "no_mate"
+        return report
+
+    first_move = (puzzle.get("moves") or [None])[0]
+    try:
+        board = Board(complete_fen(puzzle["position"]))
+        first_san = board.san(board.parse_move(first_move)) if first_move else None
+    except ValueError:
+        first_san = None
+    if claim is not None and mate_in < claim:
+        report["status"] = "shorter_mate"
+    elif claim is not None and mate_in > claim:
+        report["status"] = "longer_mate"
+    elif first_san not in result["winning_moves"]:
+        report["status"] = "wrong_first_move"
+    else:
+        report["status"] = "verified"
+    if checks_only and report["status"] != "verified":
+        report["status"] = "inconclusive"
+    report["stored_line_mates"] = stored_line_mates(puzzle, mate_in)
+    return report
+
+
+def check_chunk(puzzles: List[Dict[str, Any]], max_depth: int, budget: float, checks_only: bool) -> List[Dict[str, Any]]:
+    return [check_puzzle(puzzle, max_depth, budget, checks_only) for puzzle in puzzles]
+
+
+def completed_fields(puzzle: Dict[str, Any], report: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields that replace a puzzle's solution with the proven main line (and fix a wrong mate-in title)"""
+    update = {"moves": report["line"], "solution": " ".join(report["line"])}
+    title = puzzle.get("title") or ""
+    if MATE_CLAIM.search(title) and report["claimed_mate_in"] != report["mate_in"]:
+        update["title"] = MATE_CLAIM.sub(lambda match: match.group(0).replace(match.group(1), str(report["mate_in"])), title, 1)
+    return update
+
+
+async def catalog_puzzles(batch_size: int, all_puzzles: bool) -> AsyncIterator[Dict[str, Any]]:
+    query = {} if all_puzzles else {"$or": [
+        {"title": {"$regex": MATE_CLAIM.pattern, "$options": "i"}},
+        {"moves": {"$regex": "#$"}},
+        {"category": "checkmate"}
+    ]}
+    collection = await live_puzzles_collection()
+    async for document in collection.find(query, PROJECTION).batch_size(batch_size):
+        yield document
+
+
+async def claimed_only(puzzles: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+    async for puzzle in puzzles:
+        if claimed_mate(puzzle) is not None or puzzle.get("category") == "checkmate":
+            yield puzzle
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Prove forced mates for a position or for the puzzle catalog")
+    parser.add_argument("files", nargs="*", type=Path, help="Lichess CSV / PGN files to check instead of the catalog")
+    parser.add_argument("--fen", help="Solve one position and print the result")
+    parser.add_argument("--source", choices=["catalog", "puzzle-data"], default="catalog",
+                        help="Puzzles to check when no files are given")
+    parser.add_argument("--format", choices=["auto", "csv", "pgn"], default="auto")
+    parser.add_argument("--all", action="store_true", help="Check every puzzle, not only those claiming a mate")
+    parser.add_argument("--max-depth", type=int, default=5, help="Longest mate searched for, in attacker moves")
+    parser.add_argument("--budget", type=float, default=2.0, help="Seconds of search per puzzle")
+    parser.add_argument("--quiet-moves", action="store_true", help="Let the attacker play non-checking moves too (slower)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=20, help="Puzzles per worker task")
+    parser.add_argument("--report", type=Path, help="Write the JSON report here")
+    parser.add_argument("--apply", action="store_true",
+                        help="Replace catalog solutions that are not a proven mate with the proven main line "
+                             "(needs --quiet-moves, as only a full-width search finds the shortest mate)")
+    args = parser.parse_args()
+    checks_only = not args.quiet_moves
+
+    if args.fen:
+        try:
+            print(json.dumps(solve(args.fen, args.max_depth, args.budget, checks_only), indent=2))
+        except ValueError as e:
+            parser.error(str(e))
+        client.close()
+        return
+    if args.apply and (args.files or args.source != "catalog"):
+        parser.error("--apply only applies to the live catalog")
+    if args.apply and checks_only:
+        parser.error("--apply needs --quiet-moves: a checks-only search may miss the shortest mate")
+
+    if args.files:
+        source, puzzles = "files", file_puzzles(args.files, args.format)
+    elif args.source == "puzzle-data":
+        source, puzzles = "puzzle-data", sample_data_puzzles()
+    else:
+        source, puzzles = "catalog", catalog_puzzles(args.chunk_size * args.workers, args.all)
+    if not args.all:
+        puzzles = claimed_only(puzzles)
+
+    print(f"♟️  Searching {source} puzzles for mates up to {args.max_depth} moves "
+          f"({args.budget}s each, {args.workers} workers)...")
+    started = time.monotonic()
+    reports: List[Dict[str, Any]] = []
+    await process_in_pool(puzzles, partial(check_chunk, max_depth=args.max_depth, budget=args.budget,
+                                           checks_only=checks_only),
+                          reports.extend, args.workers, args.chunk_size)
+
+    statuses: Dict[str, int] = {}
+    for report in reports:
+        statuses[report["status"]] = statuses.get(report["status"], 0) + 1
+    print(f"✅ Checked {len(reports)} puzzles in {time.monotonic() - started:.1f}s")
+    for status, count in sorted(statuses.items(), key=lambda item: -item[1]):
+        print(f"  {status}: {count}")
+
+    if args.apply:
+        completable = [
+            report for report in reports
+            if report.get("mate_in") and report["line"] and not report["timed_out"] and not report["checks_only"]
+            and report["status"] != "inconclusive" and not report["stored_line_mates"]
+        ]
+        collection = await live_puzzles_collection()
+        documents = {
+            document["id"]: document
+            async for document in collection.find(
+                {"id": {"$in": [report["id"] for report in completable]}}, PROJECTION
+            )
+        }
+        updated = 0
+        for report in completable:
+            if report["id"] in documents:
+                await PuzzleDatabase.update_puzzle(report["id"], completed_fields(documents[report["id"]], report))
+                updated += 1
+        print(f"✏️  Replaced the solution of {updated} puzzles with the proven line")
+
+    if args.report:
+        args.report.write_text(json.dumps({"source": source, "statuses": statuses, "puzzles": reports}, indent=2))
+        print(f"📝 Report written to {args.report}")
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Any
+
+# Latency samples kept per stage; percentiles are computed over this window
+MAX_SAMPLES = 2048
+
+
+def percentile(sorted_samples, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, int(round(fraction * len(sorted_samples))) - 1))
+    return sorted_samples[index]
+
+
+class LatencyRecorder:
+    """Rolling latency samples per named stage, for p50/p99 tracking"""
+
+    def __init__(self, max_samples: int = MAX_SAMPLES):
+        self.max_samples = max_samples
+        self.samples: Dict[str, Deque[float]] = {}
+        self.counts: Dict[str, int] = {}
+
+    def record(self, name: str, seconds: float):
+        """Record one duration for a stage"""
+        if name not in self.samples:
+            self.samples[name] = deque(maxlen=self.max_samples)
+            self.counts[name] = 0
+        self.samples[name].append(seconds)
+        self.counts[name] += 1
+
+    @contextmanager
+    def timed(self, name: str):
+        """Record how long the with-block takes"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Count and latency percentiles (ms) per stage"""
+        result = {}
+        for name, samples in sorted(self.samples.items()):
+            ordered = sorted(samples)
+            result[name] = {
+                "count": self.counts[name],
+                "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+                "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+                "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0
+            }
+        return result
+
+
+# Shared recorder for the API process
+request_metrics = LatencyRecorder()
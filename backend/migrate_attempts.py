@@ -0,0 +1,106 @@
+import argparse
+import asyncio
+import sys
+import os
+from typing import Dict, List
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymongo import ReplaceOne
+from database import (
+    progress_collection, attempts_collection, client, AttemptDatabase,
+    attempt_bucket_start, ATTEMPT_BUCKET_SIZE
+)
+from catalog import PuzzleCatalog
+from indexes import ensure_indexes
+from models import UserProgress, CompletedPuzzle
+from services import ProgressService
+
+
+def build_buckets(user_id: str, history: List[CompletedPuzzle]) -> List[ReplaceOne]:
+    """Bucket an embedded history, with deterministic ids so a rerun overwrites instead of duplicating"""
+    windows: Dict = {}
+    for attempt in sorted(history, key=lambda a: a.completed_at):
+        windows.setdefault(attempt_bucket_start(attempt.completed_at), []).append(attempt)
+
+    operations = []
+    for bucket_start, attempts in windows.items():
+        for offset in range(0, len(attempts), ATTEMPT_BUCKET_SIZE):
+            chunk = attempts[offset:offset + ATTEMPT_BUCKET_SIZE]
+            bucket_id = f"migrated:{user_id}:{bucket_start.isoformat()}:{offset // ATTEMPT_BUCKET_SIZE}"
+            operations.append(ReplaceOne(
+                {"_id": bucket_id},
+                {
+                    "_id": bucket_id,
+                    "user_id": user_id,
+                    "bucket_start": bucket_start,
+                    "count": len(chunk),
+                    "attempts": [a.dict() for a in chunk],
+                    "last_completed_at": chunk[-1].completed_at
+                },
+                upsert=True
+            ))
+    return operations
+
+
+async def migrate_attempts(batch_size: int = 100, dry_run: bool = False):
+    """Move embedded completed_puzzles arrays into the attempt_buckets collection"""
+    await ensure_indexes()
+    catalog = PuzzleCatalog()
+    await catalog.load()
+
+    migrated = 0
+    attempts_moved = 0
+    cursor = progress_collection.find({"completed_puzzles.0": {"$exists": True}}).batch_size(batch_size)
+    async for progress_data in cursor:
+        progress = UserProgress(**progress_data)
+        history = progress.completed_puzzles
+
+        if not dry_run:
+            # Attempts recorded since the bucket collection went live count as well
+            # (buckets left by an interrupted run only repeat solves, which are deduplicated)
+            bucketed = [a async for a in AttemptDatabase.iter_attempts(progress.user_id)]
+            full_history = history + bucketed
+
+            operations = build_buckets(progress.user_id, history)
+            if operations:
+                await attempts_collection.bulk_write(operations, ordered=False)
+
+            successful = [a for a in full_history if a.successful]
+            solved_ids = list(dict.fromkeys(progress.solved_puzzle_ids + [a.puzzle_id for a in successful]))
+            fastest = min((a.time_spent for a in successful), default=None)
+            stats = ProgressService.compute_stats(full_history, catalog.by_id)
+
+            # Summary fields first, history last: an interrupted run is simply rerun
+            await progress_collection.update_one(
+                {"_id": progress_data["_id"]},
+                {
+                    "$set": {
+                        "solved_puzzle_ids": solved_ids,
+                        "fastest_solve_seconds": fastest,
+                        "stats": stats.dict()
+                    },
+                    "$unset": {"completed_puzzles": ""}
+                }
+            )
+
+        migrated += 1
+        attempts_moved += len(history)
+        if migrated % 1000 == 0:
+            print(f"  ... {migrated} users, {attempts_moved} attempts")
+
+    action = "Would migrate" if dry_run else "Migrated"
+    print(f"✅ {action} {migrated} users and {attempts_moved} attempts into attempt buckets")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Move embedded completion history into bucketed attempts")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    await migrate_attempts(batch_size=args.batch_size, dry_run=args.dry_run)
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 from datetime import datetime
 import uuid
 
@@ -36,6 +36,22 @@ class PuzzleCreate(BaseModel):
     category: str = "tactics"
 
 
+class PuzzleFilter(BaseModel):
+    difficulty: Optional[str] = None
+    category: Optional[str] = None
+    rating_min: Optional[int] = None
+    rating_max: Optional[int] = None
+    time_limit: Optional[int] = None  # fits within this many minutes
+    completed: Optional[bool] = None
+
+
+# Fields of the lightweight puzzle shape used by the puzzle selection grid
+PUZZLE_SUMMARY_FIELDS = ["id", "title", "description", "difficulty", "time_limit", "rating", "category"]
+
+# Fields holding the answer; /move reveals them one reply at a time, so they never leave in puzzle payloads
+PUZZLE_ANSWER_FIELDS = ["moves", "solution"]
+
+
 class CompletedPuzzle(BaseModel):
     puzzle_id: str
     completed_at: datetime = Field(default_factory=datetime.utcnow)
@@ -50,11 +66,33 @@ class Achievement(BaseModel):
     earned_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class ProgressStats(BaseModel):
+    solved_count: int = 0  # successful completions, including puzzles since deleted
+    rating_sum: int = 0
+    solved_by_difficulty: Dict[str, int] = {}
+    solved_by_category: Dict[str, int] = {}
+
+    def count_solve(self, puzzle: Optional[PuzzleModel]):
+        """Count one new successful completion (puzzle is None if it was deleted)"""
+        self.solved_count += 1
+        if puzzle:
+            self.rating_sum += puzzle.rating
+            self.solved_by_difficulty[puzzle.difficulty] = self.solved_by_difficulty.get(puzzle.difficulty, 0) + 1
+            self.solved_by_category[puzzle.category] = self.solved_by_category.get(puzzle.category, 0) + 1
+
+
 class UserProgress(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_id: str = "default_user"  # For now, single user app
     total_puzzles_solved: int = 0
-    completed_puzzles: List[CompletedPuzzle] = []
+    completed_puzzles: List[CompletedPuzzle] = []  # legacy embedded history, see migrate_attempts.py
+    # Guards against counting a puzzle twice. It holds each solved puzzle once, so it is bounded by
+    # the catalog size: at ~45 bytes per uuid entry the 16 MB document limit is reached near 350k
+    # ids. Catalogs approaching 100k puzzles should move it to a collection of its own.
+    solved_puzzle_ids: List[str] = []
+    completion_version: int = 0  # bumped whenever solved_puzzle_ids or achievements grow, for ETags
+    fastest_solve_seconds: Optional[int] = None
+    stats: Optional[ProgressStats] = None  # maintained on write, None until first computed
     achievements: List[Achievement] = []
     streak: int = 0
     last_active_date: Optional[datetime] = None
@@ -64,12 +102,45 @@ class UserProgress(BaseModel):
     class Config:
         populate_by_name = True
 
+    def counters(self) -> Dict[str, Any]:
+        """Flat view of the counters achievement rules depend on"""
+        counters: Dict[str, Any] = {
+            "total_puzzles_solved": self.total_puzzles_solved,
+            "streak": self.streak,
+            "fastest_solve_seconds": self.fastest_solve_seconds
+        }
+        if self.stats:
+            for difficulty, count in self.stats.solved_by_difficulty.items():
+                counters[f"solved_by_difficulty.{difficulty}"] = count
+            for category, count in self.stats.solved_by_category.items():
+                counters[f"solved_by_category.{category}"] = count
+        return counters
+
+    def solved_id_set(self) -> Set[str]:
+        """Ids of solved puzzles (documents not yet migrated only have the embedded history)"""
+        return set(self.solved_puzzle_ids or (p.puzzle_id for p in self.completed_puzzles if p.successful))
+
+
+class AttemptBucket(BaseModel):
+    """A fixed time window of one user's attempts (bucket pattern)"""
+    user_id: str
+    bucket_start: datetime
+    count: int = 0
+    attempts: List[CompletedPuzzle] = []
+    last_completed_at: Optional[datetime] = None
+
 
 class PuzzleAttempt(BaseModel):
     time_spent: int  # seconds
     moves_used: int
     hints_used: int
     successful: bool
+    moves: List[str] = []  # the player's moves (SAN or UCI, no replies), checked before a success counts
+
+
+class MoveSubmission(BaseModel):
+    move: str  # SAN (Nf3, O-O, e8=Q) or UCI (g1f3, e7e8q)
+    ply: int = 0  # plies of the solution line already played
 
 
 class GameState(BaseModel):
@@ -92,6 +163,9 @@ class ProgressResponse(BaseModel):
     beginners_solved: int
     intermediate_solved: int
     advanced_solved: int
+    beginner_total: int = 0
+    intermediate_total: int = 0
+    advanced_total: int = 0
     average_rating: float
     streak: int
     achievements: List[Dict[str, Any]]
@@ -102,59 +176,65 @@ class AchievementRequest(BaseModel):
     achievement_id: str
 
 
-# Achievement definitions
+# Achievement definitions. Each rule lists the UserProgress.counters() keys it
+# depends on and is only re-checked after a completion that changes one of them.
+def _solved_in(progress: UserProgress, difficulty: str) -> int:
+    return progress.stats.solved_by_difficulty.get(difficulty, 0) if progress.stats else 0
+
+
 ACHIEVEMENTS = {
     "first_puzzle": {
         "name": "First Puzzle",
         "description": "Solved your first puzzle!",
+        "depends_on": ["total_puzzles_solved"],
         "condition": lambda progress: progress.total_puzzles_solved >= 1
     },
     "beginner_master": {
         "name": "Beginner Master", 
         "description": "Completed all beginner puzzles",
-        "condition": lambda progress: len([p for p in progress.completed_puzzles 
-                                         if any(puzzle.difficulty == "beginner" and puzzle.id == p.puzzle_id 
-                                               for puzzle in get_all_puzzles())]) >= 15
+        "depends_on": ["solved_by_difficulty.beginner"],
+        "condition": lambda progress: _solved_in(progress, "beginner") >= 15
     },
     "intermediate_master": {
         "name": "Intermediate Master",
         "description": "Completed all intermediate puzzles", 
-        "condition": lambda progress: len([p for p in progress.completed_puzzles
-                                         if any(puzzle.difficulty == "intermediate" and puzzle.id == p.puzzle_id
-                                               for puzzle in get_all_puzzles())]) >= 20
+        "depends_on": ["solved_by_difficulty.intermediate"],
+        "condition": lambda progress: _solved_in(progress, "intermediate") >= 20
     },
     "advanced_master": {
         "name": "Advanced Master",
         "description": "Completed all advanced puzzles",
-        "condition": lambda progress: len([p for p in progress.completed_puzzles
-                                         if any(puzzle.difficulty == "advanced" and puzzle.id == p.puzzle_id
-                                               for puzzle in get_all_puzzles())]) >= 15
+        "depends_on": ["solved_by_difficulty.advanced"],
+        "condition": lambda progress: _solved_in(progress, "advanced") >= 15
     },
     "quick_solver": {
         "name": "Quick Solver",
         "description": "Solved a puzzle in under 30 seconds",
-        "condition": lambda progress: any(p.time_spent < 30 and p.successful for p in progress.completed_puzzles)
+        "depends_on": ["fastest_solve_seconds"],
+        "condition": lambda progress: progress.fastest_solve_seconds is not None and progress.fastest_solve_seconds < 30
     },
     "streak_3": {
         "name": "3-Day Streak", 
         "description": "Solved puzzles 3 days in a row",
+        "depends_on": ["streak"],
         "condition": lambda progress: progress.streak >= 3
     },
     "tactical_genius": {
         "name": "Tactical Genius",
         "description": "Solved 5 advanced puzzles", 
-        "condition": lambda progress: len([p for p in progress.completed_puzzles
-                                         if any(puzzle.difficulty == "advanced" and puzzle.id == p.puzzle_id and p.successful
-                                               for puzzle in get_all_puzzles())]) >= 5
+        "depends_on": ["solved_by_difficulty.advanced"],
+        "condition": lambda progress: _solved_in(progress, "advanced") >= 5
     },
     "endgame_expert": {
         "name": "Endgame Expert",
         "description": "Mastered endgame techniques",
-        "condition": lambda progress: len([p for p in progress.completed_puzzles
-                                         if p.puzzle_id in ["a3", "a4"] and p.successful]) >= 2  # Endgame puzzles
+        "depends_on": ["total_puzzles_solved"],
+        "condition": lambda progress: len({"a3", "a4"} & progress.solved_id_set()) >= 2  # Endgame puzzles
     }
 }
 
-def get_all_puzzles():
-    """Placeholder - will be replaced with actual database query"""
-    return []
\ No newline at end of file
+# Achievement ids to re-check per counter
+ACHIEVEMENTS_BY_COUNTER: Dict[str, List[str]] = {}
+for _achievement_id, _achievement_info in ACHIEVEMENTS.items():
+    for _counter in _achievement_info["depends_on"]:
+        ACHIEVEMENTS_BY_COUNTER.setdefault(_counter, []).append(_achievement_id)
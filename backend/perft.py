@@ -0,0 +1,248 @@
+import argparse
+import sys
+import os
+import time
+from typing import Dict, List, Set
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from chesscore import (
+    Board, EMPTY, WHITE, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, PROMOTIONS, SQUARE_NAMES, PIECE_SYMBOLS,
+    KNIGHT_DELTAS, KING_DELTAS, ROOK_DIRECTIONS, BISHOP_DIRECTIONS, START_FEN, move_uci
+)
+from puzzle_data import CHESS_PUZZLES
+
+# Published perft counts (chessprogramming.org and the well-known en passant / castling edge cases)
+REFERENCE_POSITIONS = [
+    ("startpos", START_FEN, {1: 20, 2: 400, 3: 8902, 4: 197281, 5: 4865609}),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     {1: 48, 2: 2039, 3: 97862, 4: 4085603}),
+    ("position 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", {1: 14, 2: 191, 3: 2812, 4: 43238, 5: 674624}),
+    ("position 4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     {1: 6, 2: 264, 3: 9467, 4: 422333}),
+    ("position 4 mirrored", "r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1",
+     {1: 6, 2: 264, 3: 9467, 4: 422333}),
+    ("position 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", {1: 44, 2: 1486, 3: 62379, 4: 2103487}),
+    ("position 6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     {1: 46, 2: 2079, 3: 89890, 4: 3894594}),
+    ("illegal en passant (pin)", "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1", {6: 1134888}),
+    ("illegal en passant (discovered)", "8/8/4k3/8/2p5/8/B2P2K1/8 w - - 0 1", {6: 1015133}),
+    ("en passant gives check", "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1", {6: 1440467}),
+    ("short castling gives check", "5k2/8/8/8/8/8/8/4K2R w K - 0 1", {6: 661072}),
+    ("long castling gives check", "3k4/8/8/8/8/8/8/R3K3 w Q - 0 1", {6: 803711}),
+    ("castling rights", "r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1", {4: 1274206}),
+    ("castling prevented", "r3k2r/8/3Q4/8/8/5q2/8/R3K2R b KQkq - 0 1", {4: 1720476}),
+    ("promote out of check", "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1", {6: 3821001}),
+    ("discovered check", "8/8/1P2K3/8/2n5/1q6/8/5k2 b - - 0 1", {5: 1004658}),
+    ("promote to give check", "4k3/1P6/8/8/8/8/K7/8 w - - 0 1", {6: 217342}),
+    ("underpromote to give check", "8/P1k5/K7/8/8/8/8/8 w - - 0 1", {6: 92683}),
+    ("self stalemate", "K1k5/8/P7/8/8/8/8/8 w - - 0 1", {6: 2217}),
+    ("stalemate and checkmate", "8/k1P5/8/1K6/8/8/8/8 w - - 0 1", {7: 567584}),
+    ("stalemate and checkmate 2", "8/8/2k5/5q2/5n2/8/5K2/8 b - - 0 1", {4: 23527}),
+]
+
+
+def perft(board: Board, depth: int) -> int:
+    """Leaf nodes of the legal move tree (bulk-counted at the last ply)"""
+    moves = board.legal_moves()
+    if depth == 1:
+        return len(moves)
+    return sum(perft(board.play(move), depth - 1) for move in moves)
+
+
+def divide(board: Board, depth: int) -> Dict[str, int]:
+    """Perft split by first move, to find which branch disagrees with a reference"""
+    return {
+        move_uci(move): perft(board.play(move), depth - 1) if depth > 1 else 1
+        for move in board.legal_moves()
+    }
+
+
+# --- Reference generator ---
+# Deliberately naive: walks the square array, generates pseudo-legal moves and
+# keeps those that do not leave the king attacked. Shares nothing with the
+# bitboard generator except play(), so the two can check each other.
+
+def _walk(square: int, df: int, dr: int):
+    file, rank = (square & 7) + df, (square >> 3) + dr
+    while 0 <= file < 8 and 0 <= rank < 8:
+        yield rank * 8 + file
+        file, rank = file + df, rank + dr
+
+
+def _is_attacked(squares: List[int], square: int, by: int) -> bool:
+    base = by * 6
+    for df, dr in KNIGHT_DELTAS:
+        for target in list(_walk(square, df, dr))[:1]:
+            if squares[target] == base + KNIGHT:
+                return True
+    for df, dr in KING_DELTAS:
+        for target in list(_walk(square, df, dr))[:1]:
+            if squares[target] == base + KING:
+                return True
+    pawn_rank = -1 if by == WHITE else 1
+    for df in (-1, 1):
+        for target in list(_walk(square, df, pawn_rank))[:1]:
+            if squares[target] == base + PAWN:
+                return True
+    for directions, sliders in ((ROOK_DIRECTIONS, (ROOK, QUEEN)), (BISHOP_DIRECTIONS, (BISHOP, QUEEN))):
+        for df, dr in directions:
+            for target in _walk(square, df, dr):
+                if squares[target] != EMPTY:
+                    if squares[target] in (base + sliders[0], base + sliders[1]):
+                        return True
+                    break
+    return False
+
+
+def reference_moves(board: Board) -> Set[str]:
+    """Legal moves of a position as UCI strings, found the slow way"""
+    us, them = board.turn, board.turn ^ 1
+    squares = board.squares
+    base = us * 6
+    forward = 1 if us == WHITE else -1
+    candidates = []
+
+    def own(square):
+        return base <= squares[square] < base + 6
+
+    for square in range(64):
+        if not own(square):
+            continue
+        piece = squares[square] - base
+        if piece == PAWN:
+            one = square + 8 * forward
+            last_rank = 7 if us == WHITE else 0
+            targets = []
+            if squares[one] == EMPTY:
+                targets.append(one)
+                start_rank = 1 if us == WHITE else 6
+                if square >> 3 == start_rank and squares[one + 8 * forward] == EMPTY:
+                    targets.append(one + 8 * forward)
+            for df in (-1, 1):
+                for target in list(_walk(square, df, forward))[:1]:
+                    if (squares[target] != EMPTY and not own(target)) or target == board.ep_square:
+                        targets.append(target)
+            for target in targets:
+                if target >> 3 == last_rank:
+                    candidates.extend((square, target, promotion) for promotion in PROMOTIONS)
+                else:
+                    candidates.append((square, target, 0))
+        elif piece in (KNIGHT, KING):
+            for df, dr in KNIGHT_DELTAS if piece == KNIGHT else KING_DELTAS:
+                for target in list(_walk(square, df, dr))[:1]:
+                    if not own(target):
+                        candidates.append((square, target, 0))
+        else:
+            directions = {ROOK: ROOK_DIRECTIONS, BISHOP: BISHOP_DIRECTIONS, QUEEN: ROOK_DIRECTIONS + BISHOP_DIRECTIONS}[piece]
+            for df, dr in directions:
+                for target in _walk(square, df, dr):
+                    if own(target):
+                        break
+                    candidates.append((square, target, 0))
+                    if squares[target] != EMPTY:
+                        break
+
+    # Castling: rights held, squares between king and rook empty, king's path not attacked
+    king = squares.index(base + KING)
+    for right, rook_offset, path in ((0, 3, (1, 2)), (1, -4, (-1, -2))):
+        if board.castling >> (2 * us + right) & 1:
+            between = range(king + 1, king + 3) if rook_offset > 0 else range(king - 3, king)
+            if all(squares[s] == EMPTY for s in between) and not any(
+                _is_attacked(squares, king + step, them) for step in (0,) + path
+            ):
+                candidates.append((king, king + path[1], 0))
+
+    legal = set()
+    for from_square, to_square, promotion in candidates:
+        after = board.play(from_square | to_square << 6 | promotion << 12)
+        if not _is_attacked(after.squares, after.squares.index(base + KING), them):
+            legal.add(SQUARE_NAMES[from_square] + SQUARE_NAMES[to_square] + (PIECE_SYMBOLS[promotion] if promotion else ""))
+    return legal
+
+
+def cross_check(board: Board, depth: int, problems: List[str], limit: int = 5):
+    """Compare both generators at every node down to depth, recording positions where they disagree"""
+    fast = {move_uci(move) for move in board.legal_moves()}
+    slow = reference_moves(board)
+    if fast != slow:
+        problems.append(f"{board.fen()}: bitboard-only {sorted(fast - slow)}, reference-only {sorted(slow - fast)}")
+    if depth <= 1 or len(problems) >= limit:
+        return
+    for move in board.legal_moves():
+        cross_check(board.play(move), depth - 1, problems, limit)
+
+
+def run_position(name: str, fen: str, expected: Dict[int, int], max_nodes: int, check_depth: int) -> bool:
+    """Run one position's perft depths and generator cross-check; False on any mismatch"""
+    board = Board(fen)
+    ok = True
+    for depth, count in sorted(expected.items()):
+        if count is not None and count > max_nodes:
+            continue
+        started = time.perf_counter()
+        nodes = perft(board, depth)
+        elapsed = time.perf_counter() - started
+        nps = nodes / elapsed if elapsed else 0
+        status = "ok" if count is None or nodes == count else f"MISMATCH (expected {count})"
+        print(f"  {name:<32} depth {depth}  {nodes:>10} nodes  {elapsed:7.2f}s  {nps:>9.0f} nps  {status}")
+        if count is not None and nodes != count:
+            ok = False
+            for uci, subtotal in sorted(divide(board, depth).items()):
+                print(f"      {uci}: {subtotal}")
+
+    problems: List[str] = []
+    cross_check(board, check_depth, problems)
+    for problem in problems:
+        print(f"  ❌ {name}: generators disagree at {problem}")
+    return ok and not problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perft correctness and speed suite for the chess core")
+    parser.add_argument("--max-nodes", type=int, default=1_000_000,
+                        help="Skip reference depths whose expected count exceeds this")
+    parser.add_argument("--puzzle-depth", type=int, default=3, help="Perft depth for the puzzle positions")
+    parser.add_argument("--check-depth", type=int, default=2,
+                        help="Depth down to which every node is cross-checked against the reference generator")
+    parser.add_argument("--divide", metavar="FEN", help="Print the divide breakdown of one position and exit")
+    parser.add_argument("--depth", type=int, default=3, help="Depth for --divide")
+    args = parser.parse_args()
+
+    if args.divide:
+        board = Board(args.divide)
+        started = time.perf_counter()
+        breakdown = divide(board, args.depth)
+        elapsed = time.perf_counter() - started
+        for uci, subtotal in sorted(breakdown.items()):
+            print(f"{uci}: {subtotal}")
+        total = sum(breakdown.values())
+        print(f"\nMoves: {len(breakdown)}  Nodes: {total}  Time: {elapsed:.2f}s  NPS: {total / elapsed if elapsed else 0:.0f}")
+        return
+
+    failures = []
+    started = time.perf_counter()
+    print("📐 Reference positions")
+    for name, fen, expected in REFERENCE_POSITIONS:
+        if not run_position(name, fen, expected, args.max_nodes, args.check_depth):
+            failures.append(name)
+
+    print(f"🧩 Puzzle positions ({len(CHESS_PUZZLES)})")
+    for puzzle in CHESS_PUZZLES:
+        try:
+            Board(puzzle["fen"])
+        except ValueError as e:
+            # Bad puzzle data rather than a generator fault: reported, not failed
+            print(f"  ⚠️  {puzzle['id']}: skipped, illegal FEN ({e})")
+            continue
+        if not run_position(puzzle["id"], puzzle["fen"], {args.puzzle_depth: None}, args.max_nodes, args.check_depth):
+            failures.append(puzzle["id"])
+
+    print(f"\n⏱️  {time.perf_counter() - started:.1f}s total")
+    if failures:
+        print(f"❌ {len(failures)} positions failed: {', '.join(failures)}")
+        sys.exit(1)
+    print("✅ All perft counts match")
+
+
+if __name__ == "__main__":
+    main()
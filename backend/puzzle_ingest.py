@@ -0,0 +1,368 @@
+import argparse
+import asyncio
+import csv
+import gzip
+import hashlib
+import io
+import re
+import sys
+import os
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, TextIO
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymongo.errors import BulkWriteError
+from database import (
+    db, live_puzzles_collection, puzzle_content_hash, CatalogMetaDatabase, client, PUZZLE_INDEXES
+)
+from indexes import ensure_indexes
+from models import PuzzleModel
+from chesscore import apply_moves
+
+try:
+    import zstandard
+except ImportError:  # only needed for .zst files
+    zstandard = None
+
+# Lichess puzzle CSV columns (the official dump has no header row)
+LICHESS_COLUMNS = [
+    "PuzzleId", "FEN", "Moves", "Rating", "RatingDeviation", "Popularity",
+    "NbPlays", "Themes", "GameUrl", "OpeningTags"
+]
+
+# Lichess themes mapped onto the catalog categories; the first match wins
+THEME_CATEGORIES = [
+    ("mate", "checkmate"),
+    ("Endgame", "endgame"),
+    ("endgame", "endgame"),
+    ("sacrifice", "sacrifice"),
+    ("defensiveMove", "defense"),
+    ("kingsideAttack", "attack"),
+    ("queensideAttack", "attack"),
+    ("attackingF2F7", "attack"),
+    ("quietMove", "positional"),
+]
+
+# Themes that describe the puzzle length or outcome rather than the idea
+GENERIC_THEMES = {
+    "short", "long", "veryLong", "oneMove", "advantage", "crushing", "equality",
+    "master", "masterVsMaster", "superGM", "opening", "middlegame", "endgame"
+}
+
+
+def difficulty_for_rating(rating: int) -> str:
+    """Catalog difficulty band of a puzzle rating"""
+    if rating < 1000:
+        return "beginner"
+    if rating < 1500:
+        return "intermediate"
+    return "advanced"
+
+
+def humanize_theme(theme: str) -> str:
+    """mateIn2 -> Mate in 2, discoveredAttack -> Discovered attack"""
+    words = re.sub(r"(?<=[a-z])(?=[A-Z0-9])", " ", theme).lower()
+    return words[:1].upper() + words[1:]
+
+
+def category_for_themes(themes: List[str]) -> str:
+    for theme in themes:
+        for marker, category in THEME_CATEGORIES:
+            if marker in theme:
+                return category
+    return "tactics"
+
+
+def time_limit_for(solution_moves: List[str], rating: int) -> int:
+    """Minutes allowed: grows with the number of moves to find and with the rating"""
+    player_moves = (len(solution_moves) + 1) // 2
+    return min(30, 2 + 2 * player_moves + rating // 500)
+
+
+# --- Readers ---
+
+def open_text(path: Path) -> TextIO:
+    """Open a (possibly .gz/.zst compressed) text file for streaming"""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise SystemExit("Reading .zst files needs the zstandard package (pip install zstandard)")
+        raw = open(path, "rb")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw), encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def lichess_rows(stream: TextIO) -> Iterator[Dict[str, str]]:
+    """Rows of a Lichess puzzle CSV, with or without its header line"""
+    first_line = stream.readline()
+    if not first_line:
+        return
+    if first_line.startswith("PuzzleId"):
+        reader = csv.DictReader(stream, fieldnames=next(csv.reader([first_line])))
+    else:
+        reader = csv.DictReader(stream, fieldnames=LICHESS_COLUMNS)
+        yield next(csv.DictReader([first_line], fieldnames=LICHESS_COLUMNS))
+    yield from reader
+
+
+def puzzle_from_lichess(row: Dict[str, str]) -> Dict[str, Any]:
+    """Map a Lichess row onto the PuzzleModel shape.
+
+    Lichess positions are given before the opponent's last move: the first
+    UCI move is played to reach the puzzle position and the rest is the
+    solution (kept in UCI, which the board accepts next to SAN).
+    """
+    uci_moves = row["Moves"].split()
+    position = apply_moves(row["FEN"], uci_moves[:1])
+    solution = uci_moves[1:]
+    rating = int(row["Rating"])
+    themes = row.get("Themes", "").split()
+    motifs = [t for t in themes if t not in GENERIC_THEMES]
+    side = "White" if position.split()[1] == "w" else "Black"
+
+    mate_in = next((t for t in themes if re.fullmatch(r"mateIn\d+", t)), None)
+    if mate_in:
+        motifs = [t for t in motifs if t != "mate"]
+        title = f"Checkmate in {mate_in[6:]}"
+    else:
+        title = humanize_theme(motifs[0]) if motifs else f"Lichess puzzle {row['PuzzleId']}"
+    description = f"{side} to move" + (f": {', '.join(humanize_theme(t) for t in motifs).lower()}" if motifs else "")
+    hints = [f"Look for a {humanize_theme(t).lower()}" for t in motifs[:3]] or ["Look for forcing moves: checks, captures, threats"]
+    return PuzzleModel(
+        id=f"lichess_{row['PuzzleId']}",
+        title=title,
+        description=description,
+        difficulty=difficulty_for_rating(rating),
+        time_limit=time_limit_for(solution, rating),
+        rating=rating,
+        moves=solution,
+        position=position,
+        solution=" ".join(solution),
+        hints=hints,
+        category=category_for_themes(themes)
+    ).dict()
+
+
+PGN_HEADER = re.compile(r'^\[(\w+)\s+"(.*)"\]\s*$')
+PGN_NOISE = re.compile(r"\{[^}]*\}|;[^\n]*|\$\d+|\d+\.(\.\.)?|1-0|0-1|1/2-1/2|\*")
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+def _strip_variations(movetext: str) -> str:
+    depth, kept = 0, []
+    for char in movetext:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            kept.append(char)
+    return "".join(kept)
+
+
+def pgn_games(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """Headers and mainline SAN moves of each game, read one game at a time"""
+    headers: Dict[str, str] = {}
+    movetext: List[str] = []
+    for line in stream:
+        header = PGN_HEADER.match(line)
+        if header:
+            if movetext:
+                yield {"headers": headers, "moves": PGN_NOISE.sub(" ", _strip_variations(" ".join(movetext))).split()}
+                headers, movetext = {}, []
+            headers[header.group(1)] = header.group(2)
+        elif line.strip():
+            movetext.append(line.strip())
+    if headers or movetext:
+        yield {"headers": headers, "moves": PGN_NOISE.sub(" ", _strip_variations(" ".join(movetext))).split()}
+
+
+def puzzle_from_pgn(game: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a PGN game (FEN header + solution mainline) onto the PuzzleModel shape"""
+    headers, moves = game["headers"], game["moves"]
+    position = headers.get("FEN", START_FEN)
+    rating = int(headers.get("Rating") or headers.get("PuzzleRating") or 1500)
+    themes = headers.get("Themes", "").split()
+    puzzle_id = headers.get("PuzzleId") or hashlib.sha1(f"{position} {' '.join(moves)}".encode()).hexdigest()[:12]
+    side = "White" if position.split()[1] == "w" else "Black"
+    description = f"{side} to move" + (f": {', '.join(humanize_theme(t) for t in themes).lower()}" if themes else "")
+
+    return PuzzleModel(
+        id=f"pgn_{puzzle_id}",
+        title=headers.get("Event") or f"Puzzle {puzzle_id}",
+        description=description,
+        difficulty=difficulty_for_rating(rating),
+        time_limit=time_limit_for(moves, rating),
+        rating=rating,
+        moves=moves,
+        position=position,
+        solution=" ".join(moves),
+        hints=[f"Look for a {humanize_theme(t).lower()}" for t in themes[:3]] or ["Look for forcing moves: checks, captures, threats"],
+        category=category_for_themes(themes)
+    ).dict()
+
+
+def resolve_format(path: Path, file_format: str) -> str:
+    if file_format == "auto":
+        return "pgn" if ".pgn" in path.suffixes else "csv"
+    return file_format
+
+
+def iter_records(path: Path, file_format: str) -> Iterator[Dict[str, Any]]:
+    """Raw entries of one file (CSV rows or PGN games), not yet mapped or checked"""
+    with open_text(path) as stream:
+        yield from lichess_rows(stream) if file_format == "csv" else pgn_games(stream)
+
+
+# Record mapper per file format
+RECORD_MAPPERS = {"csv": puzzle_from_lichess, "pgn": puzzle_from_pgn}
+
+
+def iter_puzzles(path: Path, file_format: str) -> Iterator[Dict[str, Any]]:
+    """Stream puzzle documents from one file, skipping (and reporting) malformed entries"""
+    file_format = resolve_format(path, file_format)
+    to_puzzle = RECORD_MAPPERS[file_format]
+    for number, record in enumerate(iter_records(path, file_format), start=1):
+        try:
+            yield to_puzzle(record)
+        except (KeyError, ValueError, IndexError) as e:
+            print(f"⚠️  Skipping entry {number} of {path.name}: {e}")
+
+
+async def file_puzzles(paths: List[Path], file_format: str) -> AsyncIterator[Dict[str, Any]]:
+    """Puzzle documents of several files, for the async runners of the checking scripts"""
+    for path in paths:
+        for document in iter_puzzles(path, file_format):
+            yield document
+
+
+# --- Writer ---
+
+async def insert_batch(collection, batch: List[Dict[str, Any]], totals: Dict[str, int]):
+    try:
+        result = await collection.insert_many(batch, ordered=False)
+        totals["inserted"] += len(result.inserted_ids)
+    except BulkWriteError as e:
+        details = e.details
+        duplicates = sum(1 for error in details.get("writeErrors", []) if error.get("code") == 11000)
+        totals["inserted"] += details.get("nInserted", 0)
+        totals["duplicates"] += duplicates
+        totals["failed"] += len(details.get("writeErrors", [])) - duplicates
+
+
+async def ingest(paths: List[Path], file_format: str = "auto", batch_size: int = 1000,
+                 max_in_flight: int = 4, limit: Optional[int] = None, dry_run: bool = False,
+                 append: bool = False) -> Dict[str, int]:
+    """Stream puzzles from files into Mongo with at most max_in_flight unordered batches pending.
+
+    By default the files make up a new catalog version: they are loaded into
+    a fresh puzzles_v<N> collection, which is activated only once the load
+    succeeded and dropped otherwise. With append the puzzles are added to the
+    live catalog instead.
+    """
+    totals = {"read": 0, "inserted": 0, "duplicates": 0, "failed": 0}
+    collection, target = None, None
+    pending: set = set()
+    activated = False
+    try:
+        if not dry_run:
+            if append:
+                collection = await live_puzzles_collection()
+            else:
+                target = await CatalogMetaDatabase.next_collection_name()
+                collection = db[target]
+                await collection.create_indexes(PUZZLE_INDEXES)
+            print(f"📦 Writing into {collection.name}")
+
+        slots = asyncio.Semaphore(max_in_flight)
+        started = time.monotonic()
+        last_report = started
+
+        async def write(batch: List[Dict[str, Any]]):
+            try:
+                if not dry_run:
+                    await insert_batch(collection, batch, totals)
+            finally:
+                slots.release()
+
+        async def flush(batch: List[Dict[str, Any]]):
+            # Waiting for a free slot is what keeps the reader from running ahead of Mongo
+            await slots.acquire()
+            task = asyncio.create_task(write(batch))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        batch: List[Dict[str, Any]] = []
+        for path in paths:
+            print(f"📥 Reading {path}")
+            for puzzle in iter_puzzles(path, file_format):
+                puzzle["content_hash"] = puzzle_content_hash(puzzle)
+                batch.append(puzzle)
+                totals["read"] += 1
+                if len(batch) >= batch_size:
+                    await flush(batch)
+                    batch = []
+
+                now = time.monotonic()
+                if now - last_report >= 5:
+                    last_report = now
+                    print(f"  ... {totals['read']} rows read, {totals['inserted']} inserted, "
+                          f"{totals['read'] / (now - started):.0f} rows/s")
+                if limit and totals["read"] >= limit:
+                    break
+            if limit and totals["read"] >= limit:
+                break
+
+        if batch:
+            await flush(batch)
+        await asyncio.gather(*pending)
+
+        elapsed = time.monotonic() - started
+        rate = totals["read"] / elapsed if elapsed else 0
+        print(f"✅ Read {totals['read']} puzzles in {elapsed:.1f}s ({rate:.0f} rows/s): "
+              f"{totals['inserted']} inserted, {totals['duplicates']} already present, {totals['failed']} failed")
+        if dry_run:
+            return totals
+        if append:
+            if totals["inserted"]:
+                # Let running API processes pick up the new puzzles
+                await CatalogMetaDatabase.bump_version()
+        elif totals["failed"] or not totals["inserted"]:
+            print(f"⚠️  Not activating {target}; the live catalog is unchanged")
+        else:
+            await CatalogMetaDatabase.activate(target)
+            activated = True
+        return totals
+    finally:
+        # A failed or interrupted load leaves no half-built catalog version behind
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if target and not activated:
+            await CatalogMetaDatabase.abandon_build(target)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Stream puzzles from Lichess CSV (.csv/.gz/.zst) or PGN files into the catalog")
+    parser.add_argument("files", nargs="+", type=Path)
+    parser.add_argument("--format", choices=["auto", "csv", "pgn"], default="auto")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--max-in-flight", type=int, default=4, help="Batches written concurrently")
+    parser.add_argument("--limit", type=int, help="Stop after this many puzzles")
+    parser.add_argument("--dry-run", action="store_true", help="Parse and map only, write nothing")
+    parser.add_argument("--append", action="store_true",
+                        help="Add to the live catalog instead of loading a new catalog version")
+    args = parser.parse_args()
+
+    if args.append and not args.dry_run:
+        await ensure_indexes()
+    totals = await ingest(args.files, args.format, args.batch_size, args.max_in_flight, args.limit,
+                          args.dry_run, args.append)
+    client.close()
+    sys.exit(1 if totals["failed"] else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,57 +1,51 @@
+import argparse
 import asyncio
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from motor.motor_asyncio import AsyncIOMotorClient
-from dotenv import load_dotenv
-from pathlib import Path
 from puzzle_data import CHESS_PUZZLES
-from datetime import datetime
+from database import PuzzleDatabase, client
+from models import PuzzleModel
 
-# Load environment variables
-ROOT_DIR = Path(__file__).parent
-load_dotenv(ROOT_DIR / '.env')
 
-async def seed_puzzles():
-    """Seed the database with comprehensive chess puzzles"""
-    
-    # Connect to MongoDB
-    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
-    db = client[os.environ['DB_NAME']]
-    puzzles_collection = db.puzzles
-    
-    print(f"🔄 Starting to seed {len(CHESS_PUZZLES)} chess puzzles...")
-    
-    # Clear existing puzzles
-    await puzzles_collection.delete_many({})
-    print("🗑️  Cleared existing puzzles")
-    
-    # Insert new puzzles
-    puzzles_to_insert = []
-    
-    for puzzle_data in CHESS_PUZZLES:
-        puzzle = {
-            "id": puzzle_data["id"],
-            "title": puzzle_data["title"],
-            "description": puzzle_data["description"], 
-            "difficulty": puzzle_data["difficulty"],
-            "time_limit": puzzle_data["time_limit"],
-            "rating": puzzle_data["rating"],
-            "moves": puzzle_data["solution"],  # Store as moves array
-            "position": puzzle_data["fen"],    # FEN position
-            "solution": " ".join(puzzle_data["solution"]),  # Solution as string
-            "hints": puzzle_data["hints"],
-            "category": puzzle_data["category"],
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
-        }
-        puzzles_to_insert.append(puzzle)
-    
-    # Batch insert
-    result = await puzzles_collection.insert_many(puzzles_to_insert)
-    
-    print(f"✅ Successfully inserted {len(result.inserted_ids)} puzzles!")
+def puzzle_document(puzzle_data: dict) -> dict:
+    """Catalog document for a CHESS_PUZZLES entry (timestamps are set on write)"""
+    return {
+        "id": puzzle_data["id"],
+        "title": puzzle_data["title"],
+        "description": puzzle_data["description"], 
+        "difficulty": puzzle_data["difficulty"],
+        "time_limit": puzzle_data["time_limit"],
+        "rating": puzzle_data["rating"],
+        "moves": puzzle_data["solution"],  # Store as moves array
+        "position": puzzle_data["fen"],    # FEN position
+        "solution": " ".join(puzzle_data["solution"]),  # Solution as string
+        "hints": puzzle_data["hints"],
+        "category": puzzle_data["category"]
+    }
+
+
+async def seed_puzzles(dry_run: bool = False, rebuild: bool = False):
+    """Seed the database with comprehensive chess puzzles.
+
+    Only new or changed puzzles are written and only dropped ones removed
+    (by content hash), so reseeding never empties the catalog. rebuild loads
+    them into a new catalog version instead and switches to it atomically.
+    """
+    documents = [puzzle_document(p) for p in CHESS_PUZZLES]
+    if rebuild:
+        print(f"🔄 Building a new catalog version with {len(CHESS_PUZZLES)} chess puzzles...")
+        if not dry_run:
+            name = await PuzzleDatabase.build_catalog_version(PuzzleModel(**document) for document in documents)
+            print(f"✅ Catalog now served from {name}")
+    else:
+        print(f"🔄 Syncing {len(CHESS_PUZZLES)} chess puzzles...")
+        counts = await PuzzleDatabase.sync_puzzles(documents, dry_run=dry_run)
+        action = "Would write" if dry_run else "Wrote"
+        print(f"✅ {action} {counts['upserted']} new/changed puzzles, removed {counts['deleted']}, "
+              f"{counts['unchanged']} unchanged")
     
     # Print summary
     difficulty_counts = {}
@@ -73,9 +67,19 @@ async def seed_puzzles():
     for category, count in category_counts.items():
         print(f"  {category.capitalize()}: {count} puzzles")
     
-    # Close connection
-    client.close()
     print("\n🎉 Database seeding completed successfully!")
 
+
+async def main():
+    parser = argparse.ArgumentParser(description="Sync the catalog with puzzle_data.CHESS_PUZZLES")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Load into a new catalog version and switch to it instead of syncing in place")
+    args = parser.parse_args()
+
+    await seed_puzzles(dry_run=args.dry_run, rebuild=args.rebuild)
+    client.close()
+
+
 if __name__ == "__main__":
-    asyncio.run(seed_puzzles())
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
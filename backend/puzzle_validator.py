@@ -0,0 +1,242 @@
+import argparse
+import asyncio
+import json
+import re
+import sys
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from chesscore import Board, UCI_MOVE, move_uci
+from database import live_puzzles_collection, PuzzleDatabase, client
+from indexes import ensure_indexes
+from solutions import complete_fen, spellings_for
+
+# Fields the checks need; everything else stays in Mongo
+PROJECTION = {"_id": 0, "id": 1, "position": 1, "moves": 1, "solution": 1}
+
+MOVE_NUMBER = re.compile(r"^\d+\.+")
+
+# Puzzles between progress lines
+PROGRESS_EVERY = 100_000
+
+
+def issue(code: str, message: str, ply: Optional[int] = None, move: Optional[str] = None) -> Dict[str, Any]:
+    entry = {"code": code, "message": message}
+    if ply is not None:
+        entry["ply"] = ply
+        entry["move"] = move
+    return entry
+
+
+def validate_puzzle(puzzle: Dict[str, Any]) -> Dict[str, Any]:
+    """Check one puzzle document.
+
+    Errors (the puzzle is invalid): illegal_fen, no_moves, illegal_move,
+    notation (SAN that names another move, e.g. a capture without 'x'),
+    false_mate and false_check. Warnings: unmarked_mate, solution_mismatch.
+    """
+    errors: List[Dict[str, Any]] = []
+    warnings: List[Dict[str, Any]] = []
+    result = {"id": puzzle.get("id"), "valid": False, "errors": errors, "warnings": warnings}
+
+    try:
+        board = Board(complete_fen(puzzle.get("position") or ""))
+    except ValueError as e:
+        errors.append(issue("illegal_fen", str(e)))
+        return result
+
+    moves = puzzle.get("moves") or []
+    if not moves:
+        errors.append(issue("no_moves", "Puzzle has no solution moves"))
+    for ply, text in enumerate(moves):
+        try:
+            legal = board.legal_moves()
+            move = board.parse_move(text, legal)
+        except ValueError as e:
+            errors.append(issue("illegal_move", str(e), ply, text))
+            break
+
+        san, uci = board.san(move, legal), move_uci(move)
+        written = text.rstrip("!?")
+        bare = written.rstrip("+#")
+        if not UCI_MOVE.match(text) and bare not in spellings_for(san, uci):
+            errors.append(issue("notation", f"{text} is {san} in this position", ply, text))
+
+        board = board.play(move)
+        marks = written[len(bare):]
+        if "#" in marks and not san.endswith("#"):
+            errors.append(issue("false_mate", f"{text} does not mate", ply, text))
+        elif "+" in marks and not san.endswith(("+", "#")):
+            errors.append(issue("false_check", f"{text} does not give check", ply, text))
+        elif san.endswith("#") and "#" not in marks and not UCI_MOVE.match(text):
+            warnings.append(issue("unmarked_mate", f"{text} mates but is not marked #", ply, text))
+
+    solution = [MOVE_NUMBER.sub("", token) for token in (puzzle.get("solution") or "").split()]
+    solution = [token.rstrip("+#!?") for token in solution if token]
+    if solution and solution != [text.rstrip("+#!?") for text in moves]:
+        warnings.append(issue("solution_mismatch", f"solution {puzzle.get('solution')!r} differs from moves {moves}"))
+
+    result["valid"] = not errors
+    return result
+
+
+def validate_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a raw file entry (see file_entries) in the worker, then validate it.
+
+    An entry whose position or setup move cannot be played is reported as
+    illegal_fen under its file and entry number instead of being dropped.
+    """
+    from puzzle_ingest import RECORD_MAPPERS
+    try:
+        puzzle = RECORD_MAPPERS[entry["format"]](entry["record"])
+    except (KeyError, ValueError, IndexError) as e:
+        message = f"Entry {entry['entry']} of {entry['file']}: {e}"
+        return {"id": f"{entry['file']}#{entry['entry']}", "valid": False,
+                "errors": [issue("illegal_fen", message)], "warnings": []}
+    return validate_puzzle(puzzle)
+
+
+def validate_chunk(puzzles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Worker entry point: validate a batch of puzzles (or raw file entries) in one process round trip"""
+    return [validate_entry(puzzle) if "record" in puzzle else validate_puzzle(puzzle) for puzzle in puzzles]
+
+
+# --- Sources ---
+
+async def catalog_puzzles(batch_size: int) -> AsyncIterator[Dict[str, Any]]:
+    collection = await live_puzzles_collection()
+    async for document in collection.find({}, PROJECTION).batch_size(batch_size):
+        yield document
+
+
+async def sample_data_puzzles() -> AsyncIterator[Dict[str, Any]]:
+    from puzzle_seeder import puzzle_document
+    from puzzle_data import CHESS_PUZZLES
+    for puzzle_data in CHESS_PUZZLES:
+        yield puzzle_document(puzzle_data)
+
+
+async def file_entries(paths: List[Path], file_format: str) -> AsyncIterator[Dict[str, Any]]:
+    """Raw file entries, left for the workers to map.
+
+    Parsing the FEN and replaying the setup move is most of the cost, so it
+    runs in the pool, and an entry that fails it is a finding, not a skip.
+    """
+    from puzzle_ingest import iter_records, resolve_format
+    for path in paths:
+        entry_format = resolve_format(path, file_format)
+        for number, record in enumerate(iter_records(path, entry_format), start=1):
+            yield {"file": path.name, "entry": number, "format": entry_format, "record": record}
+
+
+# --- Runner ---
+
+async def process_in_pool(puzzles: AsyncIterator[Dict[str, Any]], chunk_worker: Callable[[List[Dict[str, Any]]], List[Any]],
+                          collect: Callable[[List[Any]], None], workers: int, chunk_size: int):
+    """Run chunk_worker over a stream of puzzles across a process pool.
+
+    At most two chunks per worker are in flight, so memory stays flat however
+    large the input; collect gets each chunk's results as it finishes.
+    """
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        chunk: List[Dict[str, Any]] = []
+
+        async def submit(batch: List[Dict[str, Any]]):
+            nonlocal pending
+            pending.add(loop.run_in_executor(executor, chunk_worker, batch))
+            if len(pending) >= workers * 2:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    collect(future.result())
+
+        async for puzzle in puzzles:
+            chunk.append(puzzle)
+            if len(chunk) >= chunk_size:
+                await submit(chunk)
+                chunk = []
+        if chunk:
+            await submit(chunk)
+        if pending:
+            for future in (await asyncio.wait(pending))[0]:
+                collect(future.result())
+
+
+async def validate(puzzles: AsyncIterator[Dict[str, Any]], workers: int, chunk_size: int) -> Dict[str, Any]:
+    """Validate a stream of puzzles across a process pool"""
+    summary = {"checked": 0, "valid": 0, "invalid": 0, "with_warnings": 0, "issues": {}}
+    flagged: List[Dict[str, Any]] = []
+    started = time.monotonic()
+
+    def collect(results: List[Dict[str, Any]]):
+        checked_before = summary["checked"]
+        for result in results:
+            summary["checked"] += 1
+            summary["valid" if result["valid"] else "invalid"] += 1
+            if result["warnings"]:
+                summary["with_warnings"] += 1
+            for entry in result["errors"] + result["warnings"]:
+                summary["issues"][entry["code"]] = summary["issues"].get(entry["code"], 0) + 1
+            if result["errors"] or result["warnings"]:
+                flagged.append(result)
+        if summary["checked"] // PROGRESS_EVERY != checked_before // PROGRESS_EVERY:
+            print(f"  {summary['checked']} checked, {summary['invalid']} invalid "
+                  f"({summary['checked'] / (time.monotonic() - started):.0f}/s)")
+
+    await process_in_pool(puzzles, validate_chunk, collect, workers, chunk_size)
+    summary["seconds"] = round(time.monotonic() - started, 2)
+    return {"summary": summary, "puzzles": flagged}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Check every puzzle's FEN and solution line with the chess core")
+    parser.add_argument("files", nargs="*", type=Path, help="Lichess CSV / PGN files to check instead of the catalog")
+    parser.add_argument("--source", choices=["catalog", "puzzle-data"], default="catalog",
+                        help="Puzzles to check when no files are given")
+    parser.add_argument("--format", choices=["auto", "csv", "pgn"], default="auto")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Puzzles per worker task")
+    parser.add_argument("--report", type=Path, help="Write the JSON report (summary and flagged puzzles) here")
+    parser.add_argument("--quarantine", action="store_true",
+                        help="Move invalid puzzles out of the live catalog into puzzles_quarantine")
+    args = parser.parse_args()
+    if args.quarantine and (args.files or args.source != "catalog"):
+        parser.error("--quarantine only applies to the live catalog")
+
+    if args.files:
+        source, puzzles = "files", file_entries(args.files, args.format)
+    elif args.source == "puzzle-data":
+        source, puzzles = "puzzle-data", sample_data_puzzles()
+    else:
+        source, puzzles = "catalog", catalog_puzzles(args.chunk_size)
+
+    print(f"🔍 Validating {source} puzzles on {args.workers} workers...")
+    report = await validate(puzzles, args.workers, args.chunk_size)
+    report["source"] = source
+    summary = report["summary"]
+    print(f"✅ Checked {summary['checked']} puzzles in {summary['seconds']}s: {summary['valid']} valid, "
+          f"{summary['invalid']} invalid, {summary['with_warnings']} with warnings")
+    for code, count in sorted(summary["issues"].items(), key=lambda item: -item[1]):
+        print(f"  {code}: {count}")
+
+    invalid = {result["id"]: result["errors"] for result in report["puzzles"] if not result["valid"]}
+    if args.quarantine and invalid:
+        await ensure_indexes()
+        moved = await PuzzleDatabase.quarantine_puzzles(invalid)
+        summary["quarantined"] = moved
+        print(f"🚧 Quarantined {moved} invalid puzzles")
+
+    if args.report:
+        args.report.write_text(json.dumps(report, indent=2, default=str))
+        print(f"📝 Report written to {args.report}")
+    client.close()
+    sys.exit(1 if invalid and not args.quarantine else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
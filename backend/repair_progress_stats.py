@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import progress_collection, ProgressDatabase, AttemptDatabase, client
+from catalog import PuzzleCatalog
+from models import UserProgress
+from services import ProgressService
+
+
+async def repair_progress_stats(fix: bool = False):
+    """Recompute every user's materialized stats from history and report drift"""
+    catalog = PuzzleCatalog()
+    await catalog.load()
+
+    checked = 0
+    drifted = 0
+    async for progress_data in progress_collection.find({}):
+        progress = UserProgress(**progress_data)
+        history = list(progress.completed_puzzles)
+        history.extend([attempt async for attempt in AttemptDatabase.iter_attempts(progress.user_id)])
+        expected = ProgressService.compute_stats(history, catalog.by_id)
+        checked += 1
+
+        if progress.stats == expected:
+            continue
+
+        drifted += 1
+        print(f"⚠️  Drift for {progress.user_id}: stored={progress.stats} expected={expected}")
+        if fix:
+            await ProgressDatabase.save_stats(progress.user_id, expected)
+
+    print(f"\n📊 Checked {checked} users, {drifted} with drifted stats")
+    if drifted and fix:
+        print(f"🔧 Repaired stats for {drifted} users")
+    return drifted
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Recompute materialized progress stats from completion history")
+    parser.add_argument("--fix", action="store_true", help="Write the recomputed stats back")
+    args = parser.parse_args()
+
+    drifted = await repair_progress_stats(fix=args.fix)
+    client.close()
+    # Non-zero exit when drift was found and left in place, for use as a check
+    sys.exit(1 if drifted and not args.fix else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,169 @@
+import json
+import os
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from database import catalog_listeners
+
+try:
+    import brotli
+except ImportError:  # optional, responses fall back to gzip
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 9
+
+# Listing pages kept serialized, per catalog version (least recently used evicted first)
+MAX_CACHED_PAGES = int(os.environ.get("CATALOG_PAGE_CACHE_SIZE", "512"))
+
+# Brotli-encoded responses kept per page, one per distinct completed_ids tail
+MAX_BROTLI_TAILS = 8
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dump_json(value: Any) -> bytes:
+    """Compact JSON bytes, encoding datetimes the way FastAPI does"""
+    return json.dumps(value, default=_json_default, separators=(",", ":")).encode()
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Set[str]:
+    """Content codings an Accept-Encoding header allows (q > 0)"""
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding)
+    return accepted
+
+
+def choose_encoding(accept_encoding: Optional[str], available: Tuple[str, ...]) -> Optional[str]:
+    """First of the available codings the client accepts, None for identity"""
+    accepted = accepted_encodings(accept_encoding)
+    for coding in available:
+        if coding in accepted or "*" in accepted:
+            return coding
+    return None
+
+
+def encoded_etag(etag: Optional[str], encoding: Optional[str]) -> Optional[str]:
+    """Strong ETags differ per content coding"""
+    if etag is None or encoding is None:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+class CatalogPage:
+    """One listing page serialized once, with the per-user part appended at render time.
+
+    The user-independent body ({"puzzles": [...], "next_cursor": ...) is
+    encoded to JSON once and its compressed variants are built with the
+    page. Rendering appends the user's completed_ids tail: for gzip the
+    compressor state after the body is kept, so each request only
+    compresses the tail on a copy of it; brotli cannot resume a stream, so
+    whole responses are kept for the last few distinct tails.
+    """
+
+    # Codings every page can be rendered in, best first
+    encodings: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def __init__(self, puzzles: List[Dict[str, Any]], next_cursor: Optional[str]):
+        self.puzzle_ids = [puzzle["id"] for puzzle in puzzles]
+        self.body = b'{"puzzles":' + dump_json(puzzles) + b',"next_cursor":' + dump_json(next_cursor)
+        self._gzip = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        self._gzip_body = self._gzip.compress(self.body) + self._gzip.flush(zlib.Z_SYNC_FLUSH)
+        self._brotli: "OrderedDict[Tuple[str, ...], bytes]" = OrderedDict()
+        if brotli is not None:
+            self._render_brotli([])
+
+    @staticmethod
+    def _tail(completed_ids: List[str]) -> bytes:
+        return b',"completed_ids":' + dump_json(completed_ids) + b"}"
+
+    def _render_brotli(self, completed_ids: List[str]) -> bytes:
+        key = tuple(completed_ids)
+        rendered = self._brotli.get(key)
+        if rendered is None:
+            rendered = brotli.compress(self.body + self._tail(completed_ids), quality=BROTLI_QUALITY)
+            self._brotli[key] = rendered
+            while len(self._brotli) > MAX_BROTLI_TAILS:
+                self._brotli.popitem(last=False)
+        else:
+            self._brotli.move_to_end(key)
+        return rendered
+
+    def render(self, completed_ids: List[str], encoding: Optional[str] = None) -> bytes:
+        if encoding == "br":
+            return self._render_brotli(completed_ids)
+        tail = self._tail(completed_ids)
+        if encoding != "gzip":
+            return self.body + tail
+        compressor = self._gzip.copy()
+        return self._gzip_body + compressor.compress(tail) + compressor.flush()
+
+
+class StaticPayload:
+    """A user-independent response body with its gzip and brotli variants built up front"""
+
+    def __init__(self, value: Any):
+        self.variants: Dict[Optional[str], bytes] = {None: dump_json(value)}
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(self.variants[None], quality=BROTLI_QUALITY)
+        self.variants["gzip"] = zlib.compress(self.variants[None], GZIP_LEVEL, wbits=31)
+
+    @property
+    def encodings(self) -> Tuple[str, ...]:
+        return tuple(coding for coding in self.variants if coding is not None)
+
+    def render(self, encoding: Optional[str] = None) -> bytes:
+        return self.variants[encoding]
+
+
+class CatalogPageCache:
+    """Serialized listing pages keyed by catalog version and request variant"""
+
+    def __init__(self, max_pages: int = MAX_CACHED_PAGES):
+        self.max_pages = max_pages
+        self._pages: "OrderedDict[Tuple[int, str], CatalogPage]" = OrderedDict()
+        self.counters: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    def get(self, version: int, variant: str) -> Optional[CatalogPage]:
+        page = self._pages.get((version, variant))
+        if page is None:
+            self.counters["misses"] += 1
+            return None
+        self._pages.move_to_end((version, variant))
+        self.counters["hits"] += 1
+        return page
+
+    def put(self, version: int, variant: str, page: CatalogPage):
+        self._pages[(version, variant)] = page
+        self._pages.move_to_end((version, variant))
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def invalidate(self, version: Optional[int] = None):
+        """Drop pages of other catalog versions"""
+        for key in [key for key in self._pages if key[0] != version]:
+            del self._pages[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {"pages": len(self._pages), **self.counters}
+
+
+# Shared page cache for the API process
+catalog_pages = CatalogPageCache()
+catalog_listeners.append(catalog_pages.invalidate)
@@ -1,33 +1,118 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response, Header
+from fastapi.responses import JSONResponse
 from typing import Optional, Dict, Any
-from services import PuzzleService, ProgressService, AchievementService, GameStateService
-from models import PuzzleAttempt, AchievementRequest
+from services import PuzzleService, ProgressService, AchievementService, GameStateService, single_flight
+from metrics import request_metrics
+from workers import background_workers
+from startup import startup_state
+from etags import etag_matches, PRIVATE_CACHE_CONTROL, PUBLIC_CACHE_CONTROL
+from response_cache import CatalogPage, choose_encoding, encoded_etag, catalog_pages
+from models import PuzzleAttempt, AchievementRequest, PuzzleFilter, MoveSubmission, PUZZLE_SUMMARY_FIELDS
 
 # Create router with /api prefix
 router = APIRouter(prefix="/api")
 
 
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def set_cache_headers(response: Response, etag: Optional[str], cache_control: str):
+    if etag:
+        response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def encoded_response(body: bytes, encoding: Optional[str], etag: Optional[str], cache_control: str) -> Response:
+    """Response for already-serialized (and possibly compressed) JSON"""
+    response = Response(content=body, media_type="application/json", headers={"Vary": "Accept-Encoding"})
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    set_cache_headers(response, etag, cache_control)
+    return response
+
+
 # Puzzle routes
 @router.get("/puzzles")
 async def get_puzzles(
+    request: Request,
     difficulty: Optional[str] = Query(None, regex="^(beginner|intermediate|advanced)$"),
-    completed: Optional[bool] = None
+    category: Optional[str] = None,
+    rating_min: Optional[int] = Query(None, ge=0),
+    rating_max: Optional[int] = Query(None, ge=0),
+    time_limit: Optional[int] = Query(None, ge=1),
+    completed: Optional[bool] = None,
+    sort: str = Query("rating", regex="^-?rating$"),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    fields: Optional[str] = None,
+    view: Optional[str] = Query(None, regex="^(full|summary)$"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
 ):
-    """Get all puzzles, optionally filtered by difficulty and completion status"""
+    """Get a page of puzzles, filtered server-side and ordered by rating (sort=-rating for descending).
+
+    time_limit keeps puzzles that fit within that many minutes. Pass the
+    returned next_cursor as cursor, with the same filters and sort, to get
+    the following page. fields (comma-separated) or view=summary trim each
+    puzzle to the given fields. completed_ids lists the puzzles on the page
+    the user has solved. Responses carry an ETag; a matching If-None-Match
+    is answered with 304 from in-memory versions alone.
+    """
+    try:
+        variant = str(sorted(request.query_params.multi_items()))
+        encoding = choose_encoding(accept_encoding, CatalogPage.encodings)
+        etag = encoded_etag(await PuzzleService.puzzles_etag(variant), encoding)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, PRIVATE_CACHE_CONTROL)
+        
+        puzzle_filter = PuzzleFilter(
+            difficulty=difficulty,
+            category=category,
+            rating_min=rating_min,
+            rating_max=rating_max,
+            time_limit=time_limit,
+            completed=completed
+        )
+        field_list = fields.split(",") if fields else (PUZZLE_SUMMARY_FIELDS if view == "summary" else None)
+        page, completed_ids = await PuzzleService.get_puzzle_listing(
+            puzzle_filter, cursor, limit, field_list, sort, variant
+        )
+        etag = encoded_etag(await PuzzleService.puzzles_etag(variant), encoding)
+        return encoded_response(page.render(completed_ids, encoding), encoding, etag, PRIVATE_CACHE_CONTROL)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/puzzles/facets")
+async def get_puzzle_facets(if_none_match: Optional[str] = Header(None),
+                            accept_encoding: Optional[str] = Header(None)):
+    """Get puzzle counts by difficulty, category and rating bucket"""
     try:
-        puzzles = await PuzzleService.get_all_puzzles(difficulty, completed)
-        return {"puzzles": puzzles}
+        payload = await PuzzleService.get_facets()
+        encoding = choose_encoding(accept_encoding, payload.encodings)
+        etag = encoded_etag(await PuzzleService.facets_etag(), encoding)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, PUBLIC_CACHE_CONTROL)
+        return encoded_response(payload.render(encoding), encoding, etag, PUBLIC_CACHE_CONTROL)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/puzzles/{puzzle_id}")
-async def get_puzzle(puzzle_id: str):
+async def get_puzzle(puzzle_id: str, response: Response, if_none_match: Optional[str] = Header(None)):
     """Get specific puzzle by ID"""
     try:
+        etag = await PuzzleService.puzzles_etag(puzzle_id)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, PRIVATE_CACHE_CONTROL)
+        
         puzzle = await PuzzleService.get_puzzle_by_id(puzzle_id)
         if not puzzle:
             raise HTTPException(status_code=404, detail="Puzzle not found")
+        set_cache_headers(response, await PuzzleService.puzzles_etag(puzzle_id), PRIVATE_CACHE_CONTROL)
         return puzzle
     except HTTPException:
         raise
@@ -35,6 +120,29 @@ async def get_puzzle(puzzle_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/puzzles/{puzzle_id}/move")
+async def submit_move(puzzle_id: str, submission: MoveSubmission):
+    """Check a move (SAN or UCI) played at the given ply against the solution line.
+
+    A correct move returns the opponent's reply, the position after it and
+    the next ply; solved is true once the line is finished (or the move mates).
+    Puzzles whose stored line cannot be played are answered with 409.
+    """
+    try:
+        result = await PuzzleService.submit_move(puzzle_id, submission)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Puzzle not found")
+        if not result["checkable"]:
+            return JSONResponse(status_code=409, content=result)
+        return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/puzzles/{puzzle_id}/complete")
 async def complete_puzzle(puzzle_id: str, attempt: PuzzleAttempt):
     """Mark puzzle as completed and update progress"""
@@ -105,5 +213,25 @@ async def load_game_state(puzzle_id: str):
 # Health check
 @router.get("/health")
 async def health_check():
-    """API health check"""
-    return {"status": "healthy", "message": "Chess Puzzles API is running"}
\ No newline at end of file
+    """API health check (liveness: the process is up and serving)"""
+    return {"status": "healthy", "message": "Chess Puzzles API is running"}
+
+
+@router.get("/ready")
+async def readiness_check():
+    """Readiness: 200 once indexes, seeding and caches are done, 503 before"""
+    report = startup_state.report()
+    if not report["ready"]:
+        return JSONResponse(status_code=503, content=report)
+    return report
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """Per-stage latency percentiles, background queue, response cache and coalescing metrics of the API process"""
+    return {
+        "latency": request_metrics.summary(),
+        "background_workers": background_workers.stats(),
+        "catalog_pages": catalog_pages.stats(),
+        "single_flight": single_flight.stats()
+    }
\ No newline at end of file
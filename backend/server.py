@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
 import os
 import logging
 from pathlib import Path
@@ -9,6 +10,11 @@ from pathlib import Path
 # Import new modules using absolute imports
 from routes import router
 from database import init_database
+from indexes import ensure_indexes, check_query_coverage
+from catalog import puzzle_catalog
+from facets import puzzle_facets
+from workers import background_workers
+from startup import startup_state
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -30,6 +36,7 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Configure logging
@@ -39,15 +46,44 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Seconds between attempts of the startup sequence (e.g. while MongoDB is not reachable yet)
+STARTUP_RETRY_DELAY = float(os.environ.get("STARTUP_RETRY_DELAY", "5"))
+
+
+async def initialize():
+    """Prepare indexes, seed data and caches; /api/ready reports true once this finishes"""
+    while True:
+        startup_state.attempts += 1
+        try:
+            startup_state.begin("indexes")
+            await ensure_indexes()
+            await check_query_coverage()
+            startup_state.begin("seeding")
+            await init_database()
+            logger.info("Database initialized successfully")
+            startup_state.begin("catalog")
+            await puzzle_catalog.load()
+            logger.info(f"Puzzle catalog loaded with {len(puzzle_catalog)} puzzles")
+            await puzzle_facets.rebuild()
+            startup_state.begin("workers")
+            await background_workers.start()
+            startup_state.finish()
+            logger.info(f"Ready after {startup_state.ready_after:.2f}s")
+            return
+        except Exception as e:
+            startup_state.fail(e)
+            logger.error(f"Failed to initialize database ({startup_state.stage}): {e}, retrying in {STARTUP_RETRY_DELAY}s")
+            await asyncio.sleep(STARTUP_RETRY_DELAY)
+
+
 @app.on_event("startup")
 async def startup_db_client():
-    """Initialize database on startup"""
-    try:
-        await init_database()
-        logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
+    """Start initialization in the background so liveness is served while it runs"""
+    app.state.initialization = asyncio.create_task(initialize())
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    app.state.initialization.cancel()
+    # Let queued side effects finish while the database is still reachable
+    await background_workers.drain()
     client.close()
@@ -1,139 +1,362 @@
-from typing import List, Optional, Dict, Any
-from datetime import datetime
-from database import PuzzleDatabase, ProgressDatabase, GameStateDatabase
+import asyncio
+import base64
+import json
+import os
+import time
+from typing import List, Optional, Dict, Any, Iterable, Awaitable, Callable, Hashable, TypeVar, Tuple
+from database import PuzzleDatabase, ProgressDatabase, GameStateDatabase, AttemptDatabase, utc_now
+from catalog import puzzle_catalog
+from facets import puzzle_facets
+from etags import completion_versions, make_etag
+from response_cache import CatalogPage, StaticPayload, catalog_pages
+from metrics import request_metrics
+from workers import background_workers
 from models import (
     PuzzleModel, UserProgress, GameState, CompletedPuzzle, 
-    PuzzleAttempt, ProgressResponse, ACHIEVEMENTS
+    PuzzleAttempt, ProgressStats, ACHIEVEMENTS, ACHIEVEMENTS_BY_COUNTER,
+    PuzzleFilter, MoveSubmission, PUZZLE_ANSWER_FIELDS
 )
 
 
+# Page size of the puzzle listing when the client does not ask for one, and the largest allowed
+DEFAULT_PAGE_SIZE = int(os.environ.get("PUZZLE_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.environ.get("PUZZLE_MAX_PAGE_SIZE", "200"))
+
+
+def encode_cursor(puzzle: Dict[str, Any]) -> str:
+    """Opaque keyset cursor pointing after puzzle in (rating, id) order"""
+    raw = json.dumps([puzzle["rating"], puzzle["id"]], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, str]:
+    """Inverse of encode_cursor, raises ValueError on a malformed cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        rating, puzzle_id = json.loads(raw)
+        return int(rating), str(puzzle_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent identical reads.
+
+    The first caller for a key starts the work; callers arriving while it is
+    in flight await the same task instead of repeating it. Results are shared
+    between callers, so they must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.counters: Dict[str, int] = {"calls": 0, "executed": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, work: Callable[[], Awaitable[T]]) -> T:
+        self.counters["calls"] += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.counters["executed"] += 1
+            task = asyncio.ensure_future(work())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.counters["coalesced"] += 1
+        # Shielded so one caller going away does not cancel the others' read
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": len(self._in_flight), **self.counters}
+
+
+# Shared single-flight group for the API process
+single_flight = SingleFlight()
+
+
+def read_progress(user_id: str = "default_user") -> Awaitable[UserProgress]:
+    """Coalesced progress read; keyed on the cached completion version so a read never joins one from before a completion"""
+    return single_flight.do(
+        ("progress", user_id, completion_versions.get(user_id)),
+        lambda: ProgressDatabase.get_or_create_progress(user_id)
+    )
+
+
 class PuzzleService:
     @staticmethod
-    async def get_all_puzzles(difficulty: Optional[str] = None, completed: Optional[bool] = None) -> List[Dict[str, Any]]:
-        """Get all puzzles with completion status"""
-        puzzles = await PuzzleDatabase.get_all_puzzles(difficulty)
-        progress = await ProgressDatabase.get_or_create_progress()
+    async def get_puzzle_listing(puzzle_filter: PuzzleFilter, cursor: Optional[str] = None,
+                                 limit: Optional[int] = None, fields: Optional[List[str]] = None,
+                                 sort: str = "rating", variant: str = "") -> Tuple[CatalogPage, List[str]]:
+        """Get one page of filtered puzzles, ordered by rating, and the ids on it the user has solved.
+
+        Pages that do not depend on the user (no completed filter) are
+        serialized once per catalog version and variant and reused.
+        """
+        limit = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+        after = decode_cursor(cursor) if cursor else None
+        if fields:
+            unknown = set(fields) - (set(PuzzleModel.model_fields) - set(PUZZLE_ANSWER_FIELDS))
+            if unknown:
+                raise ValueError(f"Unknown puzzle fields: {', '.join(sorted(unknown))}")
         
-        # Convert to dict and add completion status
-        result = []
-        for puzzle in puzzles:
-            puzzle_dict = puzzle.dict()
-            
-            # Check if puzzle is completed
-            is_completed = any(cp.puzzle_id == puzzle.id and cp.successful for cp in progress.completed_puzzles)
-            puzzle_dict['completed'] = is_completed
-            
-            # Filter by completion status if requested
-            if completed is not None and completed != is_completed:
-                continue
-                
-            result.append(puzzle_dict)
+        if puzzle_filter.completed is None:
+            query = PuzzleDatabase.build_query(puzzle_filter)
+            page, progress = await asyncio.gather(
+                PuzzleService._cached_page(query, after, limit, fields, sort, variant),
+                read_progress()
+            )
+            solved_ids = progress.solved_id_set()
+        else:
+            # The completed filter goes into the query as the user's solved-id set
+            progress = await read_progress()
+            solved_ids = progress.solved_id_set()
+            query = PuzzleDatabase.build_query(puzzle_filter, solved_ids)
+            page = await PuzzleService._fetch_page(query, after, limit, fields, sort)
+        completion_versions.set(progress.user_id, progress.completion_version)
         
-        return result
+        return page, [puzzle_id for puzzle_id in page.puzzle_ids if puzzle_id in solved_ids]
+
+    @staticmethod
+    async def _cached_page(query: Dict[str, Any], after: Optional[Tuple[int, str]], limit: int,
+                           fields: Optional[List[str]], sort: str, variant: str) -> CatalogPage:
+        await puzzle_catalog.ensure_fresh()
+        version = puzzle_catalog.version
+        page = catalog_pages.get(version, variant)
+        if page is None:
+            page = await single_flight.do(
+                ("page", version, variant),
+                lambda: PuzzleService._fetch_page(query, after, limit, fields, sort)
+            )
+            catalog_pages.put(version, variant, page)
+        return page
+
+    @staticmethod
+    async def _fetch_page(query: Dict[str, Any], after: Optional[Tuple[int, str]], limit: int,
+                          fields: Optional[List[str]], sort: str) -> CatalogPage:
+        # One extra row tells whether another page follows
+        puzzles = await PuzzleDatabase.get_puzzles_page(query, limit + 1, after, fields, sort == "-rating")
+        has_more = len(puzzles) > limit
+        puzzles = puzzles[:limit]
+        next_cursor = encode_cursor(puzzles[-1]) if has_more else None
+        return CatalogPage(puzzles, next_cursor)
+
+    @staticmethod
+    async def puzzles_etag(variant: str, user_id: str = "default_user") -> Optional[str]:
+        """ETag of the user's view of the catalog.
+
+        The completion version comes from memory, or from a projected read of
+        the progress document when not cached yet. None if the user has no
+        progress, in which case the request is served normally.
+        """
+        completion_version = completion_versions.get(user_id)
+        if completion_version is None:
+            completion_version = await ProgressDatabase.get_completion_version(user_id)
+            if completion_version is None:
+                return None
+            completion_versions.set(user_id, completion_version)
+        await puzzle_catalog.ensure_fresh()
+        return make_etag(puzzle_catalog.version, completion_version, variant)
+
+    @staticmethod
+    async def facets_etag() -> Optional[str]:
+        """ETag of the facet table (user-independent)"""
+        await puzzle_facets.ensure_fresh()
+        return make_etag(puzzle_facets.version, variant="facets")
+
+    @staticmethod
+    async def get_facets() -> StaticPayload:
+        """Get the facet counts of the catalog, pre-encoded and served from memory"""
+        await puzzle_facets.ensure_fresh()
+        return puzzle_facets.payload()
 
     @staticmethod
     async def get_puzzle_by_id(puzzle_id: str) -> Optional[Dict[str, Any]]:
         """Get single puzzle with completion status"""
-        puzzle = await PuzzleDatabase.get_puzzle(puzzle_id)
+        await puzzle_catalog.ensure_fresh()
+        puzzle = puzzle_catalog.get(puzzle_id)
         if not puzzle:
             return None
             
-        progress = await ProgressDatabase.get_or_create_progress()
-        puzzle_dict = puzzle.dict()
+        progress = await read_progress()
+        completion_versions.set(progress.user_id, progress.completion_version)
+        puzzle_dict = puzzle.dict(exclude=set(PUZZLE_ANSWER_FIELDS))
         
         # Add completion status
-        is_completed = any(cp.puzzle_id == puzzle.id and cp.successful for cp in progress.completed_puzzles)
-        puzzle_dict['completed'] = is_completed
+        puzzle_dict['completed'] = puzzle.id in progress.solved_id_set()
         
         return puzzle_dict
 
+    @staticmethod
+    async def submit_move(puzzle_id: str, submission: MoveSubmission) -> Optional[Dict[str, Any]]:
+        """Check a move against the puzzle's precomputed solution line (None if the puzzle is unknown)"""
+        await puzzle_catalog.ensure_fresh()
+        line = puzzle_catalog.solution_line(puzzle_id)
+        if line is None:
+            return None
+        if line.error:
+            return {"checkable": False, "error": line.error}
+        return {"checkable": True, **line.check(submission.ply, submission.move)}
+
     @staticmethod
     async def complete_puzzle(puzzle_id: str, attempt: PuzzleAttempt, user_id: str = "default_user") -> Dict[str, Any]:
         """Mark puzzle as completed and update progress"""
-        puzzle = await PuzzleDatabase.get_puzzle(puzzle_id)
-        if not puzzle:
-            raise ValueError(f"Puzzle {puzzle_id} not found")
-        
-        # Create completed puzzle record
-        completed_puzzle = CompletedPuzzle(
-            puzzle_id=puzzle_id,
-            time_spent=attempt.time_spent,
-            moves_used=attempt.moves_used,
-            hints_used=attempt.hints_used,
-            successful=attempt.successful
-        )
+        with request_metrics.timed("complete_puzzle.total"):
+            await puzzle_catalog.ensure_fresh()
+            puzzle = puzzle_catalog.get(puzzle_id)
+            if not puzzle:
+                raise ValueError(f"Puzzle {puzzle_id} not found")
+            
+            # A success only counts if the submitted moves solve the puzzle's line
+            successful = attempt.successful and puzzle_catalog.solution_line(puzzle_id).verify(attempt.moves)
+            
+            # Create completed puzzle record (millisecond precision, as stored)
+            completed_puzzle = CompletedPuzzle(
+                puzzle_id=puzzle_id,
+                completed_at=utc_now(),
+                time_spent=attempt.time_spent,
+                moves_used=attempt.moves_used,
+                hints_used=attempt.hints_used,
+                successful=successful
+            )
+            
+            return await CompletionUnitOfWork(user_id, puzzle, completed_puzzle).run()
+
+
+class CompletionUnitOfWork:
+    """Request-scoped state for one puzzle completion.
+
+    Each entity is loaded at most once, independent writes run concurrently,
+    and the response is built from the state this request already holds.
+    Achievement evaluation and saved-game cleanup are handed to the
+    background workers, so new achievements show up on the next progress
+    read. Stage timings go to request_metrics under "complete_puzzle.<stage>".
+    """
+
+    def __init__(self, user_id: str, puzzle: PuzzleModel, completed_puzzle: CompletedPuzzle):
+        self.user_id = user_id
+        self.puzzle = puzzle
+        self.completed_puzzle = completed_puzzle
+        self.timings: Dict[str, float] = {}
+
+    async def timed(self, stage: str, awaitable: Awaitable[T]) -> T:
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.timings[stage] = time.perf_counter() - started
+            request_metrics.record(f"complete_puzzle.{stage}", self.timings[stage])
+
+    async def run(self) -> Dict[str, Any]:
+        user_id, puzzle_id = self.user_id, self.puzzle.id
+        
+        # Until the write reports the new version, ETags read it from Mongo
+        completion_versions.invalidate(user_id)
         
-        # Update progress
-        progress = await ProgressDatabase.update_progress(user_id, completed_puzzle)
+        # One round trip each, all independent of one another
+        (progress, changed_counters), _, recent_attempts = await asyncio.gather(
+            self.timed("update_progress", ProgressDatabase.update_progress(user_id, self.completed_puzzle, self.puzzle)),
+            self.timed("record_attempt", AttemptDatabase.record_attempt(user_id, self.completed_puzzle)),
+            self.timed("recent_attempts", AttemptDatabase.get_recent_attempts(user_id))
+        )
+        completion_versions.set(user_id, progress.completion_version)
         
-        # Check and award achievements
-        await AchievementService.check_and_award_achievements(user_id, progress)
+        # Side effects the response does not wait for
+        achievements_snapshot = progress.copy(deep=True)
+        await self.timed("enqueue", asyncio.gather(
+            background_workers.submit("achievements", lambda: AchievementService.check_and_award_achievements(
+                user_id, achievements_snapshot, changed_counters)),
+            background_workers.submit("delete_game_state", lambda: GameStateDatabase.delete_game_state(
+                user_id, puzzle_id))
+        ))
         
-        # Delete saved game state since puzzle is completed
-        await GameStateDatabase.delete_game_state(user_id, puzzle_id)
+        if progress.stats is None:
+            await self.timed("rebuild_stats", ProgressService.ensure_stats(user_id, progress))
         
-        # Return updated progress
-        return await ProgressService.get_progress_response(user_id)
+        # The recent read raced with the attempt insert, so it may already contain it
+        completed = self.completed_puzzle
+        recent_attempts = [completed] + [
+            a for a in recent_attempts
+            if not (a.puzzle_id == completed.puzzle_id and a.completed_at == completed.completed_at)
+        ]
+        return ProgressService.build_progress_response(progress, puzzle_catalog.by_id, recent_attempts[:10])
 
 
 class ProgressService:
     @staticmethod
     async def get_progress_response(user_id: str = "default_user") -> Dict[str, Any]:
-        """Get formatted progress response"""
-        progress = await ProgressDatabase.get_or_create_progress(user_id)
-        all_puzzles = await PuzzleDatabase.get_all_puzzles()
-        
-        # Count puzzles by difficulty
-        beginner_puzzles = [p for p in all_puzzles if p.difficulty == "beginner"]
-        intermediate_puzzles = [p for p in all_puzzles if p.difficulty == "intermediate"]
-        advanced_puzzles = [p for p in all_puzzles if p.difficulty == "advanced"]
-        
-        # Count completed puzzles by difficulty
-        beginners_solved = len([cp for cp in progress.completed_puzzles 
-                               if any(p.id == cp.puzzle_id and p.difficulty == "beginner" 
-                                     for p in all_puzzles) and cp.successful])
-        
-        intermediate_solved = len([cp for cp in progress.completed_puzzles 
-                                  if any(p.id == cp.puzzle_id and p.difficulty == "intermediate" 
-                                        for p in all_puzzles) and cp.successful])
-        
-        advanced_solved = len([cp for cp in progress.completed_puzzles 
-                              if any(p.id == cp.puzzle_id and p.difficulty == "advanced" 
-                                    for p in all_puzzles) and cp.successful])
-        
-        # Calculate average rating
-        successful_puzzles = [cp for cp in progress.completed_puzzles if cp.successful]
-        if successful_puzzles:
-            total_rating = sum(next((p.rating for p in all_puzzles if p.id == cp.puzzle_id), 0) 
-                              for cp in successful_puzzles)
-            average_rating = total_rating / len(successful_puzzles)
-        else:
-            average_rating = 0
+        """Get formatted progress response; concurrent requests for the same user share one build"""
+        return await single_flight.do(
+            ("progress_response", user_id, completion_versions.get(user_id)),
+            lambda: ProgressService._build_progress_response(user_id)
+        )
+
+    @staticmethod
+    async def _build_progress_response(user_id: str) -> Dict[str, Any]:
+        progress, recent_attempts, _, _ = await asyncio.gather(
+            ProgressDatabase.get_or_create_progress(user_id),
+            AttemptDatabase.get_recent_attempts(user_id),
+            puzzle_catalog.ensure_fresh(),
+            puzzle_facets.ensure_fresh()
+        )
+        
+        completion_versions.set(user_id, progress.completion_version)
+        if progress.stats is None:
+            await ProgressService.ensure_stats(user_id, progress)
+        
+        return ProgressService.build_progress_response(progress, puzzle_catalog.by_id, recent_attempts)
+
+    @staticmethod
+    async def ensure_stats(user_id: str, progress: UserProgress):
+        """Rebuild and save stats for progress saved before stats were materialized"""
+        progress.stats = await ProgressService.history_stats(user_id, progress, puzzle_catalog.by_id)
+        await ProgressDatabase.save_stats(user_id, progress.stats)
+
+    @staticmethod
+    async def history_stats(user_id: str, progress: UserProgress, puzzles_by_id: Dict[str, PuzzleModel]) -> ProgressStats:
+        """Stats over the full history: the embedded legacy attempts plus the attempt buckets"""
+        history = list(progress.completed_puzzles)
+        history.extend([attempt async for attempt in AttemptDatabase.iter_attempts(user_id)])
+        return ProgressService.compute_stats(history, puzzles_by_id)
+
+    @staticmethod
+    def compute_stats(attempts: Iterable[CompletedPuzzle], puzzles_by_id: Dict[str, PuzzleModel]) -> ProgressStats:
+        """Recompute the materialized stats from the attempt history in a single pass"""
+        stats = ProgressStats()
+        solved_ids = set()
+        for attempt in attempts:
+            if not attempt.successful or attempt.puzzle_id in solved_ids:
+                continue
+            solved_ids.add(attempt.puzzle_id)
+            stats.count_solve(puzzles_by_id.get(attempt.puzzle_id))
+        return stats
+
+    @staticmethod
+    def build_progress_response(progress: UserProgress, puzzles_by_id: Dict[str, PuzzleModel],
+                                recent_attempts: List[CompletedPuzzle]) -> Dict[str, Any]:
+        """Format progress from the materialized stats and the latest attempts (newest first)"""
+        stats = progress.stats
+        
+        # Calculate average rating (completions of deleted puzzles count as 0)
+        average_rating = stats.rating_sum / stats.solved_count if stats.solved_count else 0
         
         # Format achievements
+        earned_achievements = {a.achievement_id: a for a in progress.achievements}
         formatted_achievements = []
         for achievement_id, achievement_info in ACHIEVEMENTS.items():
-            earned = any(a.achievement_id == achievement_id for a in progress.achievements)
-            earned_date = None
-            if earned:
-                earned_achievement = next(a for a in progress.achievements if a.achievement_id == achievement_id)
-                earned_date = earned_achievement.earned_at.isoformat()
-                
+            earned_achievement = earned_achievements.get(achievement_id)
             formatted_achievements.append({
                 "id": achievement_id,
                 "name": achievement_info["name"],
                 "description": achievement_info["description"],
-                "earned": earned,
-                "earned_date": earned_date
+                "earned": earned_achievement is not None,
+                "earned_date": earned_achievement.earned_at.isoformat() if earned_achievement else None
             })
         
         # Format recent activity
         recent_activity = []
-        sorted_completions = sorted(progress.completed_puzzles, 
-                                   key=lambda x: x.completed_at, reverse=True)[:10]
-        
-        for completion in sorted_completions:
-            puzzle = next((p for p in all_puzzles if p.id == completion.puzzle_id), None)
+        for completion in recent_attempts:
+            puzzle = puzzles_by_id.get(completion.puzzle_id)
             if puzzle:
                 recent_activity.append({
                     "date": completion.completed_at.isoformat(),
@@ -145,10 +368,13 @@ class ProgressService:
         
         return {
             "total_puzzles_solved": progress.total_puzzles_solved,
-            "total_puzzles": len(all_puzzles),
-            "beginners_solved": beginners_solved,
-            "intermediate_solved": intermediate_solved,
-            "advanced_solved": advanced_solved,
+            "total_puzzles": len(puzzles_by_id),
+            "beginners_solved": stats.solved_by_difficulty.get("beginner", 0),
+            "intermediate_solved": stats.solved_by_difficulty.get("intermediate", 0),
+            "advanced_solved": stats.solved_by_difficulty.get("advanced", 0),
+            "beginner_total": puzzle_facets.total("beginner"),
+            "intermediate_total": puzzle_facets.total("intermediate"),
+            "advanced_total": puzzle_facets.total("advanced"),
             "average_rating": round(average_rating, 1),
             "streak": progress.streak,
             "achievements": formatted_achievements,
@@ -158,32 +384,54 @@ class ProgressService:
 
 class AchievementService:
     @staticmethod
-    async def check_and_award_achievements(user_id: str, progress: UserProgress):
-        """Check conditions and award achievements"""
-        all_puzzles = await PuzzleDatabase.get_all_puzzles()
+    async def check_and_award_achievements(user_id: str, progress: UserProgress,
+                                           changed_counters: Optional[Iterable[str]] = None) -> List[str]:
+        """Check conditions and award achievements.
+
+        Only rules depending on one of changed_counters are evaluated (all
+        rules when it is None), and every award goes out in a single write.
+        """
+        if changed_counters is None:
+            candidates = list(ACHIEVEMENTS)
+        else:
+            candidates = AchievementService.affected_achievements(changed_counters)
         
-        for achievement_id, achievement_info in ACHIEVEMENTS.items():
-            # Skip if already earned
-            if any(a.achievement_id == achievement_id for a in progress.achievements):
+        awarded = AchievementService.evaluate_achievements(progress, candidates)
+        if not awarded:
+            return []
+        
+        completion_versions.invalidate(user_id)
+        achievements, version = await ProgressDatabase.add_achievements(user_id, awarded)
+        if version is not None:
+            completion_versions.set(user_id, version)
+        progress.achievements.extend(achievements)
+        for achievement in achievements:
+            print(f"Achievement awarded: {ACHIEVEMENTS[achievement.achievement_id]['name']}")
+        return [achievement.achievement_id for achievement in achievements]
+
+    @staticmethod
+    def affected_achievements(changed_counters: Iterable[str]) -> List[str]:
+        """Achievement ids whose rules depend on any of the changed counters"""
+        affected = {}
+        for counter in changed_counters:
+            for achievement_id in ACHIEVEMENTS_BY_COUNTER.get(counter, []):
+                affected[achievement_id] = True
+        return list(affected)
+
+    @staticmethod
+    def evaluate_achievements(progress: UserProgress, achievement_ids: Iterable[str]) -> List[str]:
+        """Achievement ids, out of achievement_ids, that progress newly qualifies for"""
+        earned = {a.achievement_id for a in progress.achievements}
+        awarded = []
+        for achievement_id in achievement_ids:
+            if achievement_id in earned:
                 continue
-            
-            # Check condition with mock implementation
             try:
-                # Create a mock function to get puzzles for condition checking
-                def get_all_puzzles():
-                    return all_puzzles
-                
-                # Replace global function temporarily 
-                import sys
-                current_module = sys.modules[__name__]
-                setattr(current_module, 'get_all_puzzles', get_all_puzzles)
-                
-                if achievement_info["condition"](progress):
-                    await ProgressDatabase.add_achievement(user_id, achievement_id)
-                    print(f"Achievement awarded: {achievement_info['name']}")
-                    
+                if ACHIEVEMENTS[achievement_id]["condition"](progress):
+                    awarded.append(achievement_id)
             except Exception as e:
                 print(f"Error checking achievement {achievement_id}: {e}")
+        return awarded
 
     @staticmethod
     async def award_specific_achievement(user_id: str, achievement_id: str) -> Dict[str, Any]:
@@ -191,7 +439,10 @@ class AchievementService:
         if achievement_id not in ACHIEVEMENTS:
             raise ValueError(f"Achievement {achievement_id} not found")
         
-        await ProgressDatabase.add_achievement(user_id, achievement_id)
+        completion_versions.invalidate(user_id)
+        progress = await ProgressDatabase.add_achievement(user_id, achievement_id)
+        # A newer completion version keeps the read below from joining a build started before the award
+        completion_versions.set(user_id, progress.completion_version)
         return await ProgressService.get_progress_response(user_id)
 
 
@@ -0,0 +1,137 @@
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional
+from chesscore import Board, move_uci
+from models import PuzzleModel
+
+
+class SolutionStep(NamedTuple):
+    """One player move of a solution line, with the opponent's answer"""
+    position: str  # FEN the player moves from
+    spellings: FrozenSet[str]  # every accepted way of writing the move
+    san: str
+    uci: str
+    reply_san: Optional[str]
+    reply_uci: Optional[str]
+    after: str  # FEN after the move and the reply
+    final: bool  # no player moves left after this one
+
+
+def spellings_for(san: str, uci: str) -> FrozenSet[str]:
+    """SAN with and without check marks or '=', zero-castling, and UCI"""
+    bare = san.rstrip("+#")
+    spellings = {san, bare, bare.replace("=", ""), uci}
+    if bare.startswith("O-O"):
+        spellings.add(bare.replace("O", "0"))
+    return frozenset(spellings)
+
+
+def complete_fen(position: str) -> str:
+    """A full FEN for a placement-only one (as in the sample catalog): white to move, no castling or en passant"""
+    fields = position.split()
+    if len(fields) == 1:
+        return f"{fields[0]} w - - 0 1"
+    return position
+
+
+class SolutionLine:
+    """A puzzle's solution replayed once, keyed by ply.
+
+    moves alternate player and opponent, starting with the player. Each even
+    ply keeps the accepted spellings of the expected move, the reply and the
+    resulting FEN, so checking a submission is a dictionary lookup. A line
+    that cannot be played from the puzzle position keeps the reason in error.
+    """
+
+    __slots__ = ("position", "steps", "error")
+
+    def __init__(self, puzzle: PuzzleModel):
+        self.position = complete_fen(puzzle.position)
+        self.steps: Dict[int, SolutionStep] = {}
+        self.error: Optional[str] = None
+        if not puzzle.moves:
+            self.error = "Puzzle has no solution moves"
+            return
+
+        try:
+            board = Board(self.position)
+            played = []
+            for text in puzzle.moves:
+                legal = board.legal_moves()
+                move = board.parse_move(text, legal)
+                position, san = board.fen(), board.san(move, legal)
+                board = board.play(move)
+                played.append((position, san, move_uci(move), board.fen()))
+        except ValueError as e:
+            self.error = str(e)
+            return
+
+        for ply in range(0, len(played), 2):
+            position, san, uci, after = played[ply]
+            reply_san = reply_uci = None
+            if ply + 1 < len(played):
+                _, reply_san, reply_uci, after = played[ply + 1]
+            self.steps[ply] = SolutionStep(
+                position, spellings_for(san, uci), san, uci, reply_san, reply_uci, after, ply + 2 >= len(played)
+            )
+
+    def check(self, ply: int, text: str) -> Dict[str, Any]:
+        """Judge a move submitted at ply; ValueError if the line has no player move there"""
+        step = self.steps.get(ply)
+        if step is None:
+            raise ValueError(f"No player move at ply {ply}")
+
+        text = text.strip()
+        # Check and annotation marks do not decide whether the move is the right one
+        if text in step.spellings or text.rstrip("!?+#") in step.spellings:
+            return {
+                "correct": True,
+                "legal": True,
+                "move": {"san": step.san, "uci": step.uci},
+                "reply": {"san": step.reply_san, "uci": step.reply_uci} if step.reply_san else None,
+                "position": step.after,
+                "ply": ply + 2,
+                "solved": step.final
+            }
+
+        # Not the listed move: replay just this position to tell wrong moves from illegal ones.
+        # Any checkmate also solves the puzzle, as alternative mates are equally correct.
+        board = Board(step.position)
+        try:
+            move = board.parse_move(text)
+        except ValueError:
+            return {"correct": False, "legal": False, "move": None, "reply": None,
+                    "position": step.position, "ply": ply, "solved": False}
+        after = board.play(move)
+        mate = after.is_checkmate()
+        return {
+            "correct": mate,
+            "legal": True,
+            "move": {"san": board.san(move), "uci": move_uci(move)},
+            "reply": None,
+            "position": after.fen() if mate else step.position,
+            "ply": ply + 2 if mate else ply,
+            "solved": mate
+        }
+
+    def verify(self, moves: List[str]) -> bool:
+        """True if the player's moves, submitted in order, solve the puzzle.
+
+        Replies are not part of moves. Without a playable line only a mate
+        in one can be judged.
+        """
+        if self.error:
+            try:
+                return len(moves) == 1 and Board(self.position).play_line(moves)[-1].is_checkmate()
+            except ValueError:
+                return False
+
+        ply = 0
+        for text in moves:
+            if ply not in self.steps:
+                return False
+            result = self.check(ply, text)
+            if not result["correct"]:
+                return False
+            if result["solved"]:
+                return True
+            ply = result["ply"]
+        return False
@@ -0,0 +1,43 @@
+import time
+from typing import Any, Dict, Optional
+
+
+class StartupState:
+    """Progress of the startup sequence, reported by the readiness probe.
+
+    Liveness only says the process serves HTTP; readiness turns true once
+    indexes exist, the catalog is seeded and the in-memory caches are loaded.
+    """
+
+    def __init__(self):
+        self.stage = "starting"
+        self.ready = False
+        self.attempts = 0
+        self.last_error: Optional[str] = None
+        self.started_at = time.monotonic()
+        self.ready_after: Optional[float] = None
+
+    def begin(self, stage: str):
+        self.stage = stage
+
+    def fail(self, error: Exception):
+        self.last_error = f"{self.stage}: {error}"
+
+    def finish(self):
+        self.stage = "ready"
+        self.ready = True
+        self.last_error = None
+        self.ready_after = time.monotonic() - self.started_at
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "stage": self.stage,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "ready_after_seconds": round(self.ready_after, 3) if self.ready_after is not None else None
+        }
+
+
+# Shared state for the API process
+startup_state = StartupState()
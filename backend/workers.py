@@ -0,0 +1,112 @@
+import asyncio
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, Any, List, Optional
+from metrics import request_metrics
+
+WORKER_COUNT = int(os.environ.get("BACKGROUND_WORKERS", "4"))
+QUEUE_SIZE = int(os.environ.get("BACKGROUND_QUEUE_SIZE", "1000"))
+MAX_ATTEMPTS = int(os.environ.get("BACKGROUND_MAX_ATTEMPTS", "4"))
+RETRY_BASE_DELAY = float(os.environ.get("BACKGROUND_RETRY_BASE_DELAY", "0.2"))
+
+# A job is a zero-argument callable returning a fresh awaitable, so it can be retried
+Job = Callable[[], Awaitable[Any]]
+
+
+class BackgroundWorkerPool:
+    """In-process asyncio worker pool for request side effects.
+
+    Jobs are queued on a bounded queue and run by a fixed number of worker
+    tasks, retried with exponential backoff and jitter. When the queue is
+    full the job runs inline in the caller instead, so memory stays bounded.
+    """
+
+    def __init__(self, worker_count: int = WORKER_COUNT, queue_size: int = QUEUE_SIZE,
+                 max_attempts: int = MAX_ATTEMPTS, retry_base_delay: float = RETRY_BASE_DELAY):
+        self.worker_count = worker_count
+        self.queue_size = queue_size
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self.counters: Dict[str, int] = {
+            "submitted": 0, "completed": 0, "failed": 0, "retried": 0, "ran_inline": 0
+        }
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self):
+        """Start the worker tasks (on the running event loop)"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [asyncio.create_task(self._work(n)) for n in range(self.worker_count)]
+        print(f"Started {self.worker_count} background workers")
+
+    async def submit(self, name: str, job: Job):
+        """Queue a job, or run it inline when the pool is not running or the queue is full"""
+        self.counters["submitted"] += 1
+        if self.running:
+            try:
+                self._queue.put_nowait((name, job, time.perf_counter()))
+                return
+            except asyncio.QueueFull:
+                pass
+        self.counters["ran_inline"] += 1
+        await self._run(name, job)
+
+    async def drain(self, timeout: float = 10.0):
+        """Wait for queued jobs to finish (up to timeout), then stop the workers"""
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            print(f"Background queue not drained after {timeout}s, {self._queue.qsize()} jobs dropped")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and job counters"""
+        return {
+            "workers": len(self._workers),
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_size": self.queue_size,
+            **self.counters
+        }
+
+    async def _work(self, worker_number: int):
+        while True:
+            name, job, queued_at = await self._queue.get()
+            try:
+                request_metrics.record(f"background.{name}.queued", time.perf_counter() - queued_at)
+                await self._run(name, job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, name: str, job: Job):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                with request_metrics.timed(f"background.{name}"):
+                    await job()
+                self.counters["completed"] += 1
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    self.counters["failed"] += 1
+                    print(f"Background job {name} failed after {attempt} attempts: {e}")
+                    return
+                self.counters["retried"] += 1
+                delay = self.retry_base_delay * 2 ** (attempt - 1)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+
+# Shared pool for the API process
+background_workers = BackgroundWorkerPool()
@@ -1,4 +1,5 @@
 import React, { useState, useEffect } from 'react';
+import { puzzleAPI } from '../services/api';
 
 const ChessBoardAdvanced = ({ 
   puzzle,
@@ -15,6 +16,8 @@ const ChessBoardAdvanced = ({
     return Array(8).fill(null).map(() => Array(8).fill(null));
   });
   const [moveHistory, setMoveHistory] = useState([]);
+  // Plies of the solution line played so far (player moves plus replies)
+  const [solutionPly, setSolutionPly] = useState(0);
 
   // Initialize chess.js when component mounts
   useEffect(() => {
@@ -50,6 +53,7 @@ const ChessBoardAdvanced = ({
       // Update board display
       updateBoardDisplay();
       setMoveHistory([]);
+      setSolutionPly(0);
       setSelectedSquare(null);
       setValidMoves([]);
       
@@ -116,35 +120,7 @@ const ChessBoardAdvanced = ({
         updateBoardDisplay();
         setSelectedSquare(null);
         setValidMoves([]);
-        
-        const newMoveHistory = [...moveHistory, move];
-        setMoveHistory(newMoveHistory);
-        
-        // Check if move is part of solution
-        const isSolutionMove = puzzle.moves && puzzle.moves.includes(move.san);
-        
-        // Notify parent component
-        if (onMove) {
-          onMove({
-            move: move,
-            isSolutionMove,
-            position: chess.fen(),
-            gameOver: chess.isGameOver(),
-            inCheck: chess.inCheck(),
-            inCheckmate: chess.isCheckmate()
-          });
-        }
-
-        // Check if puzzle is solved
-        if (isSolutionMove || chess.isCheckmate()) {
-          if (onPuzzleSolved) {
-            onPuzzleSolved({
-              solved: true,
-              moves: newMoveHistory,
-              finalPosition: chess.fen()
-            });
-          }
-        }
+        checkMove(move);
       }
     } catch (error) {
       // Invalid move, try selecting new piece
@@ -159,6 +135,58 @@ const ChessBoardAdvanced = ({
     }
   };
 
+  // The server judges each move against the puzzle's solution line and answers with the reply
+  const checkMove = async (move) => {
+    const uci = move.from + move.to + (move.promotion || '');
+    let result = null;
+    try {
+      result = await puzzleAPI.submitMove(puzzle.id, uci, solutionPly);
+    } catch (error) {
+      // 409 means the stored line cannot be played; then only a checkmate counts
+      console.error('Move check failed:', error);
+    }
+    const isSolutionMove = result ? result.correct : chess.isCheckmate();
+
+    let reply = null;
+    if (result && !result.correct) {
+      chess.undo();
+    } else if (result?.reply) {
+      const { uci: replyUci } = result.reply;
+      reply = chess.move({ from: replyUci.slice(0, 2), to: replyUci.slice(2, 4), promotion: replyUci[4] });
+    }
+    if (result?.correct) {
+      setSolutionPly(result.ply);
+    }
+    updateBoardDisplay();
+
+    const newMoveHistory = result && !result.correct
+      ? moveHistory
+      : [...moveHistory, { ...move, reply, checked: !!result }];
+    setMoveHistory(newMoveHistory);
+
+    if (onMove) {
+      onMove({
+        move: move,
+        isSolutionMove,
+        reply,
+        position: chess.fen(),
+        gameOver: chess.isGameOver(),
+        inCheck: chess.inCheck(),
+        inCheckmate: chess.isCheckmate()
+      });
+    }
+
+    if (isSolutionMove && (!result || result.solved)) {
+      if (onPuzzleSolved) {
+        onPuzzleSolved({
+          solved: true,
+          moves: newMoveHistory,
+          finalPosition: chess.fen()
+        });
+      }
+    }
+  };
+
   const isPieceOwnedByCurrentPlayer = (piece) => {
     if (!piece || !chess) return false;
     const currentTurn = chess.turn();
@@ -167,16 +195,17 @@ const ChessBoardAdvanced = ({
   };
 
   const undoLastMove = () => {
-    if (!chess) return false;
-    const undone = chess.undo();
-    if (undone) {
-      updateBoardDisplay();
-      setMoveHistory(prev => prev.slice(0, -1));
-      setSelectedSquare(null);
-      setValidMoves([]);
-      return true;
-    }
-    return false;
+    if (!chess || moveHistory.length === 0) return false;
+    // A solution step is the player's move and the reply, taken back together
+    const last = moveHistory[moveHistory.length - 1];
+    if (last.reply) chess.undo();
+    chess.undo();
+    if (last.checked) setSolutionPly(prev => Math.max(0, prev - 2));
+    updateBoardDisplay();
+    setMoveHistory(prev => prev.slice(0, -1));
+    setSelectedSquare(null);
+    setValidMoves([]);
+    return true;
   };
 
   const resetPosition = () => {
@@ -190,6 +219,7 @@ const ChessBoardAdvanced = ({
       }
       updateBoardDisplay();
       setMoveHistory([]);
+      setSolutionPly(0);
       setSelectedSquare(null);
       setValidMoves([]);
     } catch (error) {
@@ -115,7 +115,7 @@ const ChessGame = () => {
   };
 
   const handleChessMove = (moveData) => {
-    const { move, isSolutionMove, position, gameOver, inCheck, inCheckmate } = moveData;
+    const { move, position } = moveData;
     
     setGameState(prev => ({
       ...prev,
@@ -125,14 +125,10 @@ const ChessGame = () => {
 
     // Auto-save game state
     saveGameState([move], gameState.hintsUsed);
-
-    // Check win conditions
-    if (inCheckmate || gameOver) {
-      handlePuzzleCompletion(true);
-    }
+    // Completion is reported by the board once the server has accepted the line (onPuzzleSolved)
   };
 
-  const handlePuzzleCompletion = async (solved) => {
+  const handlePuzzleCompletion = async (solved, moves = []) => {
     // Clear timer
     if (timer) {
       clearInterval(timer);
@@ -150,7 +146,9 @@ const ChessGame = () => {
         time_spent: gameState.timeSpent,
         moves_used: gameState.movesPlayed,
         hints_used: gameState.hintsUsed,
-        successful: true
+        successful: true,
+        // The server replays these against the solution before counting the solve
+        moves: moves.map(move => move.from + move.to + (move.promotion || ''))
       };
       
       const result = await handleAPICall(
@@ -304,7 +302,7 @@ const ChessGame = () => {
               <ChessBoardAdvanced
                 puzzle={puzzle}
                 onMove={handleChessMove}
-                onPuzzleSolved={(data) => handlePuzzleCompletion(data.solved)}
+                onPuzzleSolved={(data) => handlePuzzleCompletion(data.solved, data.moves)}
                 gameStatus={gameState.gameStatus}
                 hintsUsed={gameState.hintsUsed}
               />
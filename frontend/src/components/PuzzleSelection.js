@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from './ui/card';
 import { Button } from './ui/button';
@@ -10,14 +10,58 @@ import { puzzleAPI, progressAPI } from '../services/api';
 import LoadingSpinner, { LoadingCard } from './LoadingSpinner';
 import { ErrorCard } from './ErrorBoundary';
 
+// Puzzles fetched per request; the Load more button fetches the next page
+const PAGE_SIZE = 24;
+
 const PuzzleSelection = () => {
   const navigate = useNavigate();
   const [selectedDifficulty, setSelectedDifficulty] = useState('beginner');
+  const [puzzles, setPuzzles] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [puzzlesLoading, setPuzzlesLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [puzzlesError, setPuzzlesError] = useState(null);
+  const [reloadKey, setReloadKey] = useState(0);
+  const currentDifficulty = useRef(selectedDifficulty);
+  currentDifficulty.current = selectedDifficulty;
+
+  const pageFilters = { view: 'summary', difficulty: selectedDifficulty, limit: PAGE_SIZE };
+
+  // First page of the selected difficulty; later pages are fetched on demand
+  useEffect(() => {
+    let current = true;
+    setPuzzles([]);
+    setNextCursor(null);
+    setPuzzlesLoading(true);
+    setPuzzlesError(null);
+    puzzleAPI.getPage(pageFilters)
+      .then(page => {
+        if (!current) return;
+        setPuzzles(page.puzzles);
+        setNextCursor(page.next_cursor);
+      })
+      .catch(error => current && setPuzzlesError(error))
+      .finally(() => current && setPuzzlesLoading(false));
+    return () => { current = false; };
+  }, [selectedDifficulty, reloadKey]);
+
+  const loadMorePuzzles = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await puzzleAPI.getPage(pageFilters, nextCursor);
+      // The tab may have changed while the page was in flight
+      if (currentDifficulty.current !== pageFilters.difficulty) return;
+      setPuzzles(loaded => [...loaded, ...page.puzzles]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      setPuzzlesError(error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
-  // Fetch puzzles and progress data
-  const { data: allPuzzles, isLoading: puzzlesLoading, error: puzzlesError, refetch: refetchPuzzles } = 
-    useFetch(() => puzzleAPI.getAll(), []);
-
+  // Fetch progress data
   const { data: progressData, isLoading: progressLoading, error: progressError } = 
     useFetch(() => progressAPI.get(), []);
 
@@ -31,9 +75,8 @@ const PuzzleSelection = () => {
   };
 
   const getDifficultyStats = (difficulty) => {
-    if (!allPuzzles || !progressData) return { total: 0, completed: 0 };
+    if (!progressData) return { total: 0, completed: 0 };
     
-    const puzzles = allPuzzles.filter(p => p.difficulty === difficulty);
     let completed = 0;
     
     if (difficulty === 'beginner') completed = progressData.beginners_solved;
@@ -41,22 +84,74 @@ const PuzzleSelection = () => {
     else if (difficulty === 'advanced') completed = progressData.advanced_solved;
     
     return {
-      total: puzzles.length,
+      total: progressData[`${difficulty}_total`] || 0,
       completed
     };
   };
 
-  const filteredPuzzles = allPuzzles ? allPuzzles.filter(puzzle => puzzle.difficulty === selectedDifficulty) : [];
+  const puzzleGrid = puzzlesLoading ? (
+    <LoadingCard>Loading puzzles...</LoadingCard>
+  ) : (
+    <>
+      <div className="grid md:grid-cols-2 lg:grid-cols-3 gap-6">
+        {puzzles.map((puzzle) => (
+          <Card key={puzzle.id} className="hover:shadow-lg transition-all duration-300 transform hover:-translate-y-1 bg-white border">
+            <CardHeader>
+              <div className="flex items-center justify-between mb-2">
+                <Badge className={getDifficultyColor(puzzle.difficulty)}>
+                  {puzzle.difficulty}
+                </Badge>
+                {puzzle.completed && (
+                  <Trophy className="h-4 w-4 text-yellow-500" />
+                )}
+              </div>
+              <CardTitle className="text-lg">{puzzle.title}</CardTitle>
+              <CardDescription className="text-sm">
+                {puzzle.description}
+              </CardDescription>
+            </CardHeader>
+            <CardContent>
+              <div className="flex items-center justify-between mb-4">
+                <div className="flex items-center text-sm text-gray-600">
+                  <Clock className="h-4 w-4 mr-1" />
+                  {puzzle.time_limit}m
+                </div>
+                <div className="flex items-center text-sm text-gray-600">
+                  <Star className="h-4 w-4 mr-1" />
+                  {puzzle.rating}
+                </div>
+              </div>
+              
+              <Button 
+                className="w-full bg-blue-600 hover:bg-blue-700 transform hover:scale-105 transition-all duration-200"
+                onClick={() => navigate(`/play/${puzzle.id}`)}
+              >
+                <Play className="h-4 w-4 mr-2" />
+                {puzzle.completed ? 'Play Again' : 'Start Puzzle'}
+              </Button>
+            </CardContent>
+          </Card>
+        ))}
+      </div>
+      {nextCursor && (
+        <div className="flex justify-center mt-8">
+          <Button variant="outline" onClick={loadMorePuzzles} disabled={loadingMore}>
+            {loadingMore ? 'Loading...' : 'Load more puzzles'}
+          </Button>
+        </div>
+      )}
+    </>
+  );
 
   // Loading states
-  if (puzzlesLoading || progressLoading) {
+  if (progressLoading) {
     return (
       <div className="container mx-auto px-4 py-8 max-w-6xl">
         <div className="text-center mb-8">
           <h1 className="text-4xl font-bold text-gray-800 mb-4">Choose Your Challenge</h1>
           <p className="text-lg text-gray-600">Select puzzles that match your skill level</p>
         </div>
-        <LoadingCard>Loading puzzles and progress...</LoadingCard>
+        <LoadingCard>Loading progress...</LoadingCard>
       </div>
     );
   }
@@ -69,7 +164,7 @@ const PuzzleSelection = () => {
           <h1 className="text-4xl font-bold text-gray-800 mb-4">Choose Your Challenge</h1>
           <p className="text-lg text-gray-600">Select puzzles that match your skill level</p>
         </div>
-        <ErrorCard error={puzzlesError} onRetry={refetchPuzzles} />
+        <ErrorCard error={puzzlesError} onRetry={() => setReloadKey(key => key + 1)} />
       </div>
     );
   }
@@ -142,132 +237,15 @@ const PuzzleSelection = () => {
 
         {/* Puzzle Grid */}
         <TabsContent value="beginner" className="mt-6">
-          <div className="grid md:grid-cols-2 lg:grid-cols-3 gap-6">
-            {filteredPuzzles.map((puzzle) => (
-              <Card key={puzzle.id} className="hover:shadow-lg transition-all duration-300 transform hover:-translate-y-1 bg-white border">
-                <CardHeader>
-                  <div className="flex items-center justify-between mb-2">
-                    <Badge className={getDifficultyColor(puzzle.difficulty)}>
-                      {puzzle.difficulty}
-                    </Badge>
-                    {puzzle.completed && (
-                      <Trophy className="h-4 w-4 text-yellow-500" />
-                    )}
-                  </div>
-                  <CardTitle className="text-lg">{puzzle.title}</CardTitle>
-                  <CardDescription className="text-sm">
-                    {puzzle.description}
-                  </CardDescription>
-                </CardHeader>
-                <CardContent>
-                  <div className="flex items-center justify-between mb-4">
-                    <div className="flex items-center text-sm text-gray-600">
-                      <Clock className="h-4 w-4 mr-1" />
-                      {puzzle.time_limit}m
-                    </div>
-                    <div className="flex items-center text-sm text-gray-600">
-                      <Star className="h-4 w-4 mr-1" />
-                      {puzzle.rating}
-                    </div>
-                  </div>
-                  
-                  <Button 
-                    className="w-full bg-blue-600 hover:bg-blue-700 transform hover:scale-105 transition-all duration-200"
-                    onClick={() => navigate(`/play/${puzzle.id}`)}
-                  >
-                    <Play className="h-4 w-4 mr-2" />
-                    {puzzle.completed ? 'Play Again' : 'Start Puzzle'}
-                  </Button>
-                </CardContent>
-              </Card>
-            ))}
-          </div>
+          {puzzleGrid}
         </TabsContent>
 
         <TabsContent value="intermediate" className="mt-6">
-          <div className="grid md:grid-cols-2 lg:grid-cols-3 gap-6">
-            {filteredPuzzles.map((puzzle) => (
-              <Card key={puzzle.id} className="hover:shadow-lg transition-all duration-300 transform hover:-translate-y-1 bg-white border">
-                <CardHeader>
-                  <div className="flex items-center justify-between mb-2">
-                    <Badge className={getDifficultyColor(puzzle.difficulty)}>
-                      {puzzle.difficulty}
-                    </Badge>
-                    {puzzle.completed && (
-                      <Trophy className="h-4 w-4 text-yellow-500" />
-                    )}
-                  </div>
-                  <CardTitle className="text-lg">{puzzle.title}</CardTitle>
-                  <CardDescription className="text-sm">
-                    {puzzle.description}
-                  </CardDescription>
-                </CardHeader>
-                <CardContent>
-                  <div className="flex items-center justify-between mb-4">
-                    <div className="flex items-center text-sm text-gray-600">
-                      <Clock className="h-4 w-4 mr-1" />
-                      {puzzle.time_limit}m
-                    </div>
-                    <div className="flex items-center text-sm text-gray-600">
-                      <Star className="h-4 w-4 mr-1" />
-                      {puzzle.rating}
-                    </div>
-                  </div>
-                  
-                  <Button 
-                    className="w-full bg-blue-600 hover:bg-blue-700 transform hover:scale-105 transition-all duration-200"
-                    onClick={() => navigate(`/play/${puzzle.id}`)}
-                  >
-                    <Play className="h-4 w-4 mr-2" />
-                    {puzzle.completed ? 'Play Again' : 'Start Puzzle'}
-                  </Button>
-                </CardContent>
-              </Card>
-            ))}
-          </div>
+          {puzzleGrid}
         </TabsContent>
 
         <TabsContent value="advanced" className="mt-6">
-          <div className="grid md:grid-cols-2 lg:grid-cols-3 gap-6">
-            {filteredPuzzles.map((puzzle) => (
-              <Card key={puzzle.id} className="hover:shadow-lg transition-all duration-300 transform hover:-translate-y-1 bg-white border">
-                <CardHeader>
-                  <div className="flex items-center justify-between mb-2">
-                    <Badge className={getDifficultyColor(puzzle.difficulty)}>
-                      {puzzle.difficulty}
-                    </Badge>
-                    {puzzle.completed && (
-                      <Trophy className="h-4 w-4 text-yellow-500" />
-                    )}
-                  </div>
-                  <CardTitle className="text-lg">{puzzle.title}</CardTitle>
-                  <CardDescription className="text-sm">
-                    {puzzle.description}
-                  </CardDescription>
-                </CardHeader>
-                <CardContent>
-                  <div className="flex items-center justify-between mb-4">
-                    <div className="flex items-center text-sm text-gray-600">
-                      <Clock className="h-4 w-4 mr-1" />
-                      {puzzle.time_limit}m
-                    </div>
-                    <div className="flex items-center text-sm text-gray-600">
-                      <Star className="h-4 w-4 mr-1" />
-                      {puzzle.rating}
-                    </div>
-                  </div>
-                  
-                  <Button 
-                    className="w-full bg-blue-600 hover:bg-blue-700 transform hover:scale-105 transition-all duration-200"
-                    onClick={() => navigate(`/play/${puzzle.id}`)}
-                  >
-                    <Play className="h-4 w-4 mr-2" />
-                    {puzzle.completed ? 'Play Again' : 'Start Puzzle'}
-                  </Button>
-                </CardContent>
-              </Card>
-            ))}
-          </div>
+          {puzzleGrid}
         </TabsContent>
       </Tabs>
     </div>
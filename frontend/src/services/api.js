@@ -21,13 +21,29 @@ apiClient.interceptors.response.use(
 );
 
 export const puzzleAPI = {
-  getAll: async (filters = {}) => {
+  getPage: async (filters = {}, cursor = null) => {
     const params = new URLSearchParams();
     if (filters.difficulty) params.append('difficulty', filters.difficulty);
+    if (filters.category) params.append('category', filters.category);
+    if (filters.ratingMin !== undefined) params.append('rating_min', filters.ratingMin);
+    if (filters.ratingMax !== undefined) params.append('rating_max', filters.ratingMax);
+    if (filters.timeLimit) params.append('time_limit', filters.timeLimit);
+    if (filters.sort) params.append('sort', filters.sort);
     if (filters.completed !== undefined) params.append('completed', filters.completed);
+    if (filters.view) params.append('view', filters.view);
+    if (filters.limit) params.append('limit', filters.limit);
+    if (cursor) params.append('cursor', cursor);
     
     const response = await apiClient.get(`/puzzles?${params.toString()}`);
-    return response.data.puzzles;
+    // Completion flags come as a per-user overlay next to the shared page
+    const completedIds = new Set(response.data.completed_ids || []);
+    const puzzles = response.data.puzzles.map(p => ({ ...p, completed: completedIds.has(p.id) }));
+    return { ...response.data, puzzles };
+  },
+
+  getFacets: async () => {
+    const response = await apiClient.get('/puzzles/facets');
+    return response.data;
   },
 
   getById: async (id) => {
@@ -35,6 +51,12 @@ export const puzzleAPI = {
     return response.data;
   },
 
+  // Checks a move (UCI or SAN) played at ply against the solution; answers with the reply
+  submitMove: async (id, move, ply) => {
+    const response = await apiClient.post(`/puzzles/${id}/move`, { move, ply });
+    return response.data;
+  },
+
   markComplete: async (id, attemptData) => {
     const response = await apiClient.post(`/puzzles/${id}/complete`, attemptData);
     return response.data;
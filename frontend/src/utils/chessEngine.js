@@ -158,16 +158,6 @@ export class ChessEngine {
     return file + rank;
   }
 
-  // Check if move is in solution
-  checkSolution(move, solutionMoves) {
-    if (!Array.isArray(solutionMoves)) return false;
-    return solutionMoves.some(solution => 
-      move.san === solution || 
-      move.from + move.to === solution ||
-      `${move.from}-${move.to}` === solution
-    );
-  }
-
   // Get all legal moves for current position
   getAllLegalMoves() {
     return this.chess.moves({ verbose: true });
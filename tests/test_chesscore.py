@@ -0,0 +1,90 @@
+import pytest
+
+from chesscore import Board, START_FEN, apply_moves, move_uci
+
+
+def parse(fen: str, text: str) -> str:
+    board = Board(fen)
+    return move_uci(board.parse_move(text))
+
+
+def test_fen_round_trip():
+    fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    assert Board(fen).fen() == fen
+    assert Board().fen() == START_FEN
+
+
+@pytest.mark.parametrize("fen, message", [
+    ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR", "FEN needs 4 or 6 fields"),
+    ("8/8/8/8/8/8/8/8 w - - 0 1", "exactly one king"),
+    ("P3k3/8/8/8/8/8/8/4K3 w - - 0 1", "first or last rank"),
+    ("4k3/8/8/8/8/8/8/4K2r b - - 0 1", "side not to move is in check"),
+    ("4k3/8/8/8/8/8/8/4K3 w - e3 0 1", "en passant"),
+])
+def test_illegal_fens_are_rejected(fen, message):
+    with pytest.raises(ValueError, match=message):
+        Board(fen)
+
+
+@pytest.mark.parametrize("fen, text, uci", [
+    (START_FEN, "e4", "e2e4"),
+    (START_FEN, "Nf3", "g1f3"),
+    (START_FEN, "g1f3", "g1f3"),
+    ("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", "O-O", "e1g1"),
+    ("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", "0-0-0", "e1c1"),
+    ("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", "e1g1", "e1g1"),
+    ("8/4P3/8/8/8/k7/8/4K3 w - - 0 1", "e8=Q", "e7e8q"),
+    ("8/4P3/8/8/8/k7/8/4K3 w - - 0 1", "e8N", "e7e8n"),
+    ("8/4P3/8/8/8/k7/8/4K3 w - - 0 1", "e7e8r", "e7e8r"),
+    ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", "exd6", "e5d6"),
+    ("4k3/8/8/8/8/8/8/1N2KN2 w - - 0 1", "Nbd2", "b1d2"),
+    ("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1", "Rd8#", "d1d8"),
+])
+def test_parse_move(fen, text, uci):
+    assert parse(fen, text) == uci
+
+
+@pytest.mark.parametrize("fen, text", [
+    (START_FEN, "e5"),
+    (START_FEN, "O-O"),
+    (START_FEN, "e2e5"),
+    ("8/4P3/8/8/8/k7/8/4K3 w - - 0 1", "e8"),
+    ("4k3/8/8/8/8/8/8/1N2KN2 w - - 0 1", "Nd2"),
+    ("4k3/8/8/8/8/8/8/4K3 w - - 0 1", "nonsense"),
+])
+def test_illegal_or_ambiguous_moves_are_rejected(fen, text):
+    with pytest.raises(ValueError):
+        parse(fen, text)
+
+
+@pytest.mark.parametrize("fen, uci, san", [
+    (START_FEN, "g1f3", "Nf3"),
+    ("4k3/8/8/8/8/8/8/1N2KN2 w - - 0 1", "f1d2", "Nfd2"),
+    ("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", "e1c1", "O-O-O"),
+    ("8/4P3/8/8/8/k7/8/4K3 w - - 0 1", "e7e8q", "e8=Q"),
+    ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", "e5d6", "exd6"),
+    ("4k3/8/8/8/8/8/R7/R3K3 w - - 0 1", "a2a8", "Ra8+"),
+    ("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1", "d1d8", "Rd8#"),
+])
+def test_san(fen, uci, san):
+    board = Board(fen)
+    assert board.san(board.parse_move(uci)) == san
+
+
+def test_play_updates_state():
+    board = Board("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1")
+    # En passant removes the captured pawn and resets the halfmove clock
+    assert board.play(board.parse_move("exd6")).fen() == "4k3/8/3P4/8/8/8/8/4K3 b - - 0 1"
+    assert apply_moves(START_FEN, ["e4", "e5", "Nf3"]) == "rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2"
+
+
+def test_castling_rights_follow_king_and_rooks():
+    board = Board("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    assert board.play(board.parse_move("Rb1")).fen().split()[2] == "Kkq"
+    assert board.play(board.parse_move("Kf1")).fen().split()[2] == "kq"
+
+
+def test_mate_and_stalemate():
+    assert Board("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1").play_line(["Rd8#"])[-1].is_checkmate()
+    assert Board("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1").is_stalemate()
+    assert not Board().is_checkmate()
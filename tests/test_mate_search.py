@@ -0,0 +1,38 @@
+from mate_search import check_puzzle, solve
+
+
+def mate_puzzle(position, moves, title):
+    return {"id": "test", "title": title, "position": position, "moves": moves, "solution": " ".join(moves)}
+
+
+def test_finds_forcing_mate():
+    result = solve("r4rk1/5Npp/8/8/2Q5/8/5PPP/6K1 w - - 0 1", max_depth=3)
+    assert result["mate_in"] == 3
+    assert result["winning_moves"] == ["Nh6+"]
+    assert result["line"] == ["Nh6+", "Kh8", "Qg8+", "Rxg8", "Nf7#"]
+
+
+def test_quiet_first_move_mate_needs_full_width():
+    fen = "k7/8/2K5/8/8/8/8/1R6 w - - 0 1"
+    assert solve(fen, max_depth=3)["mate_in"] is None
+    result = solve(fen, max_depth=3, checks_only=False)
+    assert result["mate_in"] == 2
+    assert result["winning_moves"] == ["Kc7"]
+
+
+def test_checks_only_search_does_not_refute_claims():
+    puzzle = mate_puzzle("5k2/8/6Q1/8/1R6/8/8/7K w - - 0 1", ["Qh7", "Ke8", "Rb8#"], "Checkmate in 2")
+    assert check_puzzle(puzzle, 4, 10, checks_only=True)["status"] == "inconclusive"
+    assert check_puzzle(puzzle, 4, 10, checks_only=False)["status"] == "verified"
+
+
+def test_full_width_search_finds_shorter_mate():
+    puzzle = mate_puzzle("6k1/5ppp/8/8/8/8/3Q1PPP/3R2K1 w - - 0 1", ["Qd7", "h6", "Qd8#"], "Checkmate in 2")
+    report = check_puzzle(puzzle, 3, 10, checks_only=False)
+    assert report["status"] == "shorter_mate"
+    assert report["mate_in"] == 1
+
+
+def test_placement_only_position_is_searched_as_white_to_move():
+    puzzle = mate_puzzle("k7/8/2K5/8/8/8/8/1R6", ["Kc7", "Ka7", "Ra1#"], "Checkmate in 2")
+    assert check_puzzle(puzzle, 3, 10, checks_only=False)["status"] == "verified"
@@ -0,0 +1,29 @@
+import pytest
+
+from chesscore import Board, move_uci
+from perft import REFERENCE_POSITIONS, perft, reference_moves
+
+# Keep the suite quick: only the reference depths that stay small
+MAX_NODES = 10_000
+
+QUICK_CASES = [
+    (name, fen, depth, nodes)
+    for name, fen, expected in REFERENCE_POSITIONS
+    for depth, nodes in expected.items()
+    if nodes <= MAX_NODES
+]
+
+
+@pytest.mark.parametrize("name, fen, depth, nodes", QUICK_CASES, ids=[case[0] + f" d{case[2]}" for case in QUICK_CASES])
+def test_perft_matches_reference_counts(name, fen, depth, nodes):
+    assert perft(Board(fen), depth) == nodes
+
+
+@pytest.mark.parametrize("name, fen", [(name, fen) for name, fen, _ in REFERENCE_POSITIONS],
+                         ids=[name for name, _, _ in REFERENCE_POSITIONS])
+def test_generator_agrees_with_reference_generator(name, fen):
+    board = Board(fen)
+    for move in board.legal_moves():
+        after = board.play(move)
+        assert {move_uci(reply) for reply in after.legal_moves()} == reference_moves(after)
+    assert {move_uci(move) for move in board.legal_moves()} == reference_moves(board)
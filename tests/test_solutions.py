@@ -0,0 +1,80 @@
+import pytest
+
+from models import PuzzleModel
+from puzzle_validator import validate_puzzle
+from solutions import SolutionLine, complete_fen
+
+
+def puzzle(position: str, moves):
+    return PuzzleModel(
+        id="test", title="Test", description="Test puzzle", difficulty="beginner", time_limit=5,
+        rating=1000, moves=moves, position=position, solution=" ".join(moves), hints=[], category="tactics"
+    )
+
+
+# Mate in 2: Qd8+ Kh7 Qh8#
+MATE_IN_2 = puzzle("6k1/5p2/6p1/8/8/8/1B3PPP/3Q2K1 w - - 0 1", ["Qd8+", "Kh7", "Qh8#"])
+
+
+def test_correct_move_returns_reply():
+    result = SolutionLine(MATE_IN_2).check(0, "Qd8+")
+    assert result["correct"] and not result["solved"]
+    assert result["reply"] == {"san": "Kh7", "uci": "g8h7"}
+    assert result["ply"] == 2
+
+
+@pytest.mark.parametrize("text", ["Qd8+", "Qd8", "d1d8", "Qd8!"])
+def test_accepted_spellings(text):
+    assert SolutionLine(MATE_IN_2).check(0, text)["correct"]
+
+
+def test_last_move_solves():
+    result = SolutionLine(MATE_IN_2).check(2, "d8h8")
+    assert result["correct"] and result["solved"]
+
+
+def test_wrong_and_illegal_moves():
+    line = SolutionLine(MATE_IN_2)
+    wrong = line.check(0, "Qd2")
+    assert wrong["legal"] and not wrong["correct"] and wrong["ply"] == 0
+    illegal = line.check(0, "Qd9")
+    assert not illegal["legal"] and not illegal["correct"]
+
+
+def test_any_checkmate_solves():
+    # The listed line starts with a quiet move, but the immediate back-rank mate also counts
+    line = SolutionLine(puzzle("6k1/5ppp/8/8/8/8/3Q1PPP/3R2K1 w - - 0 1", ["Qd7", "h6", "Qd8#"]))
+    result = line.check(0, "Qd8#")
+    assert result["correct"] and result["solved"]
+
+
+def test_no_player_move_at_ply():
+    with pytest.raises(ValueError):
+        SolutionLine(MATE_IN_2).check(1, "Kh7")
+
+
+def test_unplayable_line_keeps_the_reason():
+    line = SolutionLine(puzzle("6k1/5p2/6p1/8/8/8/1B3PPP/3Q2K1 w - - 0 1", ["Qd9"]))
+    assert line.error and not line.steps
+    assert SolutionLine(puzzle("6k1/5p2/6p1/8/8/8/1B3PPP/3Q2K1 w - - 0 1", [])).error
+
+
+def test_placement_only_fen_is_completed():
+    assert complete_fen("6k1/5ppp/8/8/8/8/5PPP/3R2K1") == "6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1"
+    line = SolutionLine(puzzle("6k1/5ppp/8/8/8/8/5PPP/3R2K1", ["Rd8#"]))
+    assert line.error is None and line.check(0, "Rd8")["solved"]
+
+
+def test_verify():
+    line = SolutionLine(MATE_IN_2)
+    assert line.verify(["Qd8+", "Qh8#"])
+    assert line.verify(["d1d8", "d8h8"])
+    assert not line.verify(["Qd8+"])
+    assert not line.verify(["Qd2", "Qh8#"])
+    assert not line.verify([])
+
+
+def test_validator_accepts_placement_only_fen():
+    puzzle = {"id": "test", "title": "Checkmate in 1", "position": "6k1/5ppp/8/8/8/8/5PPP/3R2K1",
+              "moves": ["Rd8#"], "solution": "Rd8#"}
+    assert validate_puzzle(puzzle)["valid"]